@@ -0,0 +1 @@
+"""Offline render benchmarks."""
@@ -0,0 +1,390 @@
+"""Offline end-to-end render benchmark
+
+Renders riddle videos from synthetic assets with stub provider services,
+so no API keys or network access are needed, and times
+``VideoCompositionService.create_multi_riddle_video`` for several riddle
+counts. The first run writes a JSON baseline; later runs are compared
+against it.
+
+Run from the backend directory:
+
+    python -m benchmarks.render_benchmark
+    python -m benchmarks.render_benchmark --riddles 1 2 --repeat 3
+    python -m benchmarks.render_benchmark --resolution 270x480 --fps 15
+    python -m benchmarks.render_benchmark --render-mode segments
+    python -m benchmarks.render_benchmark --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import moviepy
+from PIL import ImageFont
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.assets import SyntheticAssets
+from benchmarks.stubs import install_stub_services
+from core.application import Application
+
+DEFAULT_RIDDLE_COUNTS = (1, 2, 5, 10)
+
+# Used when the configured font is not installed, e.g. Arial on Linux
+FALLBACK_FONT = "DejaVuSans.ttf"
+
+
+def _apply_overrides(
+    config: Dict[str, Any],
+    codec: str,
+    resolution: Optional[Tuple[int, int]] = None,
+    fps: Optional[int] = None,
+    render_mode: Optional[str] = None,
+    quality: Optional[str] = None
+) -> None:
+    """Adjust the configuration so any riddle count renders offline."""
+    video_config = config.setdefault("video", {})
+    video_config["codec"] = codec
+    if render_mode:
+        video_config.setdefault("render", {})["mode"] = render_mode
+    if quality:
+        video_config.setdefault("quality", {})["profile"] = quality
+    if resolution:
+        video_config["resolution"] = {"width": resolution[0], "height": resolution[1]}
+    if fps:
+        video_config["fps"] = fps
+    # Repeated runs must render every segment, not splice cached ones
+    video_config.setdefault("render", {}).setdefault("segment_cache", {})["enabled"] = False
+    # Total duration limits would reject 1 and 10 riddle videos
+    video_config["duration"] = {"min_total": 0, "max_total": float("inf")}
+
+    text_config = config.setdefault("text", {})
+    try:
+        ImageFont.truetype(text_config.get("font_path", "Arial"), 12)
+    except OSError:
+        text_config["font_path"] = FALLBACK_FONT
+
+
+def _environment() -> Dict[str, Any]:
+    """Describe the machine so results from different hosts are not mixed up."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "moviepy": moviepy.__version__,
+        "git_commit": commit
+    }
+
+
+def run_benchmark(
+    riddle_counts: List[int] = DEFAULT_RIDDLE_COUNTS,
+    repeat: int = 1,
+    config_path: Optional[str] = "config/config.json",
+    work_dir: str = "cache/benchmark",
+    codec: str = "libx264",
+    category: str = "geography",
+    resolution: Optional[Tuple[int, int]] = None,
+    fps: Optional[int] = None,
+    trace_dir: Optional[str] = None,
+    render_mode: Optional[str] = None,
+    quality: Optional[str] = None
+) -> Dict[str, Any]:
+    """Time video rendering for each riddle count.
+
+    Args:
+        riddle_counts: Numbers of riddles per video to benchmark
+        repeat: Renders per riddle count; the median is reported
+        config_path: Configuration file to benchmark
+        work_dir: Directory for synthetic assets and rendered videos
+        codec: Video codec passed to the encoder
+        category: Riddle category used for every video
+        resolution: Optional output (and background clip) size override
+        fps: Optional frame rate override
+        trace_dir: Optional directory for a Chrome trace per render
+        render_mode: Optional ``video.render.mode`` override
+        quality: Optional ``video.quality.profile`` override
+
+    Returns:
+        Benchmark results in the baseline format
+    """
+    results = {}
+    with Application(config_path=config_path, trace_dir=trace_dir) as app:
+        config = app.config.config
+        _apply_overrides(config, codec, resolution, fps, render_mode, quality)
+
+        video_resolution = config.get("video", {}).get("resolution", {})
+        fps = config.get("video", {}).get("fps", 30)
+        assets = SyntheticAssets(
+            os.path.join(work_dir, "assets"),
+            width=video_resolution.get("width", 1080),
+            height=video_resolution.get("height", 1920),
+            fps=fps
+        )
+        install_stub_services(app.service_factory, assets)
+        composition = app.service_factory.get_video_composition_service()
+
+        output_dir = os.path.join(work_dir, "output")
+        os.makedirs(output_dir, exist_ok=True)
+
+        for num_riddles in riddle_counts:
+            # Same pattern texts, and so the same timings, on every run
+            random.seed(num_riddles)
+            riddles = app.generate_riddles(category=category, num_riddles=num_riddles)
+            segments = app.add_segment_speech(app.build_segments(riddles))
+            video_duration = sum(timing["duration"] for timing in composition.calculate_timings(segments))
+            output_path = os.path.join(output_dir, f"bench_{num_riddles}_riddles.mp4")
+
+            seconds = []
+            for run in range(repeat):
+                print(f"Rendering {num_riddles} riddles ({video_duration:.1f}s of video), run {run + 1}/{repeat}")
+                with app.trace_job(f"bench_{num_riddles}_riddles_{run + 1}"):
+                    start_time = time.perf_counter()
+                    composition.create_multi_riddle_video(segments, output_path, category)
+                    seconds.append(round(time.perf_counter() - start_time, 3))
+
+            median = statistics.median(seconds)
+            results[str(num_riddles)] = {
+                "riddles": num_riddles,
+                "segments": len(segments),
+                "video_duration": round(video_duration, 3),
+                "seconds": seconds,
+                "median": round(median, 3),
+                "min": min(seconds),
+                "realtime_factor": round(video_duration / median, 3) if median else None
+            }
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "settings": {
+            "config": config_path,
+            "codec": codec,
+            "resolution": [assets.width, assets.height],
+            "fps": fps,
+            "render_mode": config["video"].get("render", {}).get("mode", "single"),
+            "quality": config["video"].get("quality", {}).get("profile", "final"),
+            "repeat": repeat
+        },
+        "results": results
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.1
+) -> List[Dict[str, Any]]:
+    """Compare the median render times of two benchmark runs.
+
+    Args:
+        baseline: Earlier results
+        current: New results
+        threshold: Relative change below which times count as unchanged
+
+    Returns:
+        One row per riddle count present in both runs, with the relative
+        ``change`` and a ``status`` of faster, slower or unchanged
+    """
+    rows = []
+    for key, result in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if not base:
+            continue
+
+        change = (result["median"] - base["median"]) / base["median"] if base["median"] else 0.0
+        if change > threshold:
+            status = "slower"
+        elif change < -threshold:
+            status = "faster"
+        else:
+            status = "unchanged"
+
+        rows.append({
+            "riddles": result["riddles"],
+            "baseline": base["median"],
+            "current": result["median"],
+            "change": round(change, 4),
+            "status": status
+        })
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """Render comparison rows as a text table."""
+    lines = [f"{'riddles':>7}  {'baseline':>9}  {'current':>9}  {'change':>8}  status"]
+    for row in rows:
+        lines.append(
+            f"{row['riddles']:>7}  {row['baseline']:>8.2f}s  {row['current']:>8.2f}s  "
+            f"{row['change']:>+8.1%}  {row['status']}"
+        )
+    return "\n".join(lines)
+
+
+def _write_json(data: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def _parse_resolution(value: str) -> Tuple[int, int]:
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}")
+    return width, height
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark offline video rendering")
+    parser.add_argument(
+        "--riddles",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_RIDDLE_COUNTS),
+        help="Riddle counts to benchmark"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Renders per riddle count (the median is compared)"
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="config/config.json",
+        help="Path to configuration file"
+    )
+    parser.add_argument(
+        "--codec",
+        type=str,
+        default="libx264",
+        help="Video codec (overrides video.codec so runs are comparable across hosts)"
+    )
+    parser.add_argument(
+        "--resolution",
+        type=_parse_resolution,
+        default=None,
+        metavar="WxH",
+        help="Render at this size instead of video.resolution"
+    )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=None,
+        help="Render at this frame rate instead of video.fps"
+    )
+    parser.add_argument(
+        "--render-mode",
+        type=str,
+        choices=("single", "segments", "chunks", "ffmpeg"),
+        default=None,
+        help="Render this way instead of video.render.mode"
+    )
+    parser.add_argument(
+        "--quality",
+        type=str,
+        choices=("draft", "preview", "final"),
+        default=None,
+        help="Render with this quality profile instead of video.quality.profile"
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=str,
+        default="cache/benchmark",
+        help="Directory for synthetic assets and rendered videos"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default="cache/benchmark/baseline.json",
+        help="Baseline results; written on the first run, compared against afterwards"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="cache/benchmark/latest.json",
+        help="Where to write this run's results"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Replace the baseline with this run's results"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change that counts as faster or slower"
+    )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="traces",
+        default=None,
+        metavar="DIR",
+        help="Write a Chrome trace per render to DIR (default: traces)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark and compare it with the baseline.
+
+    Returns:
+        1 if any riddle count got slower than the threshold, else 0
+    """
+    args = parse_args(argv)
+    current = run_benchmark(
+        riddle_counts=args.riddles,
+        repeat=args.repeat,
+        config_path=args.config,
+        work_dir=args.work_dir,
+        codec=args.codec,
+        resolution=args.resolution,
+        fps=args.fps,
+        trace_dir=args.trace,
+        render_mode=args.render_mode,
+        quality=args.quality
+    )
+    _write_json(current, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        _write_json(current, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+
+    if baseline.get("environment", {}).get("machine") != current["environment"]["machine"] \
+            or baseline.get("settings") != current["settings"]:
+        print("Warning: baseline was recorded on a different machine or with different settings")
+
+    rows = compare_results(baseline, current, threshold=args.threshold)
+    print(format_comparison(rows))
+    return 1 if any(row["status"] == "slower" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
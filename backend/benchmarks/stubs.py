@@ -0,0 +1,76 @@
+"""Stub provider services for offline benchmarks"""
+
+import itertools
+import threading
+from typing import Dict, Optional
+from benchmarks.assets import SyntheticAssets
+from core.service_factory import ServiceFactory
+
+SAMPLE_RIDDLES = (
+    ("What has cities, but no houses; forests, but no trees; and water, but no fish?", "A map"),
+    ("I have keys but no locks. I have space but no room. You can enter, but can't go outside. What am I?", "A keyboard"),
+    ("The more you take, the more you leave behind. What am I?", "Footsteps"),
+    ("What can travel around the world while staying in a corner?", "A stamp"),
+    ("What has a head and a tail but no body?", "A coin")
+)
+
+
+class StubOpenAIService:
+    """Returns sample riddles in a fixed order instead of calling OpenAI."""
+
+    def __init__(self):
+        self._riddles = itertools.cycle(SAMPLE_RIDDLES)
+        self._lock = threading.Lock()
+
+    def generate_riddle(self, category: str, difficulty: str = "medium", **kwargs) -> Dict[str, str]:
+        with self._lock:
+            riddle, answer = next(self._riddles)
+        return {
+            "riddle": riddle,
+            "answer": answer,
+            "category": category,
+            "difficulty": difficulty
+        }
+
+
+class StubTTSService:
+    """Returns sine-tone tracks as long as the text would take to read."""
+
+    # Speaking rate used to size the tracks
+    SECONDS_PER_WORD = 0.4
+
+    def __init__(self, assets: SyntheticAssets):
+        self.assets = assets
+        self._lock = threading.Lock()
+
+    def generate_speech(self, text: str, voice_id: Optional[str] = None, **kwargs) -> str:
+        # Round to half seconds so tracks are shared between texts
+        duration = max(1.0, round(len(text.split()) * self.SECONDS_PER_WORD * 2) / 2)
+        with self._lock:
+            return self.assets.voice_track(duration)
+
+
+class StubPexelsService:
+    """Cycles through synthetic background clips instead of searching Pexels."""
+
+    def __init__(self, assets: SyntheticAssets):
+        self._clips = itertools.cycle(assets.background_clips())
+        self._lock = threading.Lock()
+
+    def get_video(self, category: str) -> str:
+        with self._lock:
+            return next(self._clips)
+
+    # Synthetic clips are always local
+    get_cached_video = get_video
+
+
+def install_stub_services(service_factory: ServiceFactory, assets: SyntheticAssets) -> None:
+    """Replace the network-backed services of a factory with stubs.
+    
+    Must run before the video composition service is created, since it
+    holds on to the Pexels service.
+    """
+    service_factory.register_service("openai", StubOpenAIService())
+    service_factory.register_service("tts", StubTTSService(assets))
+    service_factory.register_service("pexels", StubPexelsService(assets))
@@ -2,6 +2,7 @@
 
 import os
 import json
+import copy
 from typing import Dict, Any, Optional
 from config.exceptions import ConfigurationError, ConfigValidationError
 from utils.logger import log
@@ -17,7 +18,14 @@ class Configuration:
             "stability": 0.5,
             "similarity_boost": 0.75,
             "cache_dir": "cache/voice",
-            "language": "en-US"
+            "language": "en-US",
+            "max_concurrent_requests": 4
+        },
+        "http": {
+            "max_connections": 100,
+            "max_keepalive_connections": 20,
+            "timeout": 60.0,
+            "connect_timeout": 10.0
         },
         "video": {
             "min_duration": 30,
@@ -30,6 +38,52 @@ class Configuration:
                 "height": 1920
             },
             "fps": 30,
+            "encoder": {
+                "profile": "balanced",
+                "candidates": [
+                    "h264_videotoolbox", "h264_nvenc", "h264_qsv",
+                    "libx264", "libx265", "libopenh264", "mpeg4"
+                ],
+                "profiles": {}
+            },
+            "normalize": {
+                "enabled": True,
+                "workers": 1,
+                "codec": "libx264",
+                "preset": "veryfast",
+                "crf": 18,
+                "gop": 15
+            },
+            "frame_buffer": {
+                "enabled": True,
+                "max_bytes": 1073741824,
+                "max_clip_bytes": 536870912,
+                "max_duration": 6
+            },
+            "quality": {
+                "profile": "final",
+                "profiles": {}
+            },
+            "render": {
+                "mode": "single",
+                "workers": None,
+                "temp_dir": "cache/render",
+                "pipeline": {
+                    "enabled": True,
+                    "decoders": 2,
+                    "workers": None,
+                    "queue_size": 8
+                },
+                "chunks": {
+                    "count": None,
+                    "keyframe_interval": 2.0
+                },
+                "segment_cache": {
+                    "enabled": True,
+                    "dir": "cache/segments",
+                    "max_size": 2147483648
+                }
+            },
             "pexels": {
                 "categories": ["landscape", "mountains", "ocean"],
                 "resolution": {
@@ -77,6 +131,23 @@ class Configuration:
             "cache_dir": "cache/video",
             "max_cache_size_gb": 5
         },
+        "text": {
+            "cache": {
+                "enabled": True,
+                "memory_bytes": 67108864,
+                "dir": "cache/text",
+                "max_size": 268435456
+            }
+        },
+        "audio": {
+            "sample_rate": 44100,
+            "channels": 2,
+            "limiter_ceiling": 0.98,
+            "pcm_cache": {
+                "enabled": True,
+                "max_bytes": 268435456
+            }
+        },
         "presentation": {
             "text_overlay": {
                 "font_size": 48,
@@ -93,6 +164,25 @@ class Configuration:
             "max_cache_size": 1000000000,
             "cleanup_threshold": 0.9
         },
+        "pipeline": {
+            "stages": {
+                "riddles": {"workers": 2, "queue_size": 4},
+                "speech": {"workers": 2, "queue_size": 2},
+                "timings": {"workers": 1, "queue_size": 2},
+                "backgrounds": {"workers": 2, "queue_size": 2},
+                "render": {"workers": 1, "queue_size": 1}
+            }
+        },
+        "worker": {
+            "queue_path": "cache/jobs.db",
+            "processes": None,
+            "poll_interval": 2.0,
+            "stale_after": 60.0,
+            "max_attempts": 3
+        },
+        "checkpoint": {
+            "dir": "cache/checkpoints"
+        },
         "riddle": {
             "timing": {
                 "hook": {
@@ -143,7 +233,8 @@ class Configuration:
     def __init__(self, config_path: Optional[str] = None, logger=None):
         self.logger = logger or log
         self.config_path = config_path
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Deep copy so merging user config never mutates the shared defaults
+        self.config = copy.deepcopy(self.DEFAULT_CONFIG)
         
         if config_path:
             self.load_config(config_path)
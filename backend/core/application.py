@@ -9,29 +9,91 @@ International License. To view a copy of this license, visit:
 https://creativecommons.org/licenses/by-nc/4.0/
 """
 
+import contextlib
+import contextvars
 import logging
-from typing import Dict, List, Optional
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from config.config import Configuration
+from core.checkpoint import JobManifest
 from core.service_factory import ServiceFactory
 from config.exceptions import RiddlerException
 from utils.logger import log
+from utils.tracing import Tracer, traced
 
 class Application:
     """Main application class."""
 
+    # Segment types that are shown without a voiceover
+    SILENT_SEGMENT_TYPES = ("thinking",)
+
     def __init__(
         self,
         config_path: Optional[str] = None,
-        logger: logging.Logger = None
+        logger: logging.Logger = None,
+        trace_dir: Optional[str] = None
     ):
         # Set up logging
         self.logger = logger or log
         
+        # Write a Chrome trace per job when set
+        self.trace_dir = trace_dir
+        
         # Initialize configuration
         self.config = Configuration(config_path, self.logger)
         
         # Initialize service factory
         self.service_factory = ServiceFactory(self.config.config, self.logger)
+        
+        # Per-job checkpoint manifests for resuming
+        self.checkpoint_dir = self.config.get("checkpoint.dir", "cache/checkpoints")
+
+    def __enter__(self) -> "Application":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release all services held by the application."""
+        self.service_factory.cleanup()
+
+    def start_trace(self, name: str) -> Optional[Tracer]:
+        """Create the tracer for a job, or None when tracing is off."""
+        if self.trace_dir is None:
+            return None
+        return Tracer(name)
+
+    def finish_trace(self, tracer: Optional[Tracer]) -> Optional[str]:
+        """Write a job's trace to ``<trace_dir>/<name>.trace.json``."""
+        if tracer is None:
+            return None
+        try:
+            trace_path = tracer.write(os.path.join(self.trace_dir, f"{tracer.name}.trace.json"))
+            self.logger.info(f"Trace written to {trace_path}")
+            return trace_path
+        except OSError as e:
+            self.logger.warning(f"Failed to write trace: {str(e)}")
+            return None
+
+    @contextlib.contextmanager
+    def trace_job(self, name: str) -> Iterator[Optional[Tracer]]:
+        """Trace everything the enclosed block does in a ``job`` span.
+
+        A no-op unless the application was created with a ``trace_dir``.
+        """
+        tracer = self.start_trace(name)
+        if tracer is None:
+            yield None
+            return
+
+        try:
+            with tracer.activate(), tracer.span("job", cat="app", job=name):
+                yield tracer
+        finally:
+            self.finish_trace(tracer)
 
     def generate_riddle(
         self,
@@ -57,6 +119,145 @@ class Application:
             self.logger.error(f"Failed to generate riddle: {str(e)}")
             raise RiddlerException(f"Failed to generate riddle: {str(e)}")
 
+    @traced("app.generate_riddles", cat="app")
+    def generate_riddles(
+        self,
+        category: str,
+        difficulty: str = "medium",
+        num_riddles: int = 2,
+        no_cache: bool = False
+    ) -> List[Dict]:
+        """Generate riddles for a video, skipping riddles that fail.
+
+        Raises:
+            RiddlerException: If no riddle could be generated
+        """
+        riddles = []
+        for i in range(num_riddles):
+            try:
+                riddle_data = self.generate_riddle(
+                    category=category,
+                    difficulty=difficulty,
+                    no_cache=no_cache
+                )
+                # Add segment metadata
+                riddle_data.update({
+                    "id": f"riddle_{i}",
+                    "type": "riddle",
+                    "index": i
+                })
+                riddles.append(riddle_data)
+            except Exception as e:
+                self.logger.error(f"Error generating riddle: {str(e)}")
+                continue
+
+        if not riddles:
+            raise RiddlerException("Failed to generate any riddles")
+
+        return riddles
+
+    @traced("app.build_segments", cat="app")
+    def build_segments(self, riddles: List[Dict]) -> List[Dict]:
+        """Build the ordered video segments for a list of riddles.
+
+        Pattern texts for the hook, thinking, transition and CTA segments are
+        picked at random from ``riddle.format``.
+        """
+        config = self.config
+        segments = []
+        for i, riddle in enumerate(riddles):
+            # Add hook segment for first riddle
+            if i == 0:
+                hook_patterns = config.get("riddle.format.hook_patterns", [])
+                segments.append({
+                    "id": "hook",
+                    "type": "hook",
+                    "text": random.choice(hook_patterns),
+                    "index": len(segments)
+                })
+
+            # Add riddle question segment
+            segments.append({
+                "id": f"question_{i}",
+                "type": "question",
+                "text": riddle["riddle"],
+                "index": len(segments)
+            })
+
+            # Add thinking time segment
+            thinking_patterns = config.get("riddle.format.thinking_patterns", [])
+            segments.append({
+                "id": f"thinking_{i}",
+                "type": "thinking",
+                "text": random.choice(thinking_patterns),
+                "index": len(segments)
+            })
+
+            # Add answer segment
+            segments.append({
+                "id": f"answer_{i}",
+                "type": "answer",
+                "text": f"{riddle['answer']}",
+                "index": len(segments)
+            })
+
+            # Add transition for all but last riddle
+            if i < len(riddles) - 1:
+                next_riddle_patterns = config.get("riddle.format.next_riddle_patterns", [])
+                segments.append({
+                    "id": f"transition_{i}",
+                    "type": "transition",
+                    "text": random.choice(next_riddle_patterns),
+                    "index": len(segments)
+                })
+
+        # Add CTA at the end of the video
+        cta_patterns = config.get("riddle.format.call_to_action_patterns", [])
+        segments.append({
+            "id": "cta",
+            "type": "cta",
+            "text": random.choice(cta_patterns),
+            "index": len(segments)
+        })
+
+        return segments
+
+    def warmup_text_overlays(self, qualities: Optional[List[str]] = None) -> int:
+        """Render the overlays of every ``riddle.format`` pattern into the cache.
+
+        Args:
+            qualities: Quality profiles to render for (defaults to
+                ``video.quality.profile``)
+
+        Returns:
+            Number of overlays that were not cached yet
+        """
+        from services.video.composition_service import resolve_quality
+
+        texts = []
+        for name, patterns in self.config.get("riddle.format", {}).items():
+            if name.endswith("_patterns"):
+                texts.extend(pattern for pattern in patterns if pattern not in texts)
+        sizes = [resolve_quality(self.config.config, quality)["size"] for quality in qualities or [None]]
+
+        text_overlay = self.service_factory.get_text_overlay_service()
+        rendered = text_overlay.warmup(texts, sizes)
+        self.logger.info(f"Rendered {rendered} of {len(texts) * len(sizes)} text overlays")
+        return rendered
+
+    def preload_sound_effects(self) -> int:
+        """Decode the bundled sound effects so renders find them in memory.
+
+        Returns:
+            Number of sound effects loaded
+        """
+        try:
+            return self.service_factory.get_audio_composition_service().preload_sound_effects()
+        except Exception as e:
+            # Renders decode them on first use instead
+            self.logger.warning(f"Failed to preload sound effects: {str(e)}")
+            return 0
+
     def generate_speech(
         self,
         text: str,
@@ -77,6 +278,90 @@ class Application:
             self.logger.error(f"Failed to generate speech: {str(e)}")
             raise RiddlerException(f"Failed to generate speech: {str(e)}")
 
+    @traced("app.generate_segment_speech", cat="app")
+    def generate_segment_speech(
+        self,
+        segments: List[Dict],
+        max_workers: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """Generate speech for all voiced segments concurrently.
+
+        Each distinct text is synthesized once and the TTS requests run in
+        parallel, bounded by ``tts.max_concurrent_requests``.
+
+        Args:
+            segments: Video segments in playback order
+            max_workers: Optional override for the concurrency limit
+
+        Returns:
+            Voice paths in segment order (None for silent segments)
+
+        Raises:
+            RiddlerException: If any request failed, naming each failed
+                segment once every request has finished
+        """
+        texts = [
+            None if segment.get("type") in self.SILENT_SEGMENT_TYPES else segment.get("text")
+            for segment in segments
+        ]
+        unique_texts = list(dict.fromkeys(text for text in texts if text))
+        if not unique_texts:
+            return [None] * len(segments)
+
+        max_workers = max_workers or self.config.get("tts.max_concurrent_requests", 4)
+        max_workers = max(1, min(int(max_workers), len(unique_texts)))
+        self.logger.info(
+            f"Generating speech for {len(unique_texts)} unique texts "
+            f"({len(segments)} segments, {max_workers} concurrent requests)"
+        )
+
+        # Create the TTS service up front so worker threads share one instance
+        self.service_factory.get_tts_service()
+
+        # Each request runs in a copy of this context so it lands in the same trace
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts") as executor:
+            futures = {
+                text: executor.submit(contextvars.copy_context().run, self.generate_speech, text)
+                for text in unique_texts
+            }
+            voice_paths, errors = {}, {}
+            for text, future in futures.items():
+                try:
+                    voice_paths[text] = future.result()
+                except Exception as e:
+                    errors[text] = e
+
+        if errors:
+            failures = [
+                f"{segment.get('id', index)}: {errors[text]}"
+                for index, (segment, text) in enumerate(zip(segments, texts))
+                if text in errors
+            ]
+            raise RiddlerException(f"Failed to generate speech for {len(failures)} segments: {'; '.join(failures)}")
+
+        return [voice_paths[text] if text else None for text in texts]
+
+    def add_segment_speech(self, segments: List[Dict]) -> List[Dict]:
+        """Generate speech for the segments and store it as ``voice_path``."""
+        voice_paths = self.generate_segment_speech(segments)
+        for segment, voice_path in zip(segments, voice_paths):
+            if voice_path:
+                segment["voice_path"] = voice_path
+        return segments
+
+    def resolve_output_path(
+        self,
+        category: str,
+        output_dir: str = "output",
+        output_path: Optional[str] = None
+    ) -> str:
+        """Pick the output file for a video and make sure its directory exists."""
+        if not output_path:
+            output_path = os.path.join(output_dir, f"riddle_{category}_{os.urandom(4).hex()}.mp4")
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        return output_path
+
+    @traced("app.create_riddle_video", cat="app")
     def create_riddle_video(
         self,
         riddle_segments: List[Dict],
@@ -108,6 +393,232 @@ class Application:
         except Exception as e:
             self.logger.error(f"Unexpected error creating riddle video: {str(e)}")
             raise RiddlerException(f"Unexpected error: {str(e)}")
-        finally:
-            # Clean up services
-            self.service_factory.cleanup()
\ No newline at end of file
+
+    def open_manifest(
+        self,
+        job_id: Optional[str] = None,
+        resume: bool = False,
+        category: Optional[str] = None,
+        difficulty: str = "medium",
+        num_riddles: int = 2,
+        output_dir: str = "output",
+        output_path: Optional[str] = None,
+        riddles: Optional[List[Dict]] = None,
+        render_mode: Optional[str] = None
+    ) -> JobManifest:
+        """Get the checkpoint manifest a job runs against.
+
+        Args:
+            job_id: Job identifier (defaults to the output file name)
+            resume: Continue from the job's existing manifest, if any
+            category: Riddle category of a new job
+            difficulty: Riddle difficulty of a new job
+            num_riddles: Number of riddles of a new job
+            output_dir: Directory for the generated video
+            output_path: Optional explicit output file path
+            riddles: Optional pre-written riddles, skipping generation
+            render_mode: Optional override of ``video.render.mode``
+
+        Returns:
+            The resumed or a new manifest
+
+        Raises:
+            RiddlerException: If resuming a job that has no manifest and
+                no category to start it again from
+        """
+        if resume and job_id:
+            manifest = JobManifest.load(self.checkpoint_dir, job_id)
+            if manifest is not None:
+                if render_mode:
+                    # A failed render can be retried with another renderer
+                    manifest.data["render_mode"] = render_mode
+                    manifest.save()
+                self.logger.info(
+                    f"Resuming job {job_id} after stages: "
+                    f"{', '.join(manifest.completed_stages) or 'none'}"
+                )
+                return manifest
+            if not category:
+                raise RiddlerException(f"No checkpoint found for job {job_id} in {self.checkpoint_dir}")
+
+        output_path = self.resolve_output_path(category, output_dir, output_path)
+        job_id = job_id or os.path.splitext(os.path.basename(output_path))[0]
+        self.logger.info(f"Starting job {job_id}, resume it with --resume {job_id} if it fails")
+        return JobManifest.create(
+            self.checkpoint_dir,
+            job_id,
+            category=category,
+            difficulty=difficulty,
+            num_riddles=num_riddles,
+            output_path=output_path,
+            riddles=riddles,
+            render_mode=render_mode
+        )
+
+    def run_job_stage(
+        self,
+        manifest: JobManifest,
+        stage: str,
+        no_cache: bool = False,
+        preview: bool = False
+    ) -> None:
+        """Run one stage of a job and checkpoint its results.
+
+        Args:
+            manifest: The job's manifest, holding the earlier stages' results
+            stage: One of ``JobManifest.STAGES``
+            no_cache: Whether to bypass the riddle cache
+            preview: Only use cached backgrounds, and render a preview
+                next to the output instead of completing the render stage
+        """
+        composition = self.service_factory.get_video_composition_service()
+        category = manifest.get("category")
+
+        if stage == "riddles":
+            riddles = manifest.get("riddles") or self.generate_riddles(
+                category=category,
+                difficulty=manifest.get("difficulty", "medium"),
+                num_riddles=manifest.get("num_riddles", 2),
+                no_cache=no_cache
+            )
+            manifest.complete("riddles", riddles=riddles, segments=self.build_segments(riddles))
+
+        elif stage == "speech":
+            segments = self.add_segment_speech(manifest.get("segments"))
+            manifest.complete("speech", segments=segments)
+
+        elif stage == "timings":
+            timings = composition.calculate_timings(manifest.get("segments"))
+            manifest.complete("timings", timings=timings)
+
+        elif stage == "backgrounds":
+            backgrounds = composition.fetch_backgrounds(manifest.get("segments"), category, cached_only=preview)
+            manifest.complete("backgrounds", backgrounds=backgrounds)
+
+        elif stage == "render":
+            output_path = manifest.get("output_path")
+            if preview:
+                output_path = self.preview_path(output_path)
+            self.resolve_output_path(category, output_path=output_path)
+            try:
+                composition.render_video(
+                    manifest.get("segments"),
+                    manifest.get("timings"),
+                    manifest.get("backgrounds"),
+                    output_path,
+                    render_mode=manifest.get("render_mode"),
+                    quality="preview" if preview else None
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to render video for job {manifest.job_id}: {str(e)}")
+                raise RiddlerException(f"Failed to create video at {output_path}: {str(e)}")
+            if preview:
+                # The final render stays pending and reuses everything so far
+                manifest.data["preview_path"] = output_path
+                manifest.save()
+                self.logger.info(
+                    f"Created preview at {output_path}, "
+                    f"render the final video with --resume {manifest.job_id}"
+                )
+            else:
+                self.logger.info(f"Successfully created video at {output_path}")
+                manifest.complete("render")
+
+        else:
+            raise RiddlerException(f"Unknown job stage: {stage}")
+
+    @staticmethod
+    def preview_path(output_path: str) -> str:
+        """Get the preview file of an output video, e.g. ``video.preview.mp4``."""
+        base, extension = os.path.splitext(output_path)
+        return f"{base}.preview{extension}"
+
+    def pending_stages(self, manifest: JobManifest) -> List[str]:
+        """Get the stages a job still has to run.
+
+        A completed stage is redone if the files it produced are gone, e.g.
+        after a cache cleanup, along with every stage after it.
+        """
+        for index, stage in enumerate(JobManifest.STAGES):
+            if not manifest.is_complete(stage) or not self._stage_files_exist(manifest, stage):
+                return list(JobManifest.STAGES[index:])
+        return []
+
+    def _stage_files_exist(self, manifest: JobManifest, stage: str) -> bool:
+        if stage == "speech":
+            paths = [segment.get("voice_path") for segment in manifest.get("segments", [])]
+        elif stage == "backgrounds":
+            paths = manifest.get("backgrounds", [])
+        elif stage == "render":
+            paths = [manifest.get("output_path")]
+        else:
+            return True
+        return all(os.path.exists(path) for path in paths if path)
+
+    def run_job(
+        self,
+        category: Optional[str] = None,
+        difficulty: str = "medium",
+        num_riddles: int = 2,
+        output_dir: str = "output",
+        output_path: Optional[str] = None,
+        riddles: Optional[List[Dict]] = None,
+        no_cache: bool = False,
+        job_id: Optional[str] = None,
+        resume: bool = False,
+        render_mode: Optional[str] = None,
+        preview: bool = False
+    ) -> str:
+        """Run the full pipeline for one video.
+
+        A checkpoint manifest is saved after every stage, so a job that
+        failed or was killed can be resumed with ``resume=True`` from the
+        last completed stage. Services stay alive after the job so
+        consecutive jobs reuse their HTTP sessions and caches; call
+        ``close()`` when done.
+
+        Args:
+            category: Riddle category (not needed when resuming)
+            difficulty: Riddle difficulty
+            num_riddles: Number of riddles to generate
+            output_dir: Directory for the generated video
+            output_path: Optional explicit output file path
+            riddles: Optional pre-written riddles, skipping generation
+            no_cache: Whether to bypass the riddle cache
+            job_id: Job identifier naming the manifest and trace
+                (defaults to the output file name)
+            resume: Continue from the job's manifest if there is one
+            render_mode: Optional override of ``video.render.mode``
+            preview: Render a quick ``preview`` quality video from cached
+                backgrounds only. The job stays resumable, and resuming it
+                renders the final video from the same assets and timings
+
+        Returns:
+            Path to the generated video, or to the preview
+        """
+        manifest = self.open_manifest(
+            job_id=job_id,
+            resume=resume,
+            category=category,
+            difficulty=difficulty,
+            num_riddles=num_riddles,
+            output_dir=output_dir,
+            output_path=output_path,
+            riddles=riddles,
+            render_mode=render_mode
+        )
+
+        stages = self.pending_stages(manifest)
+        if preview:
+            # A preview is rendered even if the final video already exists
+            stages = [stage for stage in stages if stage != "render"] + ["render"]
+        elif not stages:
+            self.logger.info(f"Job {manifest.job_id} is already complete")
+
+        with self.trace_job(manifest.job_id):
+            for stage in stages:
+                self.run_job_stage(manifest, stage, no_cache=no_cache, preview=preview)
+
+        if preview:
+            return manifest.get("preview_path")
+        return manifest.get("output_path")
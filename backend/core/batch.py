@@ -0,0 +1,218 @@
+"""
+Riddler - AI-Powered Riddle Generation System
+
+This file is part of Riddler.
+Copyright (c) 2025 Riddler
+
+This work is licensed under the Creative Commons Attribution-NonCommercial 4.0
+International License. To view a copy of this license, visit:
+https://creativecommons.org/licenses/by-nc/4.0/
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+from config.exceptions import ValidationError
+from core.application import Application
+from utils.logger import log
+
+
+def load_jobs(jobs_path: str) -> List[Dict[str, Any]]:
+    """Load and normalize a jobs file.
+
+    The file holds a JSON list of jobs (or an object with a ``jobs`` list).
+    Each job names a ``category`` and optionally ``id``, ``difficulty``,
+    ``num_riddles``, ``output``, ``render_mode`` and ``riddles``. Pre-written
+    ``riddles`` use the same shape as ``examples/multi_riddles.json`` and
+    skip generation. ``render_mode`` overrides ``video.render.mode``.
+
+    Job ids name the checkpoint manifests, so they must be unique. Jobs
+    without an ``id`` get one from their position and a hash of the file
+    path and job, which never repeats across jobs files.
+
+    Args:
+        jobs_path: Path to the jobs file
+
+    Returns:
+        List of normalized job dictionaries
+
+    Raises:
+        ValidationError: If the file or a job is invalid
+    """
+    try:
+        with open(jobs_path, "r") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValidationError(f"Failed to read jobs file: {str(e)}", field="jobs")
+
+    if isinstance(data, dict):
+        data = data.get("jobs", [])
+    if not isinstance(data, list) or not data:
+        raise ValidationError("Jobs file must contain a non-empty list of jobs", field="jobs")
+
+    jobs = []
+    seen_ids = set()
+    for index, job in enumerate(data):
+        if not isinstance(job, dict):
+            raise ValidationError(f"Job {index} must be an object", field="jobs")
+
+        riddles = job.get("riddles")
+        category = job.get("category") or (riddles[0].get("category") if riddles else None)
+        if not category:
+            raise ValidationError(f"Job {index} is missing a category", field="category")
+
+        normalized = {
+            "id": str(job["id"]) if job.get("id") is not None else None,
+            "category": category,
+            "difficulty": job.get("difficulty", "medium"),
+            "num_riddles": int(job.get("num_riddles", len(riddles) if riddles else 2)),
+            "output": job.get("output"),
+            "render_mode": job.get("render_mode"),
+            "riddles": None
+        }
+
+        if riddles:
+            normalized["riddles"] = [
+                {
+                    "riddle": riddle.get("riddle", riddle.get("question")),
+                    "answer": riddle["answer"],
+                    "category": riddle.get("category", category),
+                    "difficulty": riddle.get("difficulty", normalized["difficulty"]),
+                    "id": f"riddle_{i}",
+                    "type": "riddle",
+                    "index": i
+                }
+                for i, riddle in enumerate(riddles)
+            ]
+
+        if normalized["id"] is None:
+            normalized["id"] = _default_job_id(jobs_path, index, normalized)
+        if normalized["id"] in seen_ids:
+            raise ValidationError(f"Job {index} repeats the id {normalized['id']}", field="id")
+        seen_ids.add(normalized["id"])
+
+        jobs.append(normalized)
+
+    return jobs
+
+
+def _default_job_id(jobs_path: str, index: int, job: Dict[str, Any]) -> str:
+    """Derive the id of a job that has none from its jobs file and contents."""
+    source = json.dumps([os.path.abspath(jobs_path), index, job], sort_keys=True)
+    return f"job_{index}_{hashlib.sha256(source.encode()).hexdigest()[:8]}"
+
+
+def write_results(
+    results: List[Dict[str, Any]],
+    results_path: str,
+    logger: logging.Logger = None
+) -> None:
+    """Write a batch results summary as JSON."""
+    summary = {
+        "total": len(results),
+        "succeeded": sum(1 for result in results if result["status"] == "done"),
+        "failed": sum(1 for result in results if result["status"] == "failed"),
+        "jobs": results
+    }
+    try:
+        with open(results_path, "w") as f:
+            json.dump(summary, f, indent=4)
+    except OSError as e:
+        (logger or log).warning(f"Failed to write results summary: {str(e)}")
+
+
+class BatchRunner:
+    """Renders many videos in one process with a shared, warm Application."""
+
+    def __init__(
+        self,
+        app: Application,
+        output_dir: str = "output",
+        no_cache: bool = False,
+        logger: logging.Logger = None
+    ):
+        self.app = app
+        self.output_dir = output_dir
+        self.no_cache = no_cache
+        self.logger = logger or log
+
+    def run(
+        self,
+        jobs: List[Dict[str, Any]],
+        results_path: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Run all jobs sequentially, recording a result for each.
+
+        The results summary is rewritten after every job so it stays useful
+        if the process is interrupted.
+
+        Args:
+            jobs: Normalized jobs from ``load_jobs``
+            results_path: Optional path of the JSON results summary
+
+        Returns:
+            Per-job result dictionaries
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        results_path = results_path or os.path.join(self.output_dir, "results.json")
+        self.app.preload_sound_effects()
+
+        results = []
+        for index, job in enumerate(jobs):
+            self.logger.info(f"Running job {index + 1}/{len(jobs)}: {job['id']}")
+            results.append(self.run_job(job))
+            write_results(results, results_path, self.logger)
+
+        succeeded = sum(1 for result in results if result["status"] == "done")
+        self.logger.info(
+            f"Batch finished: {succeeded}/{len(results)} jobs succeeded, "
+            f"results written to {results_path}"
+        )
+        return results
+
+    def run_job(self, job: Dict[str, Any], resume: bool = False) -> Dict[str, Any]:
+        """Run a single job and return its result record.
+
+        Args:
+            job: Normalized job
+            resume: Continue from the job's checkpoint, e.g. on a retry
+        """
+        output_path = None
+        if job.get("output"):
+            output_path = os.path.join(self.output_dir, job["output"])
+
+        result = {
+            "id": job["id"],
+            "category": job["category"],
+            "status": "running",
+            "output_path": None,
+            "error": None,
+            "duration": 0.0
+        }
+
+        start_time = time.monotonic()
+        try:
+            result["output_path"] = self.app.run_job(
+                category=job["category"],
+                difficulty=job.get("difficulty", "medium"),
+                num_riddles=job.get("num_riddles", 2),
+                output_dir=self.output_dir,
+                output_path=output_path,
+                riddles=job.get("riddles"),
+                no_cache=self.no_cache,
+                job_id=job["id"],
+                resume=resume,
+                render_mode=job.get("render_mode")
+            )
+            result["status"] = "done"
+        except Exception as e:
+            self.logger.error(f"Job {job['id']} failed: {str(e)}")
+            result["status"] = "failed"
+            result["error"] = str(e)
+        finally:
+            result["duration"] = round(time.monotonic() - start_time, 3)
+
+        return result
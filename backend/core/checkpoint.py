@@ -0,0 +1,127 @@
+"""
+Riddler - AI-Powered Riddle Generation System
+
+This file is part of Riddler.
+Copyright (c) 2025 Riddler
+
+This work is licensed under the Creative Commons Attribution-NonCommercial 4.0
+International License. To view a copy of this license, visit:
+https://creativecommons.org/licenses/by-nc/4.0/
+"""
+
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+
+class JobManifest:
+    """Checkpoint of a job's progress, saved after every stage.
+
+    The manifest records everything a stage decided: the riddles, the
+    segments with their randomly picked pattern texts and voice paths, the
+    timings and the background clips. A resumed job reloads these instead
+    of generating new ones, so it repeats neither API calls nor random
+    choices.
+    """
+
+    STAGES = ("riddles", "speech", "timings", "backgrounds", "render")
+
+    RUNNING = "running"
+    DONE = "done"
+
+    def __init__(self, path: str, data: Dict[str, Any]):
+        self.path = path
+        self.data = data
+
+    @staticmethod
+    def path_for(checkpoint_dir: str, job_id: str) -> str:
+        """Get the manifest file of a job."""
+        safe_id = re.sub(r"[^A-Za-z0-9._-]", "_", job_id)
+        return os.path.join(checkpoint_dir, f"{safe_id}.json")
+
+    @classmethod
+    def create(
+        cls,
+        checkpoint_dir: str,
+        job_id: str,
+        category: str,
+        difficulty: str,
+        num_riddles: int,
+        output_path: str,
+        riddles: Optional[List[Dict]] = None,
+        render_mode: Optional[str] = None
+    ) -> "JobManifest":
+        """Start a new manifest, replacing any earlier one for the job."""
+        now = time.time()
+        manifest = cls(cls.path_for(checkpoint_dir, job_id), {
+            "job_id": job_id,
+            "category": category,
+            "difficulty": difficulty,
+            "num_riddles": num_riddles,
+            "output_path": output_path,
+            "render_mode": render_mode,
+            "status": cls.RUNNING,
+            "completed_stages": [],
+            "created": now,
+            "updated": now,
+            # Pre-written riddles skip generation in the riddles stage
+            "riddles": riddles,
+            "segments": None,
+            "timings": None,
+            "backgrounds": None
+        })
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, checkpoint_dir: str, job_id: str) -> Optional["JobManifest"]:
+        """Load a job's manifest, or None if it has none."""
+        path = cls.path_for(checkpoint_dir, job_id)
+        try:
+            with open(path, "r") as f:
+                return cls(path, json.load(f))
+        except FileNotFoundError:
+            return None
+
+    @property
+    def job_id(self) -> str:
+        return self.data["job_id"]
+
+    @property
+    def completed_stages(self) -> List[str]:
+        return self.data["completed_stages"]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a recorded value."""
+        value = self.data.get(key)
+        return default if value is None else value
+
+    def is_complete(self, stage: str) -> bool:
+        """Whether a stage finished and was saved."""
+        return stage in self.completed_stages
+
+    def complete(self, stage: str, **values: Any) -> None:
+        """Record a finished stage and its results, then save.
+
+        Later stages are forgotten, since they were based on what this
+        stage produced before.
+        """
+        index = self.STAGES.index(stage)
+        self.data.update(values)
+        self.data["completed_stages"] = [
+            name for name in self.STAGES[:index] if name in self.completed_stages
+        ] + [stage]
+        if stage == self.STAGES[-1]:
+            self.data["status"] = self.DONE
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically, so a crash never leaves half a file."""
+        self.data["updated"] = time.time()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.data, f, indent=4)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,304 @@
+"""
+Riddler - AI-Powered Riddle Generation System
+
+This file is part of Riddler.
+Copyright (c) 2025 Riddler
+
+This work is licensed under the Creative Commons Attribution-NonCommercial 4.0
+International License. To view a copy of this license, visit:
+https://creativecommons.org/licenses/by-nc/4.0/
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from config.exceptions import RiddlerException
+
+
+class JobQueue:
+    """Durable job queue stored in a local SQLite database.
+
+    Jobs move through the states ``queued`` -> ``running`` -> ``done`` or
+    ``failed``. Every transition is appended to ``job_events`` with a
+    timestamp, and jobs that fail are queued again until they run out of
+    attempts.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            state TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            worker TEXT,
+            output_path TEXT,
+            error TEXT,
+            queued_at REAL NOT NULL,
+            started_at REAL,
+            heartbeat_at REAL,
+            finished_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+        CREATE TABLE IF NOT EXISTS job_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job INTEGER NOT NULL REFERENCES jobs (id),
+            state TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            message TEXT
+        );
+    """
+
+    def __init__(self, db_path: str = "cache/jobs.db"):
+        """Open (and create if needed) the queue database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        try:
+            self._conn = sqlite3.connect(
+                db_path,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+        except sqlite3.Error as e:
+            raise RiddlerException(f"Failed to open job queue {db_path}: {str(e)}")
+
+        self._lock = threading.Lock()
+
+    def enqueue(self, job: Dict[str, Any], max_attempts: int = 3) -> int:
+        """Add a job to the queue.
+
+        Args:
+            job: Normalized job dictionary (see ``core.batch.load_jobs``)
+            max_attempts: How many times the job may run before it fails
+
+        Returns:
+            Queue id of the new job
+
+        Raises:
+            RiddlerException: If a job with the same id is queued or
+                running, since both would share one checkpoint
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            active = conn.execute(
+                "SELECT id FROM jobs WHERE job_id = ? AND state IN (?, ?)",
+                (job["id"], self.QUEUED, self.RUNNING)
+            ).fetchone()
+            if active is not None:
+                raise RiddlerException(f"Job {job['id']} is already in the queue (queue id {active['id']})")
+            cursor = conn.execute(
+                "INSERT INTO jobs (job_id, payload, state, max_attempts, queued_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job["id"], json.dumps(job), self.QUEUED, max_attempts, now)
+            )
+            self._record_event(conn, cursor.lastrowid, self.QUEUED, now)
+            return cursor.lastrowid
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued job to ``running``.
+
+        Args:
+            worker: Name of the worker claiming the job
+
+        Returns:
+            Job record, or None if the queue is empty
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE state = ? ORDER BY id LIMIT 1",
+                (self.QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, worker = ?, "
+                "started_at = ?, heartbeat_at = ?, finished_at = NULL WHERE id = ?",
+                (self.RUNNING, worker, now, now, row["id"])
+            )
+            self._record_event(conn, row["id"], self.RUNNING, now, worker)
+
+        record = self._to_record(row)
+        record.update({"state": self.RUNNING, "attempts": row["attempts"] + 1, "worker": worker})
+        return record
+
+    def mark_done(self, queue_id: int, output_path: Optional[str] = None) -> None:
+        """Mark a running job as finished successfully."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, output_path = ?, error = NULL, finished_at = ? "
+                "WHERE id = ?",
+                (self.DONE, output_path, now, queue_id)
+            )
+            self._record_event(conn, queue_id, self.DONE, now, output_path)
+
+    def mark_failed(self, queue_id: int, error: str) -> str:
+        """Record a failed run, queueing the job again if attempts remain.
+
+        Returns:
+            The job's new state (``queued`` or ``failed``)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ?",
+                (queue_id,)
+            ).fetchone()
+            state = self.QUEUED if row and row["attempts"] < row["max_attempts"] else self.FAILED
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+                (state, error, now, queue_id)
+            )
+            self._record_event(conn, queue_id, self.FAILED, now, error)
+            if state == self.QUEUED:
+                self._record_event(conn, queue_id, self.QUEUED, now, "retry")
+        return state
+
+    def release(self, queue_id: int) -> None:
+        """Put a claimed job back in the queue without using up an attempt."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = MAX(attempts - 1, 0) WHERE id = ? AND state = ?",
+                (self.QUEUED, queue_id, self.RUNNING)
+            )
+            self._record_event(conn, queue_id, self.QUEUED, now, "released")
+
+    def heartbeat(self, worker: str) -> None:
+        """Mark the jobs a worker is running as still alive."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE state = ? AND worker = ?",
+                (time.time(), self.RUNNING, worker)
+            )
+
+    def recover(self, worker: Optional[str] = None, stale_after: Optional[float] = None) -> int:
+        """Requeue jobs left ``running`` by a worker that crashed.
+
+        Without arguments every running job is requeued, which is only
+        safe while no worker is using the queue. Workers sharing a queue
+        pass their own name and a timeout instead, so jobs that another
+        live worker keeps sending heartbeats for are left alone.
+
+        The interrupted run counts as an attempt, so a job that keeps
+        crashing its worker eventually fails. Finished jobs are never
+        touched and are not processed again.
+
+        Args:
+            worker: Recover the jobs claimed under this worker name
+            stale_after: Recover jobs without a heartbeat for this many seconds
+
+        Returns:
+            Number of recovered jobs
+        """
+        now = time.time()
+        query = "SELECT id, attempts, max_attempts FROM jobs WHERE state = ?"
+        params: List[Any] = [self.RUNNING]
+        if worker is not None or stale_after is not None:
+            query += " AND (worker = ? OR heartbeat_at < ?)"
+            params += [worker, now - stale_after if stale_after is not None else float("-inf")]
+        with self._transaction() as conn:
+            rows = conn.execute(query, params).fetchall()
+            for row in rows:
+                state = self.QUEUED if row["attempts"] < row["max_attempts"] else self.FAILED
+                conn.execute(
+                    "UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+                    (state, "interrupted", now, row["id"])
+                )
+                self._record_event(conn, row["id"], state, now, "recovered after crash")
+        return len(rows)
+
+    def get(self, queue_id: int) -> Optional[Dict[str, Any]]:
+        """Get a job record by queue id."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (queue_id,)).fetchone()
+        return self._to_record(row) if row else None
+
+    def events(self, queue_id: int) -> List[Dict[str, Any]]:
+        """Get the state transitions of a job in order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, timestamp, message FROM job_events WHERE job = ? ORDER BY id",
+                (queue_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Count jobs per state."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) AS count FROM jobs GROUP BY state"
+            ).fetchall()
+        counts = {state: 0 for state in (self.QUEUED, self.RUNNING, self.DONE, self.FAILED)}
+        counts.update({row["state"]: row["count"] for row in rows})
+        return counts
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self):
+        """Serialize writers and run the block in an immediate transaction."""
+        return _Transaction(self._conn, self._lock)
+
+    def _record_event(
+        self,
+        conn: sqlite3.Connection,
+        queue_id: int,
+        state: str,
+        timestamp: float,
+        message: Optional[str] = None
+    ) -> None:
+        conn.execute(
+            "INSERT INTO job_events (job, state, timestamp, message) VALUES (?, ?, ?, ?)",
+            (queue_id, state, timestamp, message)
+        )
+
+    def _to_record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record["job"] = json.loads(record.pop("payload"))
+        return record
+
+
+class _Transaction:
+    """Context manager for an exclusive write transaction."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self.lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
@@ -0,0 +1,244 @@
+"""
+Riddler - AI-Powered Riddle Generation System
+
+This file is part of Riddler.
+Copyright (c) 2025 Riddler
+
+This work is licensed under the Creative Commons Attribution-NonCommercial 4.0
+International License. To view a copy of this license, visit:
+https://creativecommons.org/licenses/by-nc/4.0/
+"""
+
+import functools
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from core.application import Application
+from core.batch import write_results
+from utils.logger import log
+
+# Marks the end of a stage's input
+_STOP = object()
+
+
+class PipelineStage:
+    """One step of the pipeline with its own bounded queue and workers."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], None],
+        workers: int = 1,
+        queue_size: int = 2
+    ):
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._remaining_workers = self.workers
+        self._lock = threading.Lock()
+
+    def worker_finished(self) -> bool:
+        """Record that a worker exited; True for the last one."""
+        with self._lock:
+            self._remaining_workers -= 1
+            return self._remaining_workers == 0
+
+
+class PipelineScheduler:
+    """Runs many videos through overlapping stages.
+
+    Each video moves through the riddles, speech, timings, backgrounds and
+    render stages in order, but different videos occupy different stages at
+    the same time: while video N is encoding, video N+1 can fetch speech and
+    backgrounds. Stage queues are bounded, so a slow stage holds back the
+    stages before it instead of piling up work in memory.
+    """
+
+    STAGES = ("riddles", "speech", "timings", "backgrounds", "render")
+
+    DEFAULT_STAGE_CONFIG = {
+        "riddles": {"workers": 2, "queue_size": 4},
+        "speech": {"workers": 2, "queue_size": 2},
+        "timings": {"workers": 1, "queue_size": 2},
+        "backgrounds": {"workers": 2, "queue_size": 2},
+        "render": {"workers": 1, "queue_size": 1}
+    }
+
+    def __init__(
+        self,
+        app: Application,
+        output_dir: str = "output",
+        no_cache: bool = False,
+        stage_config: Optional[Dict[str, Dict[str, int]]] = None,
+        resume: bool = False,
+        logger: logging.Logger = None
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            app: Application whose services are shared by all stages
+            output_dir: Directory for generated videos
+            no_cache: Whether to bypass the riddle cache
+            stage_config: Per-stage ``workers`` and ``queue_size``
+                (defaults to the ``pipeline.stages`` config section)
+            resume: Continue jobs from their checkpoints where they exist
+            logger: Optional logger instance
+        """
+        self.app = app
+        self.output_dir = output_dir
+        self.no_cache = no_cache
+        self.resume = resume
+        self.logger = logger or log
+
+        stage_config = stage_config or app.config.get("pipeline.stages", {})
+        self.stages = []
+        for name in self.STAGES:
+            settings = dict(self.DEFAULT_STAGE_CONFIG[name])
+            settings.update(stage_config.get(name, {}))
+            self.stages.append(PipelineStage(name, functools.partial(self._run_stage, name), **settings))
+
+        self._results_lock = threading.Lock()
+
+    def run(
+        self,
+        jobs: List[Dict[str, Any]],
+        results_path: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Run all jobs through the pipeline.
+
+        Args:
+            jobs: Normalized jobs from ``core.batch.load_jobs``
+            results_path: Optional path of the JSON results summary
+
+        Returns:
+            Per-job result dictionaries in job order
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._results_path = results_path or os.path.join(self.output_dir, "results.json")
+        self.app.preload_sound_effects()
+        self._results = [None] * len(jobs)
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._stage_worker,
+                    args=(stage, next_stage),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        # Feeding blocks while the first queue is full
+        first_stage = self.stages[0]
+        for index, job in enumerate(jobs):
+            first_stage.queue.put(self._new_context(index, job))
+        for _ in range(first_stage.workers):
+            first_stage.queue.put(_STOP)
+
+        for thread in threads:
+            thread.join()
+
+        results = self._results
+        write_results(results, self._results_path, self.logger)
+        succeeded = sum(1 for result in results if result["status"] == "done")
+        self.logger.info(
+            f"Pipeline finished: {succeeded}/{len(results)} jobs succeeded, "
+            f"results written to {self._results_path}"
+        )
+        return results
+
+    def _new_context(self, index: int, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Create the state that travels with a job through the stages."""
+        output_path = None
+        if job.get("output"):
+            output_path = os.path.join(self.output_dir, job["output"])
+
+        return {
+            "index": index,
+            "job": job,
+            "output_path": output_path,
+            "manifest": None,
+            "pending": None,
+            "start_time": time.monotonic(),
+            "stages": {},
+            "tracer": self.app.start_trace(job["id"])
+        }
+
+    def _stage_worker(self, stage: PipelineStage, next_stage: Optional[PipelineStage]) -> None:
+        """Process items from a stage queue and hand them to the next stage."""
+        while True:
+            context = stage.queue.get()
+            if context is _STOP:
+                if stage.worker_finished() and next_stage is not None:
+                    for _ in range(next_stage.workers):
+                        next_stage.queue.put(_STOP)
+                return
+
+            job = context["job"]
+            tracer = context["tracer"]
+            start_time = time.monotonic()
+            error = None
+            try:
+                if tracer is None:
+                    stage.func(context)
+                else:
+                    with tracer.activate(), tracer.span(f"stage.{stage.name}", cat="pipeline"):
+                        stage.func(context)
+            except Exception as e:
+                self.logger.error(f"Job {job['id']} failed in {stage.name} stage: {str(e)}")
+                error = f"{stage.name}: {str(e)}"
+            context["stages"][stage.name] = round(time.monotonic() - start_time, 3)
+
+            if error or next_stage is None:
+                self._finish(context, error=error)
+            else:
+                next_stage.queue.put(context)
+
+    def _finish(self, context: Dict[str, Any], error: Optional[str] = None) -> None:
+        """Record the result of a job that left the pipeline."""
+        job = context["job"]
+        result = {
+            "id": job["id"],
+            "category": job["category"],
+            "status": "failed" if error else "done",
+            "output_path": None if error else context["output_path"],
+            "error": error,
+            "duration": round(time.monotonic() - context["start_time"], 3),
+            "stages": context["stages"]
+        }
+        if not error:
+            self.logger.info(f"Job {job['id']} done in {result['duration']:.1f}s: {result['output_path']}")
+        self.app.finish_trace(context["tracer"])
+
+        with self._results_lock:
+            self._results[context["index"]] = result
+            write_results([r for r in self._results if r], self._results_path, self.logger)
+
+    def _run_stage(self, stage: str, context: Dict[str, Any]) -> None:
+        """Run a job's stage against its checkpoint manifest."""
+        if context["manifest"] is None:
+            job = context["job"]
+            context["manifest"] = self.app.open_manifest(
+                job_id=job["id"],
+                resume=self.resume,
+                category=job["category"],
+                difficulty=job.get("difficulty", "medium"),
+                num_riddles=job.get("num_riddles", 2),
+                output_dir=self.output_dir,
+                output_path=context["output_path"],
+                riddles=job.get("riddles"),
+                render_mode=job.get("render_mode")
+            )
+            context["pending"] = self.app.pending_stages(context["manifest"])
+
+        # Stages restored from the checkpoint still pass through their queue
+        if stage in context["pending"]:
+            self.app.run_job_stage(context["manifest"], stage, no_cache=self.no_cache)
+        context["output_path"] = context["manifest"].get("output_path")
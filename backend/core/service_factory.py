@@ -10,19 +10,35 @@ https://creativecommons.org/licenses/by-nc/4.0/
 """
 
 import logging
-from typing import Dict, Optional
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
 from utils.helpers import get_api_key
 from utils.logger import log
 
-from services.external.pexels_service import PexelsService
-from services.video.composition_service import VideoCompositionService
-from services.video.effects_service import VideoEffectsService
-from services.video.text_overlay_service import TextOverlayService
-from services.video.segment_service import SegmentService
-from services.audio.composition_service import AudioCompositionService
-from services.timing.segment_timing_service import SegmentTimingService
-from services.openai.service import OpenAIService
-from services.tts.service import TTSService
+# Service modules pull in MoviePy, the OpenAI SDK and HTTP clients, so
+# each getter imports its service when it is first called
+if TYPE_CHECKING:
+    import httpx
+    from services.external.pexels_service import PexelsService
+    from services.external.async_pexels_service import AsyncPexelsService
+    from services.video.composition_service import VideoCompositionService
+    from services.video.effects_service import VideoEffectsService
+    from services.video.text_overlay_service import TextOverlayService
+    from services.video.segment_service import SegmentService
+    from services.video.segment_renderer import SegmentRenderer
+    from services.video.ffmpeg_renderer import FFmpegRenderer
+    from services.video.encoders import EncoderRegistry
+    from services.video.clip_normalizer import ClipNormalizer
+    from services.video.frame_buffer import FrameBuffer
+    from services.video.frame_pipeline import FramePipeline
+    from services.audio.composition_service import AudioCompositionService
+    from services.audio.mixer import AudioMixer
+    from services.audio.pcm_cache import PCMCache
+    from services.timing.segment_timing_service import SegmentTimingService
+    from services.openai.service import OpenAIService
+    from services.openai.async_service import AsyncOpenAIService
+    from services.tts.service import TTSService
+    from services.tts.async_service import AsyncTTSService
 
 class ServiceFactory:
     """Factory class for creating and managing service instances."""
@@ -31,9 +47,11 @@ class ServiceFactory:
         self.config = config
         self.logger = logger or log
         self._services = {}
+        self._lock = threading.RLock()
 
-    def get_openai_service(self) -> OpenAIService:
+    def get_openai_service(self) -> "OpenAIService":
         """Get or create OpenAIService instance."""
+        from services.openai.service import OpenAIService
         return self._get_or_create_service(
             "openai",
             lambda: OpenAIService(
@@ -43,41 +61,76 @@ class ServiceFactory:
             )
         )
 
-    def get_tts_service(self) -> TTSService:
+    def get_tts_service(self) -> "TTSService":
         """Get or create TTSService instance."""
+        from services.tts.service import TTSService
         return self._get_or_create_service(
             "tts",
             lambda: TTSService(
                 api_key=get_api_key("elevenlabs"),
-                voice_id=self.config.get("tts", {}).get("voice_id", "pqHfZKP75CvOlQylNhV4"),
-                model=self.config.get("tts", {}).get("model", "eleven_monolingual_v1"),
-                stability=float(self.config.get("tts", {}).get("stability", 0.5)),
-                similarity_boost=float(self.config.get("tts", {}).get("similarity_boost", 0.75)),
-                cache_dir=self.config.get("tts", {}).get("cache_dir", "cache/voice"),
-                logger=self.logger
+                **self._tts_options()
             )
         )
 
-    def get_pexels_service(self) -> PexelsService:
+    def get_pexels_service(self) -> "PexelsService":
         """Get or create PexelsService instance."""
-        video_config = self.config.get("video", {})
-        pexels_config = video_config.get("pexels", {})
+        from services.external.pexels_service import PexelsService
         return self._get_or_create_service(
             "pexels",
             lambda: PexelsService(
                 config=self.config,
-                min_duration=pexels_config.get("min_duration", 1),
-                max_duration=pexels_config.get("max_duration", 3),
-                min_width=video_config.get("min_width", 1080),
-                min_height=video_config.get("min_height", 1920),
-                orientation=video_config.get("orientation", "portrait"),
-                cache_dir=video_config.get("cache_dir", "cache/video"),
+                **self._pexels_options()
+            )
+        )
+
+    def get_async_http_client(self) -> "httpx.AsyncClient":
+        """Get or create the async HTTP client shared by the async services."""
+        from utils.http import create_async_client
+        return self._get_or_create_service(
+            "async_http_client",
+            lambda: create_async_client(self.config)
+        )
+
+    def get_async_openai_service(self) -> "AsyncOpenAIService":
+        """Get or create AsyncOpenAIService instance."""
+        from services.openai.async_service import AsyncOpenAIService
+        return self._get_or_create_service(
+            "async_openai",
+            lambda: AsyncOpenAIService(
+                client=self.get_async_http_client(),
+                config=self.config,
+                api_key=get_api_key("openai"),
                 logger=self.logger
             )
         )
 
-    def get_video_effects_service(self) -> VideoEffectsService:
+    def get_async_tts_service(self) -> "AsyncTTSService":
+        """Get or create AsyncTTSService instance."""
+        from services.tts.async_service import AsyncTTSService
+        return self._get_or_create_service(
+            "async_tts",
+            lambda: AsyncTTSService(
+                client=self.get_async_http_client(),
+                api_key=get_api_key("elevenlabs"),
+                **self._tts_options()
+            )
+        )
+
+    def get_async_pexels_service(self) -> "AsyncPexelsService":
+        """Get or create AsyncPexelsService instance."""
+        from services.external.async_pexels_service import AsyncPexelsService
+        return self._get_or_create_service(
+            "async_pexels",
+            lambda: AsyncPexelsService(
+                client=self.get_async_http_client(),
+                config=self.config,
+                **self._pexels_options()
+            )
+        )
+
+    def get_video_effects_service(self) -> "VideoEffectsService":
         """Get or create VideoEffectsService instance."""
+        from services.video.effects_service import VideoEffectsService
         return self._get_or_create_service(
             "video_effects",
             lambda: VideoEffectsService(
@@ -86,8 +139,9 @@ class ServiceFactory:
             )
         )
 
-    def get_text_overlay_service(self) -> TextOverlayService:
+    def get_text_overlay_service(self) -> "TextOverlayService":
         """Get or create TextOverlayService instance."""
+        from services.video.text_overlay_service import TextOverlayService
         return self._get_or_create_service(
             "text_overlay",
             lambda: TextOverlayService(
@@ -96,30 +150,128 @@ class ServiceFactory:
             )
         )
 
-    def get_segment_service(self) -> SegmentService:
+    def get_segment_service(self) -> "SegmentService":
         """Get or create SegmentService instance."""
+        from services.video.segment_service import SegmentService
         return self._get_or_create_service(
             "segment",
             lambda: SegmentService(
                 video_effects=self.get_video_effects_service(),
                 text_overlay=self.get_text_overlay_service(),
+                frame_buffer=self.get_frame_buffer(),
+                config=self.config,
+                logger=self.logger
+            )
+        )
+
+    def get_frame_buffer(self) -> "FrameBuffer":
+        """Get or create the FrameBuffer shared by every segment."""
+        from services.video.frame_buffer import FrameBuffer
+        return self._get_or_create_service(
+            "frame_buffer",
+            lambda: FrameBuffer(
+                config=self.config,
+                logger=self.logger
+            )
+        )
+
+    def get_segment_renderer(self) -> "SegmentRenderer":
+        """Get or create SegmentRenderer instance."""
+        from services.video.segment_renderer import SegmentRenderer
+        return self._get_or_create_service(
+            "segment_renderer",
+            lambda: SegmentRenderer(
+                segment_service=self.get_segment_service(),
+                config=self.config,
+                logger=self.logger,
+                frame_pipeline=self.get_frame_pipeline()
+            )
+        )
+
+    def get_ffmpeg_renderer(self) -> "FFmpegRenderer":
+        """Get or create FFmpegRenderer instance."""
+        from services.video.ffmpeg_renderer import FFmpegRenderer
+        return self._get_or_create_service(
+            "ffmpeg_renderer",
+            lambda: FFmpegRenderer(
+                text_overlay=self.get_text_overlay_service(),
+                audio_composition=self.get_audio_composition_service(),
+                config=self.config,
+                logger=self.logger
+            )
+        )
+
+    def get_frame_pipeline(self) -> "FramePipeline":
+        """Get or create FramePipeline instance."""
+        from services.video.frame_pipeline import FramePipeline
+        return self._get_or_create_service(
+            "frame_pipeline",
+            lambda: FramePipeline(
+                config=self.config,
+                logger=self.logger
+            )
+        )
+
+    def get_clip_normalizer(self) -> "ClipNormalizer":
+        """Get or create ClipNormalizer instance."""
+        from services.video.clip_normalizer import ClipNormalizer
+        return self._get_or_create_service(
+            "clip_normalizer",
+            lambda: ClipNormalizer(
+                config=self.config,
+                logger=self.logger
+            )
+        )
+
+    def get_encoder_registry(self) -> "EncoderRegistry":
+        """Get or create EncoderRegistry instance."""
+        from services.video.encoders import EncoderRegistry
+        return self._get_or_create_service(
+            "encoder_registry",
+            lambda: EncoderRegistry(
                 config=self.config,
                 logger=self.logger
             )
         )
 
-    def get_audio_composition_service(self) -> AudioCompositionService:
+    def get_audio_composition_service(self) -> "AudioCompositionService":
         """Get or create AudioCompositionService instance."""
+        from services.audio.composition_service import AudioCompositionService
         return self._get_or_create_service(
             "audio_composition",
             lambda: AudioCompositionService(
+                config=self.config,
+                logger=self.logger,
+                mixer=self.get_audio_mixer()
+            )
+        )
+
+    def get_audio_mixer(self) -> "AudioMixer":
+        """Get or create AudioMixer instance."""
+        from services.audio.mixer import AudioMixer
+        return self._get_or_create_service(
+            "audio_mixer",
+            lambda: AudioMixer(
+                config=self.config,
+                logger=self.logger,
+                pcm_cache=self.get_pcm_cache()
+            )
+        )
+
+    def get_pcm_cache(self) -> "PCMCache":
+        """Get or create the PCMCache shared by every audio mix."""
+        from services.audio.pcm_cache import PCMCache
+        return self._get_or_create_service(
+            "pcm_cache",
+            lambda: PCMCache(
                 config=self.config,
                 logger=self.logger
             )
         )
 
-    def get_segment_timing_service(self) -> SegmentTimingService:
+    def get_segment_timing_service(self) -> "SegmentTimingService":
         """Get or create SegmentTimingService instance."""
+        from services.timing.segment_timing_service import SegmentTimingService
         return self._get_or_create_service(
             "segment_timing",
             lambda: SegmentTimingService(
@@ -128,8 +280,9 @@ class ServiceFactory:
             )
         )
 
-    def get_video_composition_service(self) -> VideoCompositionService:
+    def get_video_composition_service(self) -> "VideoCompositionService":
         """Get or create VideoCompositionService instance."""
+        from services.video.composition_service import VideoCompositionService
         return self._get_or_create_service(
             "video_composition",
             lambda: VideoCompositionService(
@@ -139,16 +292,72 @@ class ServiceFactory:
                 audio_composition=self.get_audio_composition_service(),
                 segment_timing=self.get_segment_timing_service(),
                 segment_service=self.get_segment_service(),
+                segment_renderer=self.get_segment_renderer(),
+                ffmpeg_renderer=self.get_ffmpeg_renderer(),
+                encoder_registry=self.get_encoder_registry(),
+                clip_normalizer=self.get_clip_normalizer(),
+                frame_pipeline=self.get_frame_pipeline(),
                 config=self.config,
                 logger=self.logger
             )
         )
 
+    def _tts_options(self) -> Dict:
+        """TTS service options shared by the sync and async services."""
+        tts_config = self.config.get("tts", {})
+        return {
+            "voice_id": tts_config.get("voice_id", "pqHfZKP75CvOlQylNhV4"),
+            "model": tts_config.get("model", "eleven_monolingual_v1"),
+            "stability": float(tts_config.get("stability", 0.5)),
+            "similarity_boost": float(tts_config.get("similarity_boost", 0.75)),
+            "cache_dir": tts_config.get("cache_dir", "cache/voice"),
+            "base_url": tts_config.get("base_url"),
+            "logger": self.logger
+        }
+
+    def _pexels_options(self) -> Dict:
+        """Pexels service options shared by the sync and async services."""
+        video_config = self.config.get("video", {})
+        pexels_config = video_config.get("pexels", {})
+        return {
+            "min_duration": pexels_config.get("min_duration", 1),
+            "max_duration": pexels_config.get("max_duration", 3),
+            "min_width": video_config.get("min_width", 1080),
+            "min_height": video_config.get("min_height", 1920),
+            "orientation": video_config.get("orientation", "portrait"),
+            "cache_dir": video_config.get("cache_dir", "cache/video"),
+            "base_url": pexels_config.get("base_url"),
+            "clip_normalizer": self.get_clip_normalizer(),
+            "logger": self.logger
+        }
+
+    def register_service(self, service_name: str, service) -> None:
+        """Use a pre-built service instance, e.g. a stub in tests or benchmarks.
+        
+        Must be called before any service that depends on it is created.
+        """
+        with self._lock:
+            self._services[service_name] = service
+
     def _get_or_create_service(self, service_name: str, factory_func):
         """Get an existing service instance or create a new one."""
-        if service_name not in self._services:
-            self._services[service_name] = factory_func()
-        return self._services[service_name]
+        with self._lock:
+            if service_name not in self._services:
+                self._services[service_name] = factory_func()
+            return self._services[service_name]
+
+    async def aclose(self):
+        """Close the shared async HTTP client, then clean up all services.
+        
+        Must be awaited on the event loop the async services ran on.
+        """
+        client = self._services.pop("async_http_client", None)
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                self.logger.error(f"Error closing async HTTP client: {str(e)}")
+        self.cleanup()
 
     def cleanup(self):
         """Clean up all service instances."""
@@ -0,0 +1,209 @@
+"""
+Riddler - AI-Powered Riddle Generation System
+
+This file is part of Riddler.
+Copyright (c) 2025 Riddler
+
+This work is licensed under the Creative Commons Attribution-NonCommercial 4.0
+International License. To view a copy of this license, visit:
+https://creativecommons.org/licenses/by-nc/4.0/
+"""
+
+import logging
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+from core.application import Application
+from core.batch import BatchRunner
+from core.job_queue import JobQueue
+from utils.logger import log
+
+# Application owned by each pool process, kept warm across jobs
+_worker_app: Optional[Application] = None
+
+
+def _init_worker_process(config_path: Optional[str], trace_dir: Optional[str] = None) -> None:
+    """Build the per-process Application when a pool process starts."""
+    global _worker_app
+    # Let the parent decide how to shut down on Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_app = Application(config_path=config_path, trace_dir=trace_dir)
+    _worker_app.preload_sound_effects()
+
+
+def _run_job_in_worker(
+    job: Dict[str, Any],
+    output_dir: str,
+    no_cache: bool,
+    resume: bool = False
+) -> Dict[str, Any]:
+    """Run one job with the process's warm Application."""
+    runner = BatchRunner(_worker_app, output_dir=output_dir, no_cache=no_cache)
+    result = runner.run_job(job, resume=resume)
+    result["pid"] = os.getpid()
+    return result
+
+
+class Worker:
+    """Pulls jobs from a JobQueue and renders them on a process pool."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        config_path: Optional[str] = None,
+        output_dir: str = "output",
+        processes: Optional[int] = None,
+        poll_interval: float = 2.0,
+        stale_after: float = 60.0,
+        no_cache: bool = False,
+        trace_dir: Optional[str] = None,
+        logger: logging.Logger = None
+    ):
+        """Initialize the worker.
+
+        Args:
+            queue: Queue to pull jobs from
+            config_path: Configuration file used by every pool process
+            output_dir: Directory for generated videos
+            processes: Number of pool processes (defaults to the CPU count)
+            poll_interval: Seconds to wait between polls of an empty queue
+            stale_after: Seconds without a heartbeat after which another
+                worker's running job is taken to be interrupted
+            no_cache: Whether to bypass the riddle cache
+            trace_dir: Directory for per-job Chrome traces (off when None)
+            logger: Optional logger instance
+        """
+        self.queue = queue
+        self.config_path = config_path
+        self.output_dir = output_dir
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.no_cache = no_cache
+        self.trace_dir = trace_dir
+        self.logger = logger or log
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = False
+
+    def stop(self) -> None:
+        """Stop claiming new jobs and exit once running jobs finish."""
+        if not self._stopping:
+            self.logger.info("Worker stopping after running jobs finish")
+        self._stopping = True
+
+    def run(self, exit_when_empty: bool = False) -> Dict[str, int]:
+        """Process jobs until stopped.
+
+        A job is only claimed when a pool process is free, which keeps
+        backpressure on the queue instead of on the render box.
+
+        Args:
+            exit_when_empty: Return once the queue is drained
+
+        Returns:
+            Job counts per state when the worker exits
+        """
+        # Jobs of other live workers on the same queue keep their heartbeat
+        recovered = self.queue.recover(worker=self.name, stale_after=self.stale_after)
+        if recovered:
+            self.logger.warning(f"Recovered {recovered} jobs interrupted by a previous crash")
+
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.logger.info(f"Worker {self.name} starting with {self.processes} processes")
+        pool = self._create_pool()
+        in_flight = {}
+
+        try:
+            while True:
+                # Fill free pool slots with queued jobs
+                while not self._stopping and len(in_flight) < self.processes:
+                    record = self.queue.claim(self.name)
+                    if record is None:
+                        break
+                    self.logger.info(f"Starting job {record['job_id']} (attempt {record['attempts']})")
+                    # Retries pick up from the last checkpointed stage
+                    future = pool.submit(
+                        _run_job_in_worker,
+                        record["job"],
+                        self.output_dir,
+                        self.no_cache,
+                        record["attempts"] > 1
+                    )
+                    in_flight[future] = record
+
+                if not in_flight:
+                    if self._stopping or exit_when_empty:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+
+                self.queue.heartbeat(self.name)
+                done, _ = wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = in_flight.pop(future)
+                    try:
+                        self._record_result(record, future.result())
+                    except BrokenProcessPool as e:
+                        self._record_result(record, {"status": "failed", "error": f"worker process died: {str(e)}"})
+                    except Exception as e:
+                        # The job never returned a result, e.g. it could not be pickled
+                        self._record_result(record, {"status": "failed", "error": str(e)})
+
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                    # A crashed process takes the whole pool down; fail its
+                    # remaining jobs back to the queue and start a new pool
+                    for future, record in in_flight.items():
+                        self._record_result(record, {"status": "failed", "error": "worker pool restarted"})
+                    in_flight.clear()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self._create_pool()
+
+        except KeyboardInterrupt:
+            self.stop()
+            self.logger.info("Waiting for running jobs to finish")
+            for future, record in list(in_flight.items()):
+                if future.cancel():
+                    # Never started, so hand it back untouched
+                    self.queue.release(record["id"])
+                    del in_flight[future]
+            while in_flight:
+                # Keep the heartbeat going so no other worker recovers them
+                self.queue.heartbeat(self.name)
+                done, _ = wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = in_flight.pop(future)
+                    try:
+                        self._record_result(record, future.result())
+                    except Exception as e:
+                        self._record_result(record, {"status": "failed", "error": str(e)})
+        finally:
+            pool.shutdown(wait=True)
+
+        counts = self.queue.counts()
+        self.logger.info(f"Worker {self.name} exiting: {counts}")
+        return counts
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker_process,
+            initargs=(self.config_path, self.trace_dir)
+        )
+
+    def _record_result(self, record: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store the outcome of a job run in the queue."""
+        if result.get("status") == "done":
+            self.queue.mark_done(record["id"], result.get("output_path"))
+            self.logger.info(
+                f"Job {record['job_id']} done in {result.get('duration', 0):.1f}s: "
+                f"{result.get('output_path')}"
+            )
+        else:
+            state = self.queue.mark_failed(record["id"], result.get("error") or "unknown error")
+            self.logger.error(f"Job {record['job_id']} failed ({state}): {result.get('error')}")
@@ -12,10 +12,11 @@ https://creativecommons.org/licenses/by-nc/4.0/
 """Command line interface for the Riddler"""
 
 import argparse
-import os
-from core.application import Application
-from config.exceptions import RiddlerException
-import random
+import sys
+
+# Sub-commands for the durable job queue (python main.py worker ...) and
+# for warming the render caches
+COMMANDS = ("worker", "enqueue", "status", "warmup")
 
 def parse_args():
     """Parse command line arguments
@@ -30,7 +31,6 @@ def parse_args():
     parser.add_argument(
         "-c", "--category",
         type=str,
-        required=True,
         help="Riddle category"
     )
     
@@ -68,127 +68,276 @@ def parse_args():
         help="Disable riddle caching"
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=str,
+        default=None,
+        help="Path to a JSON jobs file to render many videos in one process"
+    )
+    
+    parser.add_argument(
+        "--results",
+        type=str,
+        default=None,
+        help="Path of the batch results summary (defaults to <output>/results.json)"
+    )
+    
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="With --jobs, overlap the network and render stages of consecutive videos"
+    )
+    
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="traces",
+        default=None,
+        metavar="DIR",
+        help="Write a Chrome trace per job to DIR (default: traces)"
+    )
+    
+    parser.add_argument(
+        "--render-mode",
+        type=str,
+        choices=("single", "segments", "chunks", "ffmpeg"),
+        default=None,
+        help="Renderer to use instead of video.render.mode (jobs can set their own)"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="JOB",
+        help="Resume a failed or interrupted job from its last completed stage"
+    )
+    
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Render a quick low-resolution preview from cached backgrounds; "
+             "render the final video afterwards with --resume"
+    )
+    
+    args = parser.parse_args()
+    if not args.category and not args.jobs and not args.resume:
+        parser.error("one of -c/--category, --jobs or --resume is required")
+    if args.preview and args.jobs:
+        parser.error("--preview renders a single job and cannot be used with --jobs")
+    
+    return args
+
+def parse_command_args(argv):
+    """Parse sub-command arguments
+    
+    Args:
+        argv: Command line arguments starting with the sub-command
+    
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Manage the Riddler job queue and render caches"
+    )
+    
+    # Options shared by every sub-command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        help="Path to configuration file"
+    )
+    
+    # Options shared by the job queue sub-commands
+    queue_options = argparse.ArgumentParser(add_help=False)
+    queue_options.add_argument(
+        "--queue",
+        type=str,
+        default=None,
+        help="Path to the job queue database (defaults to worker.queue_path)"
+    )
+    
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    worker_parser = subparsers.add_parser(
+        "worker",
+        parents=[common, queue_options],
+        help="Render queued jobs on a pool of worker processes"
+    )
+    worker_parser.add_argument(
+        "-p", "--processes",
+        type=int,
+        default=None,
+        help="Number of worker processes (defaults to worker.processes or the CPU count)"
+    )
+    worker_parser.add_argument(
+        "-o", "--output",
+        type=str,
+        default="output",
+        help="Output directory"
+    )
+    worker_parser.add_argument(
+        "--no-riddle-cache",
+        action="store_true",
+        help="Disable riddle caching"
+    )
+    worker_parser.add_argument(
+        "--exit-when-empty",
+        action="store_true",
+        help="Exit once the queue is drained instead of polling for new jobs"
+    )
+    worker_parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="traces",
+        default=None,
+        metavar="DIR",
+        help="Write a Chrome trace per job to DIR (default: traces)"
+    )
+    
+    enqueue_parser = subparsers.add_parser(
+        "enqueue",
+        parents=[common, queue_options],
+        help="Add the jobs from a JSON jobs file to the queue"
+    )
+    enqueue_parser.add_argument(
+        "jobs",
+        type=str,
+        help="Path to a JSON jobs file"
+    )
+    enqueue_parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=None,
+        help="Attempts per job before it is marked failed (defaults to worker.max_attempts)"
+    )
+    
+    subparsers.add_parser(
+        "status",
+        parents=[common, queue_options],
+        help="Show the number of jobs in each state"
+    )
+    
+    warmup_parser = subparsers.add_parser(
+        "warmup",
+        parents=[common],
+        help="Pre-render the text overlays of every configured pattern"
+    )
+    warmup_parser.add_argument(
+        "-q", "--quality",
+        action="append",
+        default=None,
+        help="Quality profile to render for, repeatable (defaults to video.quality.profile)"
+    )
+    
+    return parser.parse_args(argv)
+
+def run_command(args):
+    """Run a sub-command
+    
+    Args:
+        args: Parsed sub-command arguments
+    
+    Returns:
+        Process exit code
+    """
+    # Imported after argument parsing so --help stays instant
+    from config.config import Configuration
+    from core.batch import load_jobs
+    from core.job_queue import JobQueue
+    from core.worker import Worker
+    
+    try:
+        if args.command == "warmup":
+            from core.application import Application
+            with Application(config_path=args.config) as app:
+                rendered = app.warmup_text_overlays(args.quality)
+            print(f"Rendered {rendered} text overlays")
+            return 0
+        
+        config = Configuration(args.config)
+        queue = JobQueue(args.queue or config.get("worker.queue_path", "cache/jobs.db"))
+        
+        try:
+            if args.command == "enqueue":
+                max_attempts = args.max_attempts or config.get("worker.max_attempts", 3)
+                jobs = load_jobs(args.jobs)
+                for job in jobs:
+                    queue.enqueue(job, max_attempts=max_attempts)
+                print(f"Queued {len(jobs)} jobs in {queue.db_path}")
+            
+            elif args.command == "status":
+                for state, count in queue.counts().items():
+                    print(f"{state}: {count}")
+            
+            else:
+                worker = Worker(
+                    queue,
+                    config_path=args.config,
+                    output_dir=args.output,
+                    processes=args.processes or config.get("worker.processes"),
+                    poll_interval=config.get("worker.poll_interval", 2.0),
+                    stale_after=config.get("worker.stale_after", 60.0),
+                    no_cache=args.no_riddle_cache,
+                    trace_dir=args.trace
+                )
+                worker.run(exit_when_empty=args.exit_when_empty)
+        finally:
+            queue.close()
+        
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+    
+    return 0
 
 def main():
     """Main entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return run_command(parse_command_args(sys.argv[1:]))
+    
     args = parse_args()
     
+    # Imported after argument parsing so --help and usage errors stay instant
+    from core.application import Application
+    from core.batch import BatchRunner, load_jobs
+    from core.pipeline import PipelineScheduler
+    
     try:
         # Initialize application with optional config path
-        app = Application(config_path=args.config)
-        
-        # Create output directory if it doesn't exist
-        os.makedirs(args.output, exist_ok=True)
-        
-        # Get timing configuration
-        config = app.config
-        
-        # Generate riddles
-        riddles = []
-        for i in range(args.num_riddles):
-            try:
-                riddle_data = app.generate_riddle(
-                    category=args.category,
-                    difficulty=args.difficulty,
+        with Application(config_path=args.config, trace_dir=args.trace) as app:
+            if args.jobs:
+                # Render every job with the same warm services
+                runner_class = PipelineScheduler if args.pipeline else BatchRunner
+                runner = runner_class(
+                    app,
+                    output_dir=args.output,
                     no_cache=args.no_riddle_cache
                 )
-                # Add segment metadata
-                riddle_data.update({
-                    "id": f"riddle_{i}",
-                    "type": "riddle",
-                    "index": i
-                })
-                riddles.append(riddle_data)
-            except Exception as e:
-                print(f"Error generating riddle: {str(e)}")
-                continue
-        
-        if not riddles:
-            raise RiddlerException("Failed to generate any riddles")
-        
-        
-        # Create segments for the video
-        segments = []
-        for i, riddle in enumerate(riddles):
-            # Add hook segment for first riddle
-            if i == 0:
-                hook_patterns = config.get("riddle.format.hook_patterns", [])
-                hook_text = random.choice(hook_patterns)
-                hook_speech = app.generate_speech(hook_text)
-                segments.append({
-                    "id": "hook",
-                    "type": "hook",
-                    "text": hook_text,
-                    "voice_path": hook_speech,
-                    "index": len(segments)
-                })
-            
-            # Add riddle question segment
-            question_speech = app.generate_speech(riddle["riddle"])
-            segments.append({
-                "id": f"question_{i}",
-                "type": "question",
-                "text": riddle["riddle"],
-                "voice_path": question_speech,
-                "index": len(segments)
-            })
-            
-            # Add thinking time segment
-            thinking_patterns = config.get("riddle.format.thinking_patterns", [])
-            thinking_text = random.choice(thinking_patterns)
-            segments.append({
-                "id": f"thinking_{i}",
-                "type": "thinking",
-                "text": thinking_text,
-                "index": len(segments)
-            })
+                jobs = load_jobs(args.jobs)
+                for job in jobs:
+                    job["render_mode"] = job["render_mode"] or args.render_mode
+                results = runner.run(jobs, results_path=args.results)
+                failed = [result for result in results if result["status"] != "done"]
+                print(f"Rendered {len(results) - len(failed)}/{len(results)} videos")
+                return 1 if failed else 0
             
-            # Add answer segment
-            answer_text = f"{riddle['answer']}"
-            answer_speech = app.generate_speech(answer_text)
-            segments.append({
-                "id": f"answer_{i}",
-                "type": "answer",
-                "text": answer_text,
-                "voice_path": answer_speech,
-                "index": len(segments)
-            })
-            
-            # Add transition for all but last riddle
-            if i < len(riddles) - 1:
-                next_riddle_patterns = config.get("riddle.format.next_riddle_patterns", [])
-                transition_text = random.choice(next_riddle_patterns)
-                transition_speech = app.generate_speech(transition_text)
-                segments.append({
-                    "id": f"transition_{i}",
-                    "type": "transition",
-                    "text": transition_text,
-                    "voice_path": transition_speech,
-                    "index": len(segments)
-                })
-        
-        # Add CTA at the end of the video
-        cta_patterns = config.get("riddle.format.call_to_action_patterns", [])
-        cta_text = random.choice(cta_patterns)
-        cta_speech = app.generate_speech(cta_text)
-        segments.append({
-            "id": "cta",
-            "type": "cta",
-            "text": cta_text,
-            "voice_path": cta_speech,
-            "index": len(segments)
-        })
-        
-        # Create multi-riddle video
-        output_path = os.path.join(args.output, f"riddle_{args.category}_{os.urandom(4).hex()}.mp4")
-        final_video = app.create_riddle_video(
-            riddle_segments=segments,
-            category=args.category,
-            output_path=output_path
-        )
+            final_video = app.run_job(
+                category=args.category,
+                difficulty=args.difficulty,
+                num_riddles=args.num_riddles,
+                output_dir=args.output,
+                no_cache=args.no_riddle_cache,
+                job_id=args.resume,
+                resume=bool(args.resume),
+                render_mode=args.render_mode,
+                preview=args.preview
+            )
         
-        print(f"Successfully created video: {final_video}")
+        print(f"Successfully created {'preview' if args.preview else 'video'}: {final_video}")
         
     except Exception as e:
         print(f"Error: {str(e)}")
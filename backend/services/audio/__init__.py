@@ -1,7 +1,25 @@
 """Audio processing services."""
 
-from services.audio.composition_service import AudioCompositionService
+import importlib
+
+# Submodules are imported on first attribute access, so importing the
+# package does not pull in MoviePy
+_EXPORTS = {
+    'AudioCompositionService': 'services.audio.composition_service',
+    'AudioMixer': 'services.audio.mixer',
+    'PCMCache': 'services.audio.pcm_cache'
+}
 
 __all__ = [
-    'AudioCompositionService'
-] 
\ No newline at end of file
+    'AudioCompositionService',
+    'AudioMixer',
+    'PCMCache'
+]
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
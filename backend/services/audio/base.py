@@ -1,12 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List
-from moviepy.editor import CompositeAudioClip
+from typing import Dict, List, Optional
 
 class AudioCompositionServiceBase(ABC):
     @abstractmethod
-    def create_audio_composition(
+    def render_audio_file(
         self,
         segments: List[Dict],
-        timings: Dict[str, float]
-    ) -> CompositeAudioClip:
+        timings: Dict[str, float],
+        output_path: str,
+        duration: Optional[float] = None
+    ) -> Optional[str]:
         pass
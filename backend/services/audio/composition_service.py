@@ -1,14 +1,21 @@
 import logging
-from typing import Dict, List
-from moviepy.editor import AudioFileClip, CompositeAudioClip, concatenate_audioclips
+from typing import Dict, List, Optional
 from config.exceptions import AudioCompositionError
 from services.audio.base import AudioCompositionServiceBase
+from services.audio.mixer import AudioMixer
 from utils.logger import log
+from utils.tracing import traced
 
 class AudioCompositionService(AudioCompositionServiceBase):
-    def __init__(self, config: Dict = None, logger: logging.Logger = None):
+    def __init__(
+        self,
+        config: Dict = None,
+        logger: logging.Logger = None,
+        mixer: Optional[AudioMixer] = None
+    ):
         self.config = config or {}
         self.logger = logger or logging.getLogger(__name__)
+        self.mixer = mixer or AudioMixer(self.config, self.logger)
         self.background_music_volume = self.config.get("audio", {}).get("background_volume", 0.1)
         self.voice_volume = self.config.get("audio", {}).get("voice_volume", 1.0)
         self.sound_effects_volume = self.config.get("audio", {}).get("sound_effects_volume", 0.7)
@@ -17,71 +24,102 @@ class AudioCompositionService(AudioCompositionServiceBase):
         self.countdown_sound = "assets/audio/countdown.mp3"
         self.reveal_sound = "assets/audio/reveal.mp3"
 
-    def create_audio_composition(
+    def audio_tracks(
         self,
         segments: List[Dict],
         timings: Dict[str, float]
-    ) -> CompositeAudioClip:
-        try:
-            # Create audio clips for each segment
-            audio_clips = []
-            current_time = 0
+    ) -> List[Dict]:
+        """Lay out every sound of the video on one timeline.
+
+        Args:
+            segments: Video segments in playback order
+            timings: Segment durations by segment id
+
+        Returns:
+            Tracks with the audio ``path``, ``start`` time and ``volume``.
+            Looped background music also has the ``duration`` it fills.
+        """
+        tracks = []
+        current_time = 0
+        
+        for segment in segments:
+            segment_id = segment.get("id")
+            segment_type = segment.get("type", "")
+            if not segment_id or segment_id not in timings:
+                continue
             
-            for segment in segments:
-                segment_id = segment.get("id")
-                segment_type = segment.get("type", "")
-                if not segment_id or segment_id not in timings:
-                    continue
-                
-                # Get segment duration
-                duration = timings[segment_id]
-                
-                # Handle voice audio if present
-                voice_path = segment.get("voice_path")
-                if voice_path:
-                    voice_clip = AudioFileClip(voice_path)
-                    voice_clip = voice_clip.set_start(current_time)
-                    voice_clip = voice_clip.volumex(self.voice_volume)
-                    audio_clips.append(voice_clip)
-                
-                # Add countdown sound for thinking segments
-                if segment_type == "thinking":
-                    countdown_clip = AudioFileClip(self.countdown_sound)
-                    countdown_clip = countdown_clip.set_start(current_time)
-                    countdown_clip = countdown_clip.volumex(self.sound_effects_volume)
-                    audio_clips.append(countdown_clip)
-                    
-                    # Add reveal sound right after countdown ends
-                    reveal_clip = AudioFileClip(self.reveal_sound)
-                    reveal_clip = reveal_clip.set_start(current_time + countdown_clip.duration)
-                    reveal_clip = reveal_clip.volumex(self.sound_effects_volume)
-                    audio_clips.append(reveal_clip)
-                
-                # Handle background music if present
-                bg_music_path = segment.get("background_music")
-                if bg_music_path:
-                    bg_clip = AudioFileClip(bg_music_path)
-                    
-                    # Loop background music if needed
-                    if bg_clip.duration < duration:
-                        n_loops = int(duration / bg_clip.duration) + 1
-                        bg_clip = bg_clip.loop(n=n_loops)
-                    
-                    # Trim to exact duration and set volume
-                    bg_clip = bg_clip.subclip(0, duration)
-                    bg_clip = bg_clip.set_start(current_time)
-                    bg_clip = bg_clip.volumex(self.background_music_volume)
-                    audio_clips.append(bg_clip)
-                
-                current_time += duration
+            # Get segment duration
+            duration = timings[segment_id]
             
-            # Combine all audio clips
-            if not audio_clips:
-                self.logger.warning("No audio clips to compose")
-                return CompositeAudioClip([])
+            # Handle voice audio if present
+            voice_path = segment.get("voice_path")
+            if voice_path:
+                tracks.append({"path": voice_path, "start": current_time, "volume": self.voice_volume})
+            
+            # Add countdown sound for thinking segments
+            if segment_type == "thinking":
+                tracks.append({"path": self.countdown_sound, "start": current_time, "volume": self.sound_effects_volume})
+                
+                # Add reveal sound right after countdown ends
+                tracks.append({
+                    "path": self.reveal_sound,
+                    "start": current_time + self.mixer.duration(self.countdown_sound),
+                    "volume": self.sound_effects_volume
+                })
             
-            return CompositeAudioClip(audio_clips)
+            # Handle background music if present
+            bg_music_path = segment.get("background_music")
+            if bg_music_path:
+                tracks.append({
+                    "path": bg_music_path,
+                    "start": current_time,
+                    "volume": self.background_music_volume,
+                    "duration": duration
+                })
             
+            current_time += duration
+        
+        return tracks
+
+    def preload_sound_effects(self) -> int:
+        """Decode the bundled sound effects into the mixer's cache.
+
+        Returns:
+            Number of sound effects loaded
+        """
+        return self.mixer.preload([self.countdown_sound, self.reveal_sound])
+
+    @traced("audio.compose", cat="audio")
+    def render_audio_file(
+        self,
+        segments: List[Dict],
+        timings: Dict[str, float],
+        output_path: str,
+        duration: Optional[float] = None
+    ) -> Optional[str]:
+        """Mix the video's audio once and write it to a file to mux in.
+
+        Args:
+            segments: Video segments in playback order
+            timings: Segment durations by segment id
+            output_path: ``.wav`` file, or a file for ffmpeg to encode, like ``.m4a``
+            duration: Length of the track, padded with silence (defaults
+                to the total duration of the segments)
+
+        Returns:
+            Path to the written file, or None if the video has no audio
+        """
+        try:
+            tracks = self.audio_tracks(segments, timings)
+            if not tracks:
+                self.logger.warning("No audio clips to compose")
+                return None
+
+            if duration is None:
+                duration = sum(timings[segment["id"]] for segment in segments if segment.get("id") in timings)
+            samples = self.mixer.mix(tracks, duration)
+            return self.mixer.write(samples, output_path)
+
         except Exception as e:
-            self.logger.error(f"Failed to create audio composition: {str(e)}")
-            raise AudioCompositionError(f"Failed to create audio composition: {str(e)}")
+            self.logger.error(f"Failed to render audio: {str(e)}")
+            raise AudioCompositionError(f"Failed to render audio: {str(e)}")
@@ -0,0 +1,195 @@
+"""Vectorized PCM mixing of a video's voices and sound effects"""
+
+import logging
+import os
+import subprocess
+import wave
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from moviepy.config import get_setting
+from config.exceptions import AudioCompositionError
+from services.audio.pcm_cache import PCMCache
+from utils.logger import log
+from utils.tracing import span, traced
+
+
+def limit(samples: np.ndarray, ceiling: float, rate: int, window: float = 0.01) -> np.ndarray:
+    """Keep a mix under a peak level without audibly clipping it.
+
+    Gain is worked out per block of ``window`` seconds from the block's
+    peak, held over the blocks on either side and interpolated between
+    block centers, so it ramps down before a peak and back up after it.
+
+    Args:
+        samples: Float PCM as (frames, channels), limited in place
+        ceiling: Highest absolute sample value allowed
+        rate: Sample rate
+        window: Block length in seconds
+
+    Returns:
+        The limited samples
+    """
+    if not samples.size:
+        return samples
+    peak = np.abs(samples).max(axis=1)
+    if peak.max() <= ceiling:
+        return samples
+
+    block = max(1, int(rate * window))
+    blocks = -(-len(peak) // block)
+    padded = np.zeros(blocks * block, dtype=peak.dtype)
+    padded[:len(peak)] = peak
+    gain = np.minimum(1.0, ceiling / np.maximum(padded.reshape(blocks, block).max(axis=1), 1e-9))
+    # Every block takes the reduction of its neighbours too, so the
+    # interpolated gain is already down when the peak arrives
+    gain = np.minimum(gain, np.minimum(np.append(gain[1:], 1.0), np.insert(gain[:-1], 0, 1.0)))
+    centers = np.arange(blocks) * block + block / 2
+    samples *= np.interp(np.arange(len(peak)), centers, gain).astype(samples.dtype)[:, None]
+    np.clip(samples, -ceiling, ceiling, out=samples)
+    return samples
+
+
+class AudioMixer:
+    """Mixes audio tracks on a preallocated float32 timeline.
+
+    MoviePy's ``CompositeAudioClip`` mixes its clips chunk by chunk while
+    the video is written, reading every clip through its own ffmpeg
+    process and scaling it in Python. Here every file is decoded once to
+    float32 PCM at one sample rate, added into the timeline with its gain
+    by array slicing, limited, and written out as one file to mux in.
+    Decoded files are kept in a ``PCMCache`` when one is given.
+    """
+
+    def __init__(
+        self,
+        config: Dict = None,
+        logger: logging.Logger = None,
+        pcm_cache: Optional[PCMCache] = None
+    ):
+        self.config = config or {}
+        self.logger = logger or log
+        self.pcm_cache = pcm_cache
+
+        audio_config = self.config.get("audio", {})
+        self.sample_rate = int(audio_config.get("sample_rate", 44100))
+        self.channels = int(audio_config.get("channels", 2))
+        self.ceiling = audio_config.get("limiter_ceiling", 0.98)
+        self.ffmpeg = get_setting("FFMPEG_BINARY")
+
+    def decode(self, path: str) -> np.ndarray:
+        """Decode an audio file to float32 PCM at the mixer's rate and channels.
+
+        Files are decoded once per version while they stay in the cache.
+
+        Returns:
+            Read-only samples as (frames, channels)
+        """
+        if self.pcm_cache is None:
+            return self._decode(path)
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns, self.sample_rate, self.channels)
+        samples = self.pcm_cache.get(key)
+        if samples is None:
+            samples = self.pcm_cache.put(key, self._decode(path))
+        return samples
+
+    def duration(self, path: str) -> float:
+        """Get the length of an audio file in seconds, as decoded."""
+        return len(self.decode(path)) / self.sample_rate
+
+    def preload(self, paths: Iterable[str]) -> int:
+        """Decode files into the cache ahead of the first mix.
+
+        Args:
+            paths: Audio files; missing ones are skipped
+
+        Returns:
+            Number of files found and loaded
+        """
+        loaded = 0
+        for path in paths:
+            if not os.path.exists(path):
+                self.logger.warning(f"Audio file to preload not found: {path}")
+                continue
+            self.decode(path)
+            loaded += 1
+        return loaded
+
+    def _decode(self, path: str) -> np.ndarray:
+        """Decode an audio file with ffmpeg."""
+        command = [
+            self.ffmpeg, "-v", "error", "-i", path, "-vn",
+            "-f", "f32le", "-acodec", "pcm_f32le",
+            "-ac", str(self.channels), "-ar", str(self.sample_rate), "-"
+        ]
+        try:
+            with span("audio.decode", cat="audio", path=os.path.basename(path)):
+                result = subprocess.run(command, check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.decode(errors="replace").strip()
+            self.logger.error(f"ffmpeg failed to decode {path}: {error}")
+            raise AudioCompositionError(f"Failed to decode {path}: {error}")
+        return np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, self.channels)
+
+    @traced("audio.mix", cat="audio")
+    def mix(self, tracks: List[Dict], duration: float) -> np.ndarray:
+        """Add tracks together on one timeline.
+
+        Args:
+            tracks: Tracks with the audio ``path``, ``start`` time and
+                ``volume``; tracks with a ``duration`` are looped to fill it
+            duration: Length of the mix in seconds; sound past it is cut
+
+        Returns:
+            Limited float32 samples as (frames, channels)
+        """
+        timeline = np.zeros((round(duration * self.sample_rate), self.channels), dtype=np.float32)
+        for track in tracks:
+            pcm = self.decode(track["path"])
+            if track.get("duration") is not None and len(pcm):
+                # Repeats the rows, which loops the sound
+                pcm = np.resize(pcm, (round(track["duration"] * self.sample_rate), self.channels))
+            start = round(track["start"] * self.sample_rate)
+            end = min(start + len(pcm), len(timeline))
+            if end <= start:
+                continue
+            region = timeline[start:end]
+            region += pcm[:end - start] * np.float32(track["volume"])
+        return limit(timeline, self.ceiling, self.sample_rate)
+
+    def write(self, samples: np.ndarray, output_path: str) -> str:
+        """Write samples as 16-bit WAV, or encode them by extension with ffmpeg.
+
+        Args:
+            samples: Float PCM as (frames, channels)
+            output_path: ``.wav`` file, or any file ffmpeg can encode,
+                like ``.m4a``, which ffmpeg encodes to AAC
+
+        Returns:
+            Path to the written file
+        """
+        if os.path.splitext(output_path)[1].lower() == ".wav":
+            pcm = np.round(np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+            with wave.open(output_path, "wb") as f:
+                f.setnchannels(self.channels)
+                f.setsampwidth(2)
+                f.setframerate(self.sample_rate)
+                f.writeframes(pcm.tobytes())
+            return output_path
+
+        command = [
+            self.ffmpeg, "-y", "-v", "error",
+            "-f", "f32le", "-ar", str(self.sample_rate), "-ac", str(self.channels), "-i", "-",
+            output_path
+        ]
+        try:
+            subprocess.run(
+                command,
+                input=np.ascontiguousarray(samples, dtype=np.float32).tobytes(),
+                check=True,
+                capture_output=True
+            )
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.decode(errors="replace").strip()
+            self.logger.error(f"ffmpeg failed to encode {output_path}: {error}")
+            raise AudioCompositionError(f"Failed to encode {output_path}: {error}")
+        return output_path
@@ -0,0 +1,54 @@
+"""In-memory decoded PCM of sound effects and repeated voice lines"""
+
+import logging
+from typing import Dict, Hashable, Optional
+import numpy as np
+from utils.cache import MemoryCache
+from utils.logger import log
+
+
+class PCMCache:
+    """Keeps decoded audio in memory for the life of the process, within a budget.
+
+    Every thinking segment plays the same countdown and reveal sounds, and
+    hook and call-to-action voice lines come back in video after video.
+    Keeping their float32 samples here replaces an ffmpeg decode per use
+    with a lookup. Entries are read-only and evicted least recently used
+    first once their total size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, config: Dict = None, logger: logging.Logger = None):
+        self.config = config or {}
+        self.logger = logger or log
+
+        cache_config = self.config.get("audio", {}).get("pcm_cache", {})
+        self.enabled = cache_config.get("enabled", True)
+        self.max_bytes = cache_config.get("max_bytes", 256 * 1024 * 1024)
+
+        self._entries = MemoryCache(self.max_bytes, lambda samples: samples.nbytes)
+
+    @property
+    def size(self) -> int:
+        """Bytes of samples held."""
+        return self._entries.size
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Get cached samples, marking them recently used."""
+        return self._entries.get(key)
+
+    def put(self, key: Hashable, samples: np.ndarray) -> np.ndarray:
+        """Store samples, evicting the least recently used ones to stay in budget.
+
+        Samples larger than the whole budget are returned without being kept.
+
+        Returns:
+            The samples, made read-only
+        """
+        samples.setflags(write=False)
+        if self.enabled:
+            self._entries.put(key, samples)
+        return samples
+
+    def cleanup(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
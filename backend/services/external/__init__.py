@@ -1,7 +1,25 @@
 """External service integrations."""
 
-from services.external.pexels_service import PexelsService
+import importlib
+
+# Submodules are imported on first attribute access, so importing the
+# package does not pull in requests and httpx
+_EXPORTS = {
+    'PexelsServiceBase': 'services.external.base',
+    'PexelsService': 'services.external.pexels_service',
+    'AsyncPexelsService': 'services.external.async_pexels_service'
+}
 
 __all__ = [
-    'PexelsService'
-] 
\ No newline at end of file
+    'PexelsServiceBase',
+    'PexelsService',
+    'AsyncPexelsService'
+]
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,84 @@
+"""Asyncio video service using Pexels API"""
+
+from typing import Dict
+import httpx
+
+from config.exceptions import VideoError
+from utils.tracing import span, traced
+from services.external.pexels_service import PexelsService
+
+class AsyncPexelsService(PexelsService):
+    """Pexels video service built on a shared async HTTP client.
+    
+    Shares search, selection and caching logic with ``PexelsService``;
+    only the network calls are awaited.
+    """
+    
+    def __init__(self, client: httpx.AsyncClient, config: Dict, **kwargs):
+        """Initialize async video service
+        
+        Args:
+            client: Shared async HTTP client
+            config: Configuration dictionary
+            **kwargs: Remaining ``PexelsService`` options
+        """
+        super().__init__(config=config, **kwargs)
+        self.client = client
+    
+    @traced("pexels.get_video", cat="pexels")
+    async def get_video(self, category: str) -> str:
+        """Get a video for the given category
+        
+        Args:
+            category: Video category
+            
+        Returns:
+            Path to video file
+            
+        Raises:
+            VideoError: If video retrieval fails
+        """
+        try:
+            # Try each search term until we find a suitable video
+            for term in self._search_terms(category):
+                try:
+                    # Check cache
+                    cache_key = self._cache_key(category, term)
+                    cached_file = self._cached_video(cache_key)
+                    if cached_file:
+                        return cached_file
+                    
+                    # Search for videos
+                    url, headers, params = self._search_request(term)
+                    with span("pexels.search", cat="http", term=term):
+                        response = await self.client.get(url, headers=headers, params=params)
+                    
+                    if response.status_code != 200:
+                        self.logger.error(f"Pexels API error: {response.status_code} - {response.text}")
+                        continue
+                    
+                    # Pick one of the suitable videos
+                    selection = self._select_video(response.json())
+                    if not selection:
+                        continue
+                    video, video_file = selection
+                    
+                    # Stream the download to disk
+                    output_path = self._download_path(cache_key)
+                    with span("pexels.download", cat="http"):
+                        async with self.client.stream("GET", video_file["link"]) as response:
+                            response.raise_for_status()
+                            with self._download_file(output_path) as f:
+                                async for chunk in response.aiter_bytes(chunk_size=65536):
+                                    f.write(chunk)
+                    
+                    return self._store_download(cache_key, output_path)
+                    
+                except Exception as e:
+                    self.logger.error(f"Error getting video for term '{term}': {str(e)}")
+                    continue
+            
+            raise VideoError(f"No suitable videos found for category: {category}")
+            
+        except Exception as e:
+            raise VideoError(f"Failed to get video: {str(e)}")
@@ -0,0 +1,18 @@
+"""External service base interfaces."""
+
+from abc import ABC, abstractmethod
+
+class PexelsServiceBase(ABC):
+    """Base class for background video provider implementations."""
+    
+    @abstractmethod
+    def get_video(self, category: str) -> str:
+        """Get a background video for a category.
+        
+        Args:
+            category: Video category
+            
+        Returns:
+            Path to video file
+        """
+        pass
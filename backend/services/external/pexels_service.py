@@ -3,17 +3,23 @@
 import json
 import os
 import random
+import tempfile
 import requests
-from typing import Optional, Dict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator, Optional, Dict, List, Tuple
 import hashlib
 
 from utils.cache import CacheManager
 from utils.helpers import get_api_key
 from utils.logger import log, StructuredLogger
-from utils.validators import validate_category
+from utils.tracing import span, traced
 from config.exceptions import VideoError
+from services.external.base import PexelsServiceBase
 
-class PexelsService:
+if TYPE_CHECKING:
+    from services.video.clip_normalizer import ClipNormalizer
+
+class PexelsService(PexelsServiceBase):
     """Service for retrieving videos from Pexels"""
     
     def __init__(
@@ -25,7 +31,9 @@ class PexelsService:
         min_height: Optional[int] = None,
         orientation: Optional[str] = None,
         cache_dir: Optional[str] = None,
-        logger: Optional[StructuredLogger] = None
+        logger: Optional[StructuredLogger] = None,
+        base_url: Optional[str] = None,
+        clip_normalizer: Optional["ClipNormalizer"] = None
     ):
         """Initialize video service
         
@@ -38,6 +46,9 @@ class PexelsService:
             orientation: Video orientation (portrait/landscape)
             cache_dir: Cache directory for videos
             logger: Logger instance
+            base_url: Optional API base URL (defaults to Pexels)
+            clip_normalizer: Optional normalizer that transcodes cached
+                videos into a render-ready format in the background
         """
         self.api_key = get_api_key("pexels")
         self.min_duration = min_duration or config.get("video", {}).get("pexels", {}).get("min_duration", 3)
@@ -45,15 +56,20 @@ class PexelsService:
         self.min_width = min_width or config.get("video", {}).get("pexels", {}).get("min_width", 1080)
         self.min_height = min_height or config.get("video", {}).get("pexels", {}).get("min_height", 1920)
         self.orientation = orientation or config.get("video", {}).get("pexels", {}).get("orientation", "portrait")
-        self.base_url = "https://api.pexels.com/videos"
+        self.base_url = base_url or "https://api.pexels.com/videos"
         self.cache = CacheManager(cache_dir or config.get("video", {}).get("pexels", {}).get("cache_dir", "cache/video"))
         self.logger = logger or log
+        self.clip_normalizer = clip_normalizer
+        
+        # Shared HTTP session for API searches and clip downloads
+        self.session = requests.Session()
         
         # Get category terms from config - fix nested access
         pexels_config = config.get("video", {}).get("pexels", {})
         self.category_terms = pexels_config.get("category_terms", {})
         self.logger.info(f"Loaded category terms: {list(self.category_terms.keys())}")
     
+    @traced("pexels.get_video", cat="pexels")
     def get_video(self, category: str) -> str:
         """Get a video for the given category
         
@@ -67,56 +83,19 @@ class PexelsService:
             VideoError: If video retrieval fails
         """
         try:
-            # Validate category
-            validate_category(category)
-            
-            # Get search terms for category
-            search_terms = self.category_terms.get(category.lower())
-            if not search_terms:
-                raise VideoError(f"No search terms found for category: {category}")
-            
             # Try each search term until we find a suitable video
-            for term in random.sample(search_terms, len(search_terms)):
+            for term in self._search_terms(category):
                 try:
-                    # Generate cache key
-                    params = {
-                        "category": category,
-                        "term": term,
-                        "orientation": self.orientation,
-                        "min_duration": str(self.min_duration),
-                        "max_duration": str(self.max_duration)
-                    }
-                    cache_key = hashlib.sha256(
-                        json.dumps(params, sort_keys=True).encode()
-                    ).hexdigest()
-                    
                     # Check cache
-                    cached_file = self.cache.get(cache_key)
-                    if cached_file and os.path.exists(cached_file):
-                        self.logger.info(f"Using cached video: {cached_file}")
-                        return str(cached_file)
+                    cache_key = self._cache_key(category, term)
+                    cached_file = self._cached_video(cache_key)
+                    if cached_file:
+                        return cached_file
                     
                     # Search for videos
-                    url = f"{self.base_url}/search"
-                    headers = {
-                        "Authorization": f"{self.api_key}"
-                    }
-                    params = {
-                        "query": term,
-                        "orientation": self.orientation,
-                        "size": "large",
-                        "per_page": 15,
-                        "min_duration": self.min_duration,
-                        "max_duration": self.max_duration,
-                        "min_width": self.min_width,
-                        "min_height": self.min_height
-                    }
-                    
-                    # Make request
-                    self.logger.info(f"Searching Pexels for term: {term}")
-                    self.logger.info(f"Request params: {params}")
-                    self.logger.info(f"Using API key: {self.api_key[:10]}...")
-                    response = requests.get(url, headers=headers, params=params)
+                    url, headers, params = self._search_request(term)
+                    with span("pexels.search", cat="http", term=term):
+                        response = self.session.get(url, headers=headers, params=params)
                     
                     if response.status_code != 200:
                         self.logger.error(f"Pexels API error: {response.status_code} - {response.text}")
@@ -124,71 +103,27 @@ class PexelsService:
                         
                     response.raise_for_status()
                     
-                    # Parse response
-                    data = response.json()
-                    self.logger.info(f"Found {len(data.get('videos', []))} videos")
-                    if not data.get("videos"):
-                        continue
-                    
-                    # Filter videos by requirements
-                    suitable_videos = []
-                    for video in data["videos"]:
-                        # Find suitable video file
-                        video_files = sorted(
-                            video["video_files"],
-                            key=lambda x: (x.get("width", 0) * x.get("height", 0)),
-                            reverse=True
-                        )
-                        
-                        for video_file in video_files:
-                            width = video_file.get("width", 0)
-                            height = video_file.get("height", 0)
-                            
-                            # Check if dimensions are acceptable
-                            if width >= 720 and height >= 1280:  # Reduced requirements
-                                suitable_videos.append((video, video_file))
-                                self.logger.info(
-                                    f"Found suitable video: {width}x{height}, "
-                                    f"duration: {video.get('duration')}s"
-                                )
-                                break
-                    
-                    if not suitable_videos:
-                        self.logger.info("No suitable videos found with current criteria")
+                    # Pick one of the suitable videos
+                    selection = self._select_video(response.json())
+                    if not selection:
                         continue
-                    
-                    # Select random video
-                    video, video_file = random.choice(suitable_videos)
+                    video, video_file = selection
                     
                     # Download video
-                    video_url = video_file["link"]
-                    response = requests.get(video_url, stream=True)
-                    response.raise_for_status()
-                    
-                    # Save video file
-                    output_path = os.path.join(
-                        self.cache.cache_dir,
-                        f"{cache_key}.mp4"
-                    )
-                    
-                    # Ensure directory exists
-                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                    
-                    # Download with progress
-                    with open(output_path, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                    
-                    # Verify the downloaded file
-                    if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
-                        raise VideoError("Downloaded file is empty or does not exist")
-                    
-                    # Add to cache
-                    self.cache.put(cache_key, output_path)
-                    self.logger.info(f"Cached video: {output_path}")
+                    with span("pexels.download", cat="http"):
+                        video_url = video_file["link"]
+                        response = self.session.get(video_url, stream=True)
+                        response.raise_for_status()
+                        
+                        output_path = self._download_path(cache_key)
+                        
+                        # Download with progress
+                        with self._download_file(output_path) as f:
+                            for chunk in response.iter_content(chunk_size=8192):
+                                if chunk:
+                                    f.write(chunk)
                     
-                    return str(output_path)
+                    return self._store_download(cache_key, output_path)
                     
                 except Exception as e:
                     self.logger.error(f"Error getting video for term '{term}': {str(e)}")
@@ -197,4 +132,182 @@ class PexelsService:
             raise VideoError(f"No suitable videos found for category: {category}")
             
         except Exception as e:
-            raise VideoError(f"Failed to get video: {str(e)}") 
\ No newline at end of file
+            raise VideoError(f"Failed to get video: {str(e)}")
+
+    @traced("pexels.get_cached_video", cat="pexels")
+    def get_cached_video(self, category: str) -> str:
+        """Get an already downloaded video for the given category
+        
+        Never touches the network, for renders that must only use
+        local assets.
+        
+        Args:
+            category: Video category
+            
+        Returns:
+            Path to video file
+            
+        Raises:
+            VideoError: If no video is cached for the category
+        """
+        for term in self._search_terms(category):
+            cached_file = self._cached_video(self._cache_key(category, term))
+            if cached_file:
+                return cached_file
+        raise VideoError(f"No cached videos for category: {category}")
+
+    def _search_terms(self, category: str) -> List[str]:
+        """Get the search terms for a category in random order.
+        
+        Raises:
+            VideoError: If the category has no search terms
+        """
+        # Validate category against the configured terms
+        search_terms = self.category_terms.get(category.lower())
+        if not search_terms:
+            raise VideoError(
+                f"No search terms found for category: {category}. "
+                f"Must be one of: {', '.join(self.category_terms.keys())}"
+            )
+        return random.sample(search_terms, len(search_terms))
+
+    def _cache_key(self, category: str, term: str) -> str:
+        """Generate the cache key for a category and search term."""
+        params = {
+            "category": category,
+            "term": term,
+            "orientation": self.orientation,
+            "min_duration": str(self.min_duration),
+            "max_duration": str(self.max_duration)
+        }
+        return hashlib.sha256(
+            json.dumps(params, sort_keys=True).encode()
+        ).hexdigest()
+
+    @traced("pexels.cache_lookup", cat="cache")
+    def _cached_video(self, cache_key: str) -> Optional[str]:
+        """Get the cached video for a cache key, if present."""
+        cached_file = self.cache.get(cache_key)
+        if cached_file and os.path.exists(cached_file):
+            self.logger.info(f"Using cached video: {cached_file}")
+            if self.clip_normalizer:
+                # Catches up on videos cached before normalization was enabled
+                self.clip_normalizer.submit(str(cached_file))
+            return str(cached_file)
+        return None
+
+    def _search_request(self, term: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build the search request for a term.
+        
+        Returns:
+            Tuple of URL, headers and query parameters
+        """
+        url = f"{self.base_url}/search"
+        headers = {
+            "Authorization": f"{self.api_key}"
+        }
+        params = {
+            "query": term,
+            "orientation": self.orientation,
+            "size": "large",
+            "per_page": 15,
+            "min_duration": self.min_duration,
+            "max_duration": self.max_duration,
+            "min_width": self.min_width,
+            "min_height": self.min_height
+        }
+        
+        self.logger.info(f"Searching Pexels for term: {term}")
+        self.logger.info(f"Request params: {params}")
+        self.logger.info(f"Using API key: {self.api_key[:10]}...")
+        return url, headers, params
+
+    def _select_video(self, data: Dict[str, Any]) -> Optional[Tuple[Dict, Dict]]:
+        """Pick a random suitable video file from a search response.
+        
+        Returns:
+            Tuple of video and video file, or None if nothing is suitable
+        """
+        self.logger.info(f"Found {len(data.get('videos', []))} videos")
+        if not data.get("videos"):
+            return None
+        
+        # Filter videos by requirements
+        suitable_videos = []
+        for video in data["videos"]:
+            # Find suitable video file
+            video_files = sorted(
+                video["video_files"],
+                key=lambda x: (x.get("width", 0) * x.get("height", 0)),
+                reverse=True
+            )
+            
+            for video_file in video_files:
+                width = video_file.get("width", 0)
+                height = video_file.get("height", 0)
+                
+                # Check if dimensions are acceptable
+                if width >= 720 and height >= 1280:  # Reduced requirements
+                    suitable_videos.append((video, video_file))
+                    self.logger.info(
+                        f"Found suitable video: {width}x{height}, "
+                        f"duration: {video.get('duration')}s"
+                    )
+                    break
+        
+        if not suitable_videos:
+            self.logger.info("No suitable videos found with current criteria")
+            return None
+        
+        # Select random video
+        return random.choice(suitable_videos)
+
+    def _download_path(self, cache_key: str) -> str:
+        """Get the file path a downloaded video is written to."""
+        output_path = os.path.join(
+            self.cache.cache_dir,
+            f"{cache_key}.mp4"
+        )
+        
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        return output_path
+
+    @traced("pexels.cache_store", cat="cache")
+    @contextmanager
+    def _download_file(self, output_path: str) -> Iterator[BinaryIO]:
+        """Open a private file that replaces ``output_path`` once fully written.
+        
+        Concurrent downloads for the same cache key each write their own
+        file, so the cached video is always one complete download.
+        """
+        directory, name = os.path.split(output_path)
+        handle, temp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".part", dir=directory)
+        try:
+            with os.fdopen(handle, "wb") as f:
+                yield f
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _store_download(self, cache_key: str, output_path: str) -> str:
+        """Verify a downloaded video and add it to the cache.
+        
+        Raises:
+            VideoError: If the download is empty
+        """
+        if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+            raise VideoError("Downloaded file is empty or does not exist")
+        
+        self.cache.put(cache_key, output_path)
+        self.logger.info(f"Cached video: {output_path}")
+        if self.clip_normalizer:
+            self.clip_normalizer.submit(str(output_path))
+        
+        return str(output_path)
+
+    def cleanup(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
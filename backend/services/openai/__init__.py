@@ -1,9 +1,25 @@
 """OpenAI service module."""
 
-from services.openai.base import OpenAIServiceBase
-from services.openai.service import OpenAIService
+import importlib
+
+# Submodules are imported on first attribute access, so importing the
+# package does not pull in the OpenAI SDK
+_EXPORTS = {
+    'OpenAIServiceBase': 'services.openai.base',
+    'OpenAIService': 'services.openai.service',
+    'AsyncOpenAIService': 'services.openai.async_service'
+}
 
 __all__ = [
     'OpenAIServiceBase',
-    'OpenAIService'
-] 
\ No newline at end of file
+    'OpenAIService',
+    'AsyncOpenAIService'
+]
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,163 @@
+"""Asyncio OpenAI service implementation."""
+
+from typing import Any, Dict, Optional
+import httpx
+from openai import AsyncOpenAI
+from config.exceptions import OpenAIError
+from utils.tracing import span, traced
+from services.openai.service import OpenAIService, RiddleResponse
+
+class AsyncOpenAIService(OpenAIService):
+    """OpenAI service built on ``AsyncOpenAI`` and a shared HTTP client.
+    
+    Shares prompts, parsing, validation and caching with ``OpenAIService``;
+    only the completion request is awaited.
+    """
+    
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        config: Dict,
+        api_key: Optional[str] = None,
+        logger=None
+    ):
+        """Initialize async OpenAI service.
+        
+        Args:
+            client: Shared async HTTP client
+            config: Configuration dictionary
+            api_key: OpenAI API key (defaults to env var)
+            logger: Optional logger instance
+        """
+        # Needed by _create_client during base initialization
+        self.http_client = client
+        super().__init__(config=config, api_key=api_key, logger=logger)
+
+    def _create_client(self) -> AsyncOpenAI:
+        """Create the async OpenAI client on the shared connection pool."""
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=self.http_client
+        )
+
+    @traced("openai.generate_riddle", cat="openai")
+    async def generate_riddle(
+        self,
+        category: str,
+        difficulty: str = "medium",
+        style: str = "classic",
+        target_age: str = "teen",
+        educational: bool = True,
+        cache_key: Optional[str] = None,
+        no_cache: bool = False
+    ) -> Dict[str, str]:
+        """Generate a riddle using OpenAI.
+        
+        Args:
+            category: Riddle category
+            difficulty: Difficulty level
+            style: Riddle style
+            target_age: Target age group
+            educational: Whether to include educational content
+            cache_key: Optional cache key
+            no_cache: Whether to skip cache checking
+            
+        Returns:
+            Dictionary containing riddle and answer
+            
+        Raises:
+            OpenAIError: If generation fails
+        """
+        try:
+            # Validate inputs
+            self._validate_category(category)
+            self._validate_difficulty(difficulty)
+            
+            cache_key = cache_key or self._riddle_cache_key(
+                category,
+                difficulty,
+                style,
+                target_age,
+                educational
+            )
+            
+            if not no_cache:
+                with span("openai.cache_lookup", cat="cache"):
+                    cached_data = self.cache.get(cache_key)
+                if cached_data and isinstance(cached_data, dict):
+                    self.logger.info("Using cached riddle")
+                    return cached_data
+            
+            prompt = self._prepare_riddle_prompt(
+                category,
+                difficulty,
+                style,
+                target_age,
+                educational
+            )
+            
+            for attempt in range(self.max_attempts):
+                try:
+                    response = await self._generate_completion(
+                        prompt,
+                        temperature=self.temperature + (attempt * 0.1)
+                    )
+                    
+                    riddle_data = self._parse_riddle_response(response)
+                    if self._validate_riddle(riddle_data):
+                        break
+                        
+                except Exception as e:
+                    if attempt == self.max_attempts - 1:
+                        raise OpenAIError(f"Failed to generate valid riddle: {str(e)}")
+                    self.logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+                    continue
+            
+            return self._finalize_riddle(
+                riddle_data,
+                category,
+                difficulty,
+                style,
+                target_age,
+                cache_key,
+                no_cache
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Failed to generate riddle: {str(e)}")
+            raise OpenAIError(f"Failed to generate riddle: {str(e)}")
+
+    @traced("openai.http", cat="http")
+    async def _generate_completion(self, prompt: str, temperature: Optional[float] = None) -> Dict[str, Any]:
+        """Generate a completion using the OpenAI API.
+        
+        Args:
+            prompt: The prompt to generate from
+            temperature: Optional temperature override
+            
+        Returns:
+            The generated completion data
+            
+        Raises:
+            OpenAIError: If generation fails
+        """
+        try:
+            completion = await self.client.beta.chat.completions.parse(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": "Generate a riddle based on the given category and requirements."}
+                ],
+                temperature=temperature or self.temperature,
+                max_tokens=self.max_tokens,
+                response_format=RiddleResponse
+            )
+            
+            return {
+                "riddle": completion.choices[0].message.parsed.riddle,
+                "answer": completion.choices[0].message.parsed.answer,
+            }
+            
+        except Exception as e:
+            raise OpenAIError(f"Failed to generate completion: {str(e)}")
@@ -9,6 +9,7 @@ from config.exceptions import OpenAIError
 from services.openai.base import OpenAIServiceBase
 from utils.cache import CacheManager
 from utils.logger import log
+from utils.tracing import span, traced
 from pydantic import BaseModel
 
 class RiddleResponse(BaseModel):
@@ -39,8 +40,11 @@ class OpenAIService(OpenAIServiceBase):
         if not self.api_key:
             raise OpenAIError("OpenAI API key not found")
         
+        # Optional API base URL (e.g. a proxy or local stub server)
+        self.base_url = config.get("openai", {}).get("base_url")
+        
         # Initialize OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = self._create_client()
         
         # Get model configuration
         self.model = config.get("openai", {}).get("model", "gpt-4o-2024-08-06")
@@ -56,6 +60,7 @@ class OpenAIService(OpenAIServiceBase):
         self.templates = config.get("openai", {}).get("riddle_generation", {}).get("templates", {})
         self.difficulty_levels = config.get("openai", {}).get("riddle_generation", {}).get("difficulty_levels", {})
 
+    @traced("openai.generate_riddle", cat="openai")
     def generate_riddle(
         self,
         category: str,
@@ -88,39 +93,25 @@ class OpenAIService(OpenAIServiceBase):
             self._validate_category(category)
             self._validate_difficulty(difficulty)
             
-            # Generate cache key if not provided and caching is enabled
+            # Generate cache key if not provided
+            cache_key = cache_key or self._riddle_cache_key(
+                category,
+                difficulty,
+                style,
+                target_age,
+                educational
+            )
+            
             if not no_cache:
-                if not cache_key:
-                    params = {
-                        "category": category,
-                        "difficulty": difficulty,
-                        "style": style,
-                        "target_age": target_age,
-                        "educational": educational
-                    }
-                    cache_key = hashlib.sha256(
-                        json.dumps(params, sort_keys=True).encode()
-                    ).hexdigest()
-                
                 self.logger.info(f"Cache key: {cache_key}")
                 # Check cache
-                cached_data = self.cache.get(cache_key)
+                with span("openai.cache_lookup", cat="cache"):
+                    cached_data = self.cache.get(cache_key)
                 if cached_data and isinstance(cached_data, dict):
                     self.logger.info("Using cached riddle")
                     return cached_data
             else:
                 self.logger.info("Cache disabled, generating new riddle")
-                # Generate a cache key anyway for potential storage
-                params = {
-                    "category": category,
-                    "difficulty": difficulty,
-                    "style": style,
-                    "target_age": target_age,
-                    "educational": educational
-                }
-                cache_key = hashlib.sha256(
-                    json.dumps(params, sort_keys=True).encode()
-                ).hexdigest()
             
             # Prepare prompt
             prompt = self._prepare_riddle_prompt(
@@ -150,24 +141,69 @@ class OpenAIService(OpenAIServiceBase):
                     self.logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
                     continue
             
-            # Add metadata
-            riddle_data.update({
-                "category": category,
-                "difficulty": difficulty,
-                "style": style,
-                "target_age": target_age
-            })
-            
-            # Cache result if caching is enabled
-            if not no_cache and cache_key:
-                self.cache.put(cache_key, riddle_data)
-            
-            return riddle_data
+            return self._finalize_riddle(
+                riddle_data,
+                category,
+                difficulty,
+                style,
+                target_age,
+                cache_key,
+                no_cache
+            )
             
         except Exception as e:
             self.logger.error(f"Failed to generate riddle: {str(e)}")
             raise OpenAIError(f"Failed to generate riddle: {str(e)}")
 
+    def _create_client(self) -> OpenAI:
+        """Create the OpenAI API client."""
+        return OpenAI(api_key=self.api_key, base_url=self.base_url)
+
+    def _riddle_cache_key(
+        self,
+        category: str,
+        difficulty: str,
+        style: str,
+        target_age: str,
+        educational: bool
+    ) -> str:
+        """Generate the cache key for a set of riddle parameters."""
+        params = {
+            "category": category,
+            "difficulty": difficulty,
+            "style": style,
+            "target_age": target_age,
+            "educational": educational
+        }
+        return hashlib.sha256(
+            json.dumps(params, sort_keys=True).encode()
+        ).hexdigest()
+
+    def _finalize_riddle(
+        self,
+        riddle_data: Dict[str, str],
+        category: str,
+        difficulty: str,
+        style: str,
+        target_age: str,
+        cache_key: str,
+        no_cache: bool
+    ) -> Dict[str, str]:
+        """Add metadata to a generated riddle and cache it."""
+        riddle_data.update({
+            "category": category,
+            "difficulty": difficulty,
+            "style": style,
+            "target_age": target_age
+        })
+        
+        # Cache result if caching is enabled
+        if not no_cache and cache_key:
+            self.cache.put(cache_key, riddle_data)
+        
+        return riddle_data
+
+    @traced("openai.http", cat="http")
     def _generate_completion(self, prompt: str, temperature: Optional[float] = None) -> Dict[str, Any]:
         """Generate a completion using the OpenAI API.
         
@@ -320,6 +356,7 @@ class OpenAIService(OpenAIServiceBase):
         if difficulty not in valid_difficulties:
             raise ValueError(f"Invalid difficulty: {difficulty}. Must be one of {valid_difficulties}")
 
+    @traced("openai.prompt_build", cat="prompt")
     def _prepare_riddle_prompt(
         self,
         category: str,
@@ -1,7 +1,21 @@
 """Timing management services."""
 
-from services.timing.segment_timing_service import SegmentTimingService
+import importlib
+
+# Submodules are imported on first attribute access, like the other
+# service packages
+_EXPORTS = {
+    'SegmentTimingService': 'services.timing.segment_timing_service'
+}
 
 __all__ = [
     'SegmentTimingService'
-] 
\ No newline at end of file
+]
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,6 +3,7 @@ from typing import Dict, List
 from config.exceptions import TimingServiceError
 from services.timing.base import SegmentTimingServiceBase
 from utils.logger import log
+from utils.tracing import traced
 
 class SegmentTimingService(SegmentTimingServiceBase):
     def __init__(self, config: Dict = None, logger=None):
@@ -36,6 +37,7 @@ class SegmentTimingService(SegmentTimingServiceBase):
         if config and "timing" in config:
             self._update_timing_config(config["timing"])
 
+    @traced("timing.calculate", cat="timing")
     def calculate_segment_timings(
         self,
         segments: List[Dict],
@@ -1,9 +1,25 @@
 """Text-to-Speech service module."""
 
-from services.tts.base import TTSServiceBase
-from services.tts.service import TTSService
+import importlib
+
+# Submodules are imported on first attribute access, so importing the
+# package does not pull in requests and httpx
+_EXPORTS = {
+    'TTSServiceBase': 'services.tts.base',
+    'TTSService': 'services.tts.service',
+    'AsyncTTSService': 'services.tts.async_service'
+}
 
 __all__ = [
     'TTSServiceBase',
-    'TTSService'
-] 
\ No newline at end of file
+    'TTSService',
+    'AsyncTTSService'
+]
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
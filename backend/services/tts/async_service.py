@@ -0,0 +1,115 @@
+"""Asyncio Text-to-Speech service implementation."""
+
+import os
+from typing import Optional
+import httpx
+from utils.decorators import async_retry
+from utils.tracing import span, traced
+from config.exceptions import TTSError
+from services.tts.service import TTSService
+
+class AsyncTTSService(TTSService):
+    """ElevenLabs Text-to-Speech service built on a shared async HTTP client.
+    
+    Shares request building, caching and validation with ``TTSService``;
+    only the network calls are awaited.
+    """
+    
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_key: str,
+        voice_id: str,
+        **kwargs
+    ):
+        """Initialize async TTS service.
+        
+        Args:
+            client: Shared async HTTP client
+            api_key: ElevenLabs API key
+            voice_id: Voice ID to use
+            **kwargs: Remaining ``TTSService`` options
+        """
+        kwargs["verify_api_key"] = False
+        super().__init__(api_key=api_key, voice_id=voice_id, **kwargs)
+        self.client = client
+        self.headers = {"xi-api-key": self.api_key}
+
+    async def verify_api_key(self) -> None:
+        """Verify the API key by making a test request.
+        
+        Raises:
+            TTSError: If verification fails
+        """
+        try:
+            response = await self.client.get(f"{self.base_url}/user", headers=self.headers)
+            
+            if response.status_code != 200:
+                raise TTSError(
+                    f"Invalid API key. Please check your ElevenLabs API key. "
+                    f"Response: {response.text}"
+                )
+            
+            self.logger.info("Successfully verified ElevenLabs API key")
+            
+        except Exception as e:
+            self.logger.error(f"Error verifying API key: {str(e)}")
+            raise TTSError(f"Failed to verify API key: {str(e)}")
+
+    @traced("tts.generate_speech", cat="tts")
+    @async_retry(retries=3, delay=1.0, backoff=2.0)
+    async def generate_speech(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        stability: Optional[float] = None,
+        similarity_boost: Optional[float] = None
+    ) -> str:
+        """Generate speech from text.
+        
+        Args:
+            text: Text to convert to speech
+            voice_id: Optional voice ID to use
+            stability: Optional stability value
+            similarity_boost: Optional similarity boost value
+            
+        Returns:
+            Path to generated audio file
+            
+        Raises:
+            TTSError: If generation fails
+        """
+        try:
+            cache_path, url, headers, data = self._prepare_request(
+                text,
+                voice_id,
+                stability,
+                similarity_boost
+            )
+            
+            # Return cached file if it exists and is valid
+            with span("tts.cache_lookup", cat="cache"):
+                cached = os.path.exists(cache_path) and self.validate_audio(cache_path)
+            if cached:
+                self.logger.info(f"Using cached audio: {cache_path}")
+                return cache_path
+            
+            self.logger.info("Generating speech with ElevenLabs")
+            with span("tts.http", cat="http", chars=len(text)):
+                response = await self.client.post(
+                    url,
+                    json=data,
+                    headers={**self.headers, **headers}
+                )
+            
+            if response.status_code != 200:
+                raise TTSError(
+                    f"ElevenLabs API error: {response.status_code} - "
+                    f"{response.text}"
+                )
+            
+            return self._save_audio(cache_path, response.content)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to generate speech: {str(e)}")
+            raise TTSError(f"Failed to generate speech: {str(e)}")
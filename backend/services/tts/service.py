@@ -3,12 +3,14 @@
 import logging
 import os
 import hashlib
+import tempfile
 import requests
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from utils.decorators import retry
 from utils.cache import CacheManager
 from utils.logger import log
+from utils.tracing import span, traced
 from config.exceptions import TTSError
 from services.tts.base import TTSServiceBase
 
@@ -23,7 +25,9 @@ class TTSService(TTSServiceBase):
         stability: float = 0.5,
         similarity_boost: float = 0.75,
         logger=None,
-        cache_dir: str = "cache/voice"
+        cache_dir: str = "cache/voice",
+        base_url: Optional[str] = None,
+        verify_api_key: bool = True
     ):
         """Initialize TTS service.
         
@@ -35,8 +39,10 @@ class TTSService(TTSServiceBase):
             similarity_boost: Voice similarity boost
             logger: Optional logger instance
             cache_dir: Cache directory for audio files
+            base_url: Optional API base URL (defaults to ElevenLabs)
+            verify_api_key: Whether to check the API key on startup
         """
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = base_url or "https://api.elevenlabs.io/v1"
         self.api_key = api_key
         self.voice_id = voice_id
         self.model = model
@@ -44,11 +50,16 @@ class TTSService(TTSServiceBase):
         self.similarity_boost = similarity_boost
         self.logger = logger or logging.getLogger(__name__)
         
+        # Keep-alive session shared by all ElevenLabs requests
+        self.session = requests.Session()
+        self.session.headers.update({"xi-api-key": self.api_key})
+        
         # Initialize cache
         self.cache = CacheManager(cache_dir)
         
         # Verify API key
-        self._verify_api_key()
+        if verify_api_key:
+            self._verify_api_key()
 
     def _verify_api_key(self) -> None:
         """Verify the API key by making a test request.
@@ -58,9 +69,8 @@ class TTSService(TTSServiceBase):
         """
         try:
             url = f"{self.base_url}/user"
-            headers = {"xi-api-key": self.api_key}
             
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url)
             
             if response.status_code != 200:
                 self.logger.error(
@@ -77,6 +87,7 @@ class TTSService(TTSServiceBase):
             self.logger.error(f"Error verifying API key: {str(e)}")
             raise TTSError(f"Failed to verify API key: {str(e)}")
 
+    @traced("tts.generate_speech", cat="tts")
     @retry(retries=3, delay=1.0, backoff=2.0)
     def generate_speech(
         self,
@@ -100,52 +111,25 @@ class TTSService(TTSServiceBase):
             TTSError: If generation fails
         """
         try:
-            # Use provided values or defaults
-            voice_id = voice_id or self.voice_id
-            stability = stability or self.stability
-            similarity_boost = similarity_boost or self.similarity_boost
-            
-            # Generate cache key
-            cache_key = self._generate_cache_key(
-                text=text,
-                voice_id=voice_id,
-                stability=stability,
-                similarity_boost=similarity_boost
+            cache_path, url, headers, data = self._prepare_request(
+                text,
+                voice_id,
+                stability,
+                similarity_boost
             )
             
-            # Create cache subdirectory
-            cache_subdir = os.path.join(self.cache.base_dir, cache_key[:2])
-            os.makedirs(cache_subdir, exist_ok=True)
-            
-            # Full path for cached file
-            cache_path = os.path.join(cache_subdir, f"{cache_key}.mp3")
-            
             # Return cached file if it exists and is valid
-            if os.path.exists(cache_path) and self.validate_audio(cache_path):
+            with span("tts.cache_lookup", cat="cache"):
+                cached = os.path.exists(cache_path) and self.validate_audio(cache_path)
+            if cached:
                 self.logger.info(f"Using cached audio: {cache_path}")
                 return cache_path
             
             # Generate audio using the API
             self.logger.info("Generating speech with ElevenLabs")
-            
-            url = f"{self.base_url}/text-to-speech/{voice_id}"
-            headers = {
-                "Accept": "audio/mpeg",
-                "Content-Type": "application/json",
-                "xi-api-key": self.api_key
-            }
-            
-            data = {
-                "text": text,
-                "model_id": self.model,
-                "voice_settings": {
-                    "stability": float(stability if stability is not None else self.stability),
-                    "similarity_boost": float(similarity_boost if similarity_boost is not None else self.similarity_boost)
-                }
-            }
-            
             self.logger.info(f"Request data: {data}")
-            response = requests.post(url, json=data, headers=headers)
+            with span("tts.http", cat="http", chars=len(text)):
+                response = self.session.post(url, json=data, headers=headers)
             
             if response.status_code != 200:
                 raise TTSError(
@@ -153,22 +137,98 @@ class TTSService(TTSServiceBase):
                     f"{response.text}"
                 )
             
-            # Save audio file
-            with open(cache_path, "wb") as f:
-                f.write(response.content)
-            
-            # Validate generated audio
-            if not self.validate_audio(cache_path):
-                os.remove(cache_path)
-                raise TTSError("Generated audio validation failed")
-            
-            self.logger.info(f"Generated audio: {cache_path}")
-            return cache_path
+            return self._save_audio(cache_path, response.content)
             
         except Exception as e:
             self.logger.error(f"Failed to generate speech: {str(e)}")
             raise TTSError(f"Failed to generate speech: {str(e)}")
 
+    def _prepare_request(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        stability: Optional[float] = None,
+        similarity_boost: Optional[float] = None
+    ) -> Tuple[str, str, Dict[str, str], Dict[str, Any]]:
+        """Resolve the cache path and API request for a speech request.
+        
+        Args:
+            text: Text to convert to speech
+            voice_id: Optional voice ID to use
+            stability: Optional stability value
+            similarity_boost: Optional similarity boost value
+            
+        Returns:
+            Tuple of cache path, request URL, headers and JSON body
+        """
+        # Use provided values or defaults
+        voice_id = voice_id or self.voice_id
+        stability = stability or self.stability
+        similarity_boost = similarity_boost or self.similarity_boost
+        
+        # Generate cache key
+        cache_key = self._generate_cache_key(
+            text=text,
+            voice_id=voice_id,
+            stability=stability,
+            similarity_boost=similarity_boost
+        )
+        
+        # Create cache subdirectory
+        cache_subdir = os.path.join(self.cache.base_dir, cache_key[:2])
+        os.makedirs(cache_subdir, exist_ok=True)
+        
+        # Full path for cached file
+        cache_path = os.path.join(cache_subdir, f"{cache_key}.mp3")
+        
+        url = f"{self.base_url}/text-to-speech/{voice_id}"
+        headers = {
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json"
+        }
+        
+        data = {
+            "text": text,
+            "model_id": self.model,
+            "voice_settings": {
+                "stability": float(stability),
+                "similarity_boost": float(similarity_boost)
+            }
+        }
+        
+        return cache_path, url, headers, data
+
+    def _save_audio(self, cache_path: str, content: bytes) -> str:
+        """Write generated audio to the cache and validate it.
+        
+        The audio is written to a private file first and moved into place,
+        so concurrent requests for the same text never interleave their
+        bytes in ``cache_path``.
+        
+        Raises:
+            TTSError: If the audio is not a valid MP3 file
+        """
+        directory, name = os.path.split(cache_path)
+        handle, temp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".part", dir=directory or None)
+        try:
+            with os.fdopen(handle, "wb") as f:
+                f.write(content)
+            
+            if not self.validate_audio(temp_path):
+                raise TTSError("Generated audio validation failed")
+            
+            os.replace(temp_path, cache_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        
+        self.logger.info(f"Generated audio: {cache_path}")
+        return cache_path
+
+    def cleanup(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
+
     def validate_audio(self, audio_path: str) -> bool:
         """Validate audio file.
         
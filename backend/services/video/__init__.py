@@ -1,13 +1,39 @@
 """Video processing services."""
 
-from services.video.composition_service import VideoCompositionService
-from services.video.effects_service import VideoEffectsService
-from services.video.text_overlay_service import TextOverlayService
-from services.video.segment_service import SegmentService
+import importlib
+
+# Submodules are imported on first attribute access, so importing the
+# package does not pull in MoviePy
+_EXPORTS = {
+    'VideoCompositionService': 'services.video.composition_service',
+    'VideoEffectsService': 'services.video.effects_service',
+    'TextOverlayService': 'services.video.text_overlay_service',
+    'SegmentService': 'services.video.segment_service',
+    'SegmentRenderer': 'services.video.segment_renderer',
+    'FFmpegRenderer': 'services.video.ffmpeg_renderer',
+    'EncoderRegistry': 'services.video.encoders',
+    'ClipNormalizer': 'services.video.clip_normalizer',
+    'FrameBuffer': 'services.video.frame_buffer',
+    'FramePipeline': 'services.video.frame_pipeline'
+}
 
 __all__ = [
     'VideoCompositionService',
     'VideoEffectsService',
     'TextOverlayService',
-    'SegmentService'
-] 
\ No newline at end of file
+    'SegmentService',
+    'SegmentRenderer',
+    'FFmpegRenderer',
+    'EncoderRegistry',
+    'ClipNormalizer',
+    'FrameBuffer',
+    'FramePipeline'
+]
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
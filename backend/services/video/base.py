@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 from moviepy.editor import VideoFileClip, CompositeVideoClip
 
@@ -19,7 +19,12 @@ class VideoEffectsServiceBase(ABC):
         pass
 
     @abstractmethod
-    def standardize_video(self, clip: VideoFileClip, target_duration: float) -> VideoFileClip:
+    def standardize_video(
+        self,
+        clip: VideoFileClip,
+        target_duration: float,
+        size: Optional[Tuple[int, int]] = None
+    ) -> VideoFileClip:
         pass
 
 class TextOverlayServiceBase(ABC):
@@ -33,5 +38,10 @@ class TextOverlayServiceBase(ABC):
 
 class SegmentServiceBase(ABC):
     @abstractmethod
-    def process_segment(self, segment: Dict, timing: Dict[str, float]) -> VideoFileClip:
+    def process_segment(
+        self,
+        segment: Dict,
+        timing: Dict[str, float],
+        size: Optional[Tuple[int, int]] = None
+    ) -> VideoFileClip:
         pass 
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""Background transcoding of background clips into a render-ready format"""
+
+import json
+import logging
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from moviepy.config import get_setting
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from services.video.frame_transform import cover_filter
+from utils.logger import log
+from utils.tracing import traced
+
+
+class ClipNormalizer:
+    """Transcodes downloaded clips once into render-ready mezzanine files.
+
+    Pexels renditions come in any size, frame rate and codec. Normalized
+    copies are scaled and center-cropped to fill ``video.resolution``,
+    resampled to ``video.fps`` and encoded with short GOPs, no B-frames and
+    the ``fastdecode`` tune, so renders decode them cheaply and never resize
+    their frames. Each copy is
+    stored next to its source with a JSON metadata sidecar, written last,
+    which renders check before using the copy.
+    """
+
+    SUFFIX = ".normalized"
+
+    def __init__(self, config: Dict = None, logger: logging.Logger = None):
+        self.config = config or {}
+        self.logger = logger or log
+
+        video_config = self.config.get("video", {})
+        normalize_config = video_config.get("normalize", {})
+        self.enabled = normalize_config.get("enabled", True)
+        self.workers = int(normalize_config.get("workers") or 1)
+        self.codec = normalize_config.get("codec", "libx264")
+        self.preset = normalize_config.get("preset", "veryfast")
+        self.crf = normalize_config.get("crf", 18)
+        self.gop = normalize_config.get("gop", 15)
+        self.width = video_config.get("resolution", {}).get("width", 1080)
+        self.height = video_config.get("resolution", {}).get("height", 1920)
+        self.fps = video_config.get("fps", 30)
+        self.ffmpeg = get_setting("FFMPEG_BINARY")
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Transcoding threads, started on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="normalize")
+        return self._executor
+
+    def settings(self) -> Dict:
+        """Settings a normalized copy must have been made with to be used."""
+        return {
+            "width": self.width,
+            "height": self.height,
+            "fit": "cover",
+            "fps": self.fps,
+            "codec": self.codec,
+            "preset": self.preset,
+            "crf": self.crf,
+            "gop": self.gop
+        }
+
+    def paths(self, source: str) -> Tuple[str, str]:
+        """Get the normalized video and metadata sidecar paths of a clip."""
+        base = f"{os.path.splitext(source)[0]}{self.SUFFIX}"
+        return f"{base}.mp4", f"{base}.json"
+
+    def metadata(self, source: str) -> Optional[Dict]:
+        """Get the sidecar of a clip's usable normalized copy, if there is one."""
+        video_path, meta_path = self.paths(source)
+        try:
+            with open(meta_path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if metadata.get("settings") != self.settings() or not os.path.exists(video_path):
+            return None
+        if os.path.exists(source) and os.path.getsize(source) != metadata.get("source_size"):
+            return None
+        return metadata
+
+    def resolve(self, source: str) -> str:
+        """Get the normalized copy of a clip, or the clip itself if there is none."""
+        if not self.enabled or self.metadata(source) is None:
+            return source
+        return self.paths(source)[0]
+
+    def submit(self, source: str) -> Optional[Future]:
+        """Normalize a clip in the background unless it already is.
+
+        Returns:
+            Future resolving to the normalized path, or None if there is
+            nothing to do
+        """
+        if not self.enabled or self.metadata(source) is not None:
+            return None
+        with self._lock:
+            future = self._pending.get(source)
+            if future is None or future.done():
+                future = self.executor.submit(self.normalize, source)
+                self._pending[source] = future
+            return future
+
+    @traced("normalize.clip", cat="encode")
+    def normalize(self, source: str) -> str:
+        """Transcode a clip into the mezzanine format and write its sidecar.
+
+        Failures are logged and leave the clip to be used as it is.
+
+        Returns:
+            Path to the normalized copy, or the source if it failed
+        """
+        video_path, meta_path = self.paths(source)
+        # Per process, so workers normalizing the same clip do not collide
+        temp_path = f"{os.path.splitext(video_path)[0]}.{os.getpid()}.tmp.mp4"
+        command = [
+            self.ffmpeg, "-y", "-v", "error", "-i", source, "-an",
+            "-vf", f"{cover_filter(self.width, self.height)},setsar=1,fps={self.fps}",
+            "-c:v", self.codec, "-preset", self.preset, "-crf", str(self.crf),
+            "-g", str(self.gop), "-bf", "0", "-pix_fmt", "yuv420p"
+        ]
+        if self.codec in ("libx264", "libx265"):
+            command += ["-tune", "fastdecode"]
+        command += ["-movflags", "+faststart", temp_path]
+
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+            os.replace(temp_path, video_path)
+            metadata = {
+                "source": source,
+                "source_size": os.path.getsize(source),
+                "path": video_path,
+                "width": self.width,
+                "height": self.height,
+                "fps": self.fps,
+                "duration": ffmpeg_parse_infos(video_path).get("duration"),
+                "settings": self.settings(),
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds")
+            }
+            with open(f"{meta_path}.tmp", "w") as f:
+                json.dump(metadata, f, indent=2)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            details = e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) else str(e)
+            self.logger.warning(f"Failed to normalize {source}: {details}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return source
+
+        self.logger.info(f"Normalized {source} to {video_path}")
+        return video_path
+
+    def cleanup(self) -> None:
+        """Finish the running transcodes and drop the queued ones."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
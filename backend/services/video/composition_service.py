@@ -1,5 +1,7 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
+import os
+import tempfile
 from moviepy.editor import VideoFileClip, CompositeVideoClip, concatenate_videoclips
 from config.exceptions import VideoCompositionError
 from services.video.base import VideoCompositionServiceBase
@@ -9,9 +11,61 @@ from services.video.text_overlay_service import TextOverlayService
 from services.audio.composition_service import AudioCompositionService
 from services.timing.segment_timing_service import SegmentTimingService
 from services.video.segment_service import SegmentService
+from services.video.segment_renderer import SegmentRenderer
+from services.video.ffmpeg_renderer import FFmpegRenderer
+from services.video.encoders import EncoderRegistry
+from services.video.clip_normalizer import ClipNormalizer
+from services.video.frame_pipeline import FramePipeline
 from utils.logger import log
+from utils.tracing import span, traced
+
+# Output quality per profile: a ``scale`` of ``video.resolution``, a frame
+# rate (``video.fps`` if unset) and an encoder profile (``video.encoder.profile``
+# if unset). Overridden per profile by ``video.quality.profiles``.
+DEFAULT_QUALITY_PROFILES = {
+    "draft": {"scale": 0.25, "fps": 12, "encoder_profile": "fast"},
+    "preview": {"scale": 0.5, "fps": 15, "encoder_profile": "fast"},
+    "final": {"scale": 1.0, "fps": None, "encoder_profile": None}
+}
+
+def resolve_quality(config: Dict, quality: Optional[str] = None) -> Dict:
+    """Resolve a quality profile into its output size and frame rate.
+
+    Args:
+        config: Application configuration
+        quality: Profile name (defaults to ``video.quality.profile``)
+
+    Returns:
+        ``quality``, output ``size`` as (width, height), ``fps`` and
+        ``encoder_profile``
+
+    Raises:
+        VideoCompositionError: If the profile is unknown
+    """
+    video_config = config.get("video", {})
+    quality_config = video_config.get("quality", {})
+    quality = quality or quality_config.get("profile", "final")
+    profiles = {name: dict(settings) for name, settings in DEFAULT_QUALITY_PROFILES.items()}
+    for name, settings in quality_config.get("profiles", {}).items():
+        profiles.setdefault(name, {}).update(settings)
+    if quality not in profiles:
+        raise VideoCompositionError(f"Unknown quality profile: {quality}")
+
+    profile = profiles[quality]
+    scale = profile.get("scale") or 1.0
+    width = video_config.get("resolution", {}).get("width", 1080)
+    height = video_config.get("resolution", {}).get("height", 1920)
+    return {
+        "quality": quality,
+        # Encoders need even dimensions for yuv420p
+        "size": (max(2, round(width * scale / 2) * 2), max(2, round(height * scale / 2) * 2)),
+        "fps": profile.get("fps") or video_config.get("fps", 30),
+        "encoder_profile": profile.get("encoder_profile")
+    }
 
 class VideoCompositionService(VideoCompositionServiceBase):
+    RENDER_MODES = ("single", "segments", "chunks", "ffmpeg")
+
     def __init__(
         self,
         pexels_service: PexelsService,
@@ -20,6 +74,11 @@ class VideoCompositionService(VideoCompositionServiceBase):
         audio_composition: AudioCompositionService,
         segment_timing: SegmentTimingService,
         segment_service: SegmentService,
+        segment_renderer: Optional[SegmentRenderer] = None,
+        ffmpeg_renderer: Optional[FFmpegRenderer] = None,
+        encoder_registry: Optional[EncoderRegistry] = None,
+        clip_normalizer: Optional[ClipNormalizer] = None,
+        frame_pipeline: Optional[FramePipeline] = None,
         config: Dict = None,
         logger: logging.Logger = None
     ):
@@ -29,8 +88,13 @@ class VideoCompositionService(VideoCompositionServiceBase):
         self.audio_composition = audio_composition
         self.segment_timing = segment_timing
         self.segment_service = segment_service
+        self.segment_renderer = segment_renderer
+        self.ffmpeg_renderer = ffmpeg_renderer
+        self.clip_normalizer = clip_normalizer
+        self.frame_pipeline = frame_pipeline
         self.config = config or {}
         self.logger = logger or log
+        self.encoder_registry = encoder_registry or EncoderRegistry(self.config, self.logger)
 
     def create_multi_riddle_video(
         self,
@@ -40,19 +104,109 @@ class VideoCompositionService(VideoCompositionServiceBase):
     ) -> bool:
         try:
             # Calculate timings first
-            segment_timings = self.segment_timing.calculate_segment_timings(
+            segment_timings = self.calculate_timings(riddle_segments)
+            
+            # Get a background video for every segment
+            background_paths = self.fetch_backgrounds(riddle_segments, category)
+            
+            return self.render_video(
                 riddle_segments,
-                self.config
+                segment_timings,
+                background_paths,
+                output_path
             )
             
+        except Exception as e:
+            self.logger.error(f"Failed to create video: {str(e)}")
+            raise VideoCompositionError(f"Failed to create video: {str(e)}")
+
+    @traced("video.calculate_timings", cat="video")
+    def calculate_timings(self, riddle_segments: List[Dict]) -> List[Dict]:
+        """Calculate the duration of every segment."""
+        return self.segment_timing.calculate_segment_timings(
+            riddle_segments,
+            self.config
+        )
+
+    @traced("video.fetch_backgrounds", cat="video")
+    def fetch_backgrounds(
+        self,
+        riddle_segments: List[Dict],
+        category: str,
+        cached_only: bool = False
+    ) -> List[str]:
+        """Get a background video path for every segment.
+
+        Args:
+            riddle_segments: Segments in playback order
+            category: Video category
+            cached_only: Only use videos that are already downloaded
+        """
+        get_video = self.pexels_service.get_cached_video if cached_only else self.pexels_service.get_video
+        background_paths = []
+        for segment in riddle_segments:
+            try:
+                background_paths.append(get_video(category))
+            except Exception as e:
+                self.logger.error(f"Failed to get background for segment {segment.get('id', '')}: {str(e)}")
+                raise VideoCompositionError(f"Failed to get background: {str(e)}")
+        return background_paths
+
+    @traced("video.render", cat="video")
+    def render_video(
+        self,
+        riddle_segments: List[Dict],
+        segment_timings: List[Dict],
+        background_paths: List[str],
+        output_path: str,
+        render_mode: Optional[str] = None,
+        quality: Optional[str] = None
+    ) -> bool:
+        """Compose and encode the final video from resolved assets.
+
+        The render mode picks how: ``single`` composes all segments into
+        one MoviePy clip and encodes it in one pass, on the threaded frame
+        pipeline when ``video.render.pipeline`` is enabled, ``segments`` encodes
+        every segment separately on a process pool and joins them without
+        re-encoding, ``chunks`` does the same with equal time slices of
+        the video instead of segments, and ``ffmpeg`` renders everything in one ffmpeg
+        filtergraph without per-frame Python work. Every mode composites
+        once, at the output size of the quality profile.
+
+        Args:
+            riddle_segments: Segments in playback order
+            segment_timings: Duration of every segment
+            background_paths: Background video of every segment
+            output_path: Final video file
+            render_mode: Optional per-job override of ``video.render.mode``
+            quality: Optional override of ``video.quality.profile``
+        """
+        render_mode = render_mode or self.config.get("video", {}).get("render", {}).get("mode", "single")
+        if render_mode not in self.RENDER_MODES:
+            raise VideoCompositionError(f"Unknown render mode: {render_mode}")
+        settings = self.render_settings(quality)
+        if self.clip_normalizer is not None:
+            # Prefer the render-ready copies of clips that have one
+            background_paths = [self.clip_normalizer.resolve(path) for path in background_paths]
+        if render_mode in ("segments", "chunks") and self.segment_renderer is not None:
+            return self._render_segments(
+                riddle_segments,
+                segment_timings,
+                background_paths,
+                output_path,
+                settings,
+                chunks=render_mode == "chunks"
+            )
+        if render_mode == "ffmpeg" and self.ffmpeg_renderer is not None:
+            return self._render_ffmpeg(riddle_segments, segment_timings, background_paths, output_path, settings)
+        if self.frame_pipeline is not None and self.frame_pipeline.enabled:
+            return self._render_pipeline(riddle_segments, segment_timings, background_paths, output_path, settings)
+
+        video_segments = []
+        try:
             # Process video segments
-            video_segments = []
-            
-            for segment, timing in zip(riddle_segments, segment_timings):
+            for segment, timing, video_path in zip(riddle_segments, segment_timings, background_paths):
                 try:
-                    # Get background video
-                    video_path = self.pexels_service.get_video(category)
-                    
                     # Create segment with video path and text
                     processed_segment = {
                         "video_path": video_path,
@@ -62,7 +216,8 @@ class VideoCompositionService(VideoCompositionServiceBase):
                     # Process the segment using SegmentService
                     processed_clip = self.segment_service.process_segment(
                         processed_segment,
-                        {"duration": timing["duration"]}
+                        {"duration": timing["duration"]},
+                        size=settings["size"]
                     )
                     
                     video_segments.append(processed_clip)
@@ -73,65 +228,39 @@ class VideoCompositionService(VideoCompositionServiceBase):
             
             # Concatenate all segments
             try:
-                final_video = concatenate_videoclips(video_segments)
+                with span("video.concatenate", cat="video"):
+                    final_video = concatenate_videoclips(video_segments)
             except Exception as e:
                 self.logger.error(f"Failed to concatenate video segments: {str(e)}")
                 raise VideoCompositionError(f"Failed to concatenate segments: {str(e)}")
             
-            # Handle audio composition
+            # Handle audio composition, mixed once ahead of the encode
             try:
-                final_audio = self.audio_composition.create_audio_composition(
-                    riddle_segments,
-                    {timing["id"]: timing["duration"] for timing in segment_timings}
-                )
-                
-                # Combine video with audio
-                final_video = final_video.set_audio(final_audio)
+                audio_path = self._write_audio(riddle_segments, segment_timings, output_path)
             except Exception as e:
                 self.logger.error(f"Failed to add audio: {str(e)}")
                 raise VideoCompositionError(f"Failed to add audio: {str(e)}")
             
             # Write final video
             try:
-                # Get target resolution
-                target_width = self.config.get("video", {}).get("resolution", {}).get("width", 1080)
-                target_height = self.config.get("video", {}).get("resolution", {}).get("height", 1920)
-                
-                # Scale down for faster processing
-                processing_width = target_width // 2
-                processing_height = target_height // 2
-                
-                # Resize video for processing
-                processing_video = final_video.resize((processing_width, processing_height))
-                
-                # Write video with optimized settings
-                processing_video.write_videofile(
-                    output_path,
-                    codec='h264_videotoolbox',  # Use Apple Silicon hardware encoder
-                    audio_codec='aac',
-                    fps=self.config.get("video", {}).get("fps", 30),
-                    preset='ultrafast',
-                    threads=10,  # Use all available cores
-                    temp_audiofile="temp-audio.m4a",
-                    remove_temp=True,
-                    ffmpeg_params=[
-                        "-b:v", "8000k",  # High bitrate for quality
-                        "-maxrate", "10000k",
-                        "-bufsize", "20000k",
-                        "-movflags", "+faststart",  # Enable streaming optimization
-                        "-tune", "zerolatency",  # Minimize encoding latency
-                        "-tag:v", "avc1",  # Ensure compatibility
-                        "-vf", f"scale={target_width}:{target_height}"  # Scale back up for final output
-                    ],
-                    write_logfile=True,
-                    logger="bar"
-                )
+                # Write video with optimized settings; decode and overlay
+                # work happens lazily inside this call, frame by frame
+                with span("video.encode", cat="encode", duration=final_video.duration):
+                    final_video.write_videofile(
+                        output_path,
+                        audio=audio_path or False,
+                        write_logfile=True,
+                        logger="bar",
+                        **settings["write_options"]
+                    )
             except Exception as e:
                 self.logger.error(f"Failed to write video file: {str(e)}")
                 raise VideoCompositionError(f"Failed to write video: {str(e)}")
             finally:
                 # Clean up
                 try:
+                    if audio_path and os.path.exists(audio_path):
+                        os.remove(audio_path)
                     final_video.close()
                     for video in video_segments:
                         video.close()
@@ -141,8 +270,8 @@ class VideoCompositionService(VideoCompositionServiceBase):
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to create video: {str(e)}")
-            raise VideoCompositionError(f"Failed to create video: {str(e)}")
+            self.logger.error(f"Failed to render video: {str(e)}")
+            raise VideoCompositionError(f"Failed to render video: {str(e)}")
             
         finally:
             # Ensure all video files are closed
@@ -150,4 +279,178 @@ class VideoCompositionService(VideoCompositionServiceBase):
                 for video in video_segments:
                     video.close()
             except Exception as e:
-                self.logger.error(f"Error during cleanup: {str(e)}") 
\ No newline at end of file
+                self.logger.error(f"Error during cleanup: {str(e)}")
+
+    def render_settings(self, quality: Optional[str] = None) -> Dict:
+        """Resolve a quality profile into output size and encoder settings.
+
+        Args:
+            quality: ``draft``, ``preview``, ``final`` or a profile from
+                ``video.quality.profiles`` (defaults to ``video.quality.profile``)
+
+        Returns:
+            ``quality``, output ``size`` as (width, height) and
+            ``write_options`` in ``write_videofile`` form
+        """
+        profile = resolve_quality(self.config, quality)
+        return {
+            "quality": profile["quality"],
+            "size": profile["size"],
+            "write_options": self.encoder_registry.write_options(
+                profile=profile["encoder_profile"],
+                fps=profile["fps"]
+            )
+        }
+
+    def _render_segments(
+        self,
+        riddle_segments: List[Dict],
+        segment_timings: List[Dict],
+        background_paths: List[str],
+        output_path: str,
+        settings: Dict,
+        chunks: bool = False
+    ) -> bool:
+        """Encode segments, or equal time slices with ``chunks``, in parallel and join them."""
+        segments = [
+            {"video_path": video_path, "text": segment.get("text", "")}
+            for segment, video_path in zip(riddle_segments, background_paths)
+        ]
+        durations = [timing["duration"] for timing in segment_timings]
+        audio_path = None
+        try:
+            # The join encodes the audio, so it is mixed to uncompressed PCM
+            audio_path = self._write_audio(riddle_segments, segment_timings, output_path, suffix=".wav")
+            render = self.segment_renderer.render_chunks if chunks else self.segment_renderer.render
+            render(
+                segments,
+                durations,
+                output_path,
+                settings["size"],
+                settings["write_options"],
+                audio_path=audio_path
+            )
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to render video segments: {str(e)}")
+            raise VideoCompositionError(f"Failed to render video: {str(e)}")
+
+        finally:
+            if audio_path and os.path.exists(audio_path):
+                os.remove(audio_path)
+
+    def _render_pipeline(
+        self,
+        riddle_segments: List[Dict],
+        segment_timings: List[Dict],
+        background_paths: List[str],
+        output_path: str,
+        settings: Dict
+    ) -> bool:
+        """Encode with decoding, per-frame work and encoding on separate threads."""
+        sources = []
+        audio_path = None
+        try:
+            for segment, timing, video_path in zip(riddle_segments, segment_timings, background_paths):
+                try:
+                    sources.append(self.segment_service.segment_frames(
+                        {"video_path": video_path, "text": segment.get("text", "")},
+                        {"duration": timing["duration"]},
+                        size=settings["size"],
+                        # Frames wait in queues, so every step makes new ones
+                        reuse_buffers=False
+                    ))
+                except Exception as e:
+                    self.logger.error(f"Failed to process segment {segment.get('id', '')}: {str(e)}")
+                    raise VideoCompositionError(f"Failed to process segment: {str(e)}")
+
+            audio_path = self._write_audio(riddle_segments, segment_timings, output_path)
+
+            with open(f"{output_path}.log", "w+") as logfile:
+                with span("video.encode", cat="encode", duration=sum(clip.duration for clip, _ in sources)):
+                    self.frame_pipeline.write(
+                        sources,
+                        output_path,
+                        settings["size"],
+                        settings["write_options"],
+                        audiofile=audio_path,
+                        logfile=logfile
+                    )
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to render video: {str(e)}")
+            raise VideoCompositionError(f"Failed to render video: {str(e)}")
+
+        finally:
+            for clip, _ in sources:
+                clip.close()
+            if audio_path and os.path.exists(audio_path):
+                os.remove(audio_path)
+
+    def _write_audio(
+        self,
+        riddle_segments: List[Dict],
+        segment_timings: List[Dict],
+        output_path: str,
+        suffix: str = ".m4a"
+    ) -> Optional[str]:
+        """Mix the audio track into a temporary file next to the output.
+
+        Args:
+            riddle_segments: Segments in playback order
+            segment_timings: Duration of every segment
+            output_path: Final video file
+            suffix: ``.m4a`` for AAC to mux in as it is, or ``.wav`` for
+                a mux that encodes the audio itself
+
+        Returns:
+            Path to the encoded audio, or None if the video has no audio
+        """
+        handle, audio_path = tempfile.mkstemp(
+            suffix=suffix,
+            prefix=f"{os.path.splitext(os.path.basename(output_path))[0]}.",
+            dir=os.path.dirname(output_path) or "."
+        )
+        os.close(handle)
+        duration = sum(timing["duration"] for timing in segment_timings)
+        try:
+            with span("audio.write", cat="audio", duration=duration):
+                # Padded with silence to the full video length
+                written = self.audio_composition.render_audio_file(
+                    riddle_segments,
+                    {timing["id"]: timing["duration"] for timing in segment_timings},
+                    audio_path,
+                    duration=duration
+                )
+        except Exception:
+            os.remove(audio_path)
+            raise
+        if written is None:
+            os.remove(audio_path)
+            return None
+        return audio_path
+
+    def _render_ffmpeg(
+        self,
+        riddle_segments: List[Dict],
+        segment_timings: List[Dict],
+        background_paths: List[str],
+        output_path: str,
+        settings: Dict
+    ) -> bool:
+        """Render the whole video with one ffmpeg filtergraph."""
+        try:
+            self.ffmpeg_renderer.render(
+                riddle_segments,
+                segment_timings,
+                background_paths,
+                output_path,
+                settings["write_options"],
+                size=settings["size"]
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to render video with ffmpeg: {str(e)}")
+            raise VideoCompositionError(f"Failed to render video: {str(e)}")
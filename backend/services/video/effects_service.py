@@ -1,9 +1,11 @@
 import logging
-from typing import Dict
+from typing import Dict, Optional, Tuple
 from moviepy.editor import VideoFileClip, vfx
 from config.exceptions import VideoEffectsError
 from services.video.base import VideoEffectsServiceBase
+from services.video.frame_transform import CoverCropTransform
 from utils.logger import log
+from utils.tracing import trace_frames, traced
 
 class VideoEffectsService(VideoEffectsServiceBase):
     def __init__(self, config: Dict = None, logger=None):
@@ -18,6 +20,7 @@ class VideoEffectsService(VideoEffectsServiceBase):
             "darken": self._darken
         }
 
+    @traced("effects.apply", cat="video")
     def apply_effect(self, clip: VideoFileClip, effect_type: str) -> VideoFileClip:
         try:
             effect_func = self.effects_map.get(effect_type.lower(), self._no_effect)
@@ -26,29 +29,56 @@ class VideoEffectsService(VideoEffectsServiceBase):
             self.logger.error(f"Failed to apply effect {effect_type}: {str(e)}")
             raise VideoEffectsError(f"Failed to apply effect {effect_type}: {str(e)}")
 
-    def standardize_video(self, clip: VideoFileClip, target_duration: float) -> VideoFileClip:
+    @traced("effects.standardize", cat="video")
+    def standardize_video(
+        self,
+        clip: VideoFileClip,
+        target_duration: float,
+        size: Optional[Tuple[int, int]] = None
+    ) -> VideoFileClip:
         try:
             # Resize video to target resolution
-            target_width = self.config.get("video", {}).get("resolution", {}).get("width", 1080)
-            target_height = self.config.get("video", {}).get("resolution", {}).get("height", 1920)
+            target_width, target_height = size or (
+                self.config.get("video", {}).get("resolution", {}).get("width", 1080),
+                self.config.get("video", {}).get("resolution", {}).get("height", 1920)
+            )
             
-            resized_clip = clip.resize(height=target_height, width=target_width)
+            transform = self.cover_transform(clip, (target_width, target_height))
+            if transform is None:
+                # Already scaled by the decoder
+                resized_clip = clip
+            else:
+                # Fill the frame without stretching, cropping the overflow
+                resized_clip = trace_frames(clip.fl_image(transform), "resize", "transform")
             
-            # Adjust duration
-            if resized_clip.duration < target_duration:
-                # Loop the video if it's too short
-                n_loops = int(target_duration / resized_clip.duration) + 1
-                resized_clip = resized_clip.loop(n=n_loops)
-            
-            # Cut to exact duration
-            final_clip = resized_clip.subclip(0, target_duration)
-            
-            return final_clip
+            return self.fit_duration(resized_clip, target_duration)
             
         except Exception as e:
             self.logger.error(f"Failed to standardize video: {str(e)}")
             raise VideoEffectsError(f"Failed to standardize video: {str(e)}")
 
+    def cover_transform(
+        self,
+        clip: VideoFileClip,
+        size: Tuple[int, int],
+        reuse_buffer: bool = True
+    ) -> Optional[CoverCropTransform]:
+        """Get the transform that fills ``size`` with the clip's frames.
+
+        Returns:
+            The cover crop transform, or None if the clip already has the size
+        """
+        if tuple(clip.size) == tuple(size):
+            return None
+        return CoverCropTransform(clip.size, size, reuse_buffer=reuse_buffer)
+
+    def fit_duration(self, clip: VideoFileClip, target_duration: float) -> VideoFileClip:
+        """Loop a clip if it is too short, then cut it to ``target_duration``."""
+        if clip.duration < target_duration:
+            n_loops = int(target_duration / clip.duration) + 1
+            clip = clip.loop(n=n_loops)
+        return clip.subclip(0, target_duration)
+
     def _no_effect(self, clip: VideoFileClip) -> VideoFileClip:
         return clip
 
@@ -0,0 +1,193 @@
+"""Encoder capability probing and speed/quality profiles"""
+
+import functools
+import logging
+import subprocess
+from typing import Dict, FrozenSet, List, Optional
+from moviepy.config import get_setting
+from config.exceptions import VideoCompositionError
+from utils.logger import log
+
+# Tried in order; hardware encoders first since they are the fastest where
+# they work, then the portable software encoders
+DEFAULT_CANDIDATES = (
+    "h264_videotoolbox",
+    "h264_nvenc",
+    "h264_qsv",
+    "libx264",
+    "libx265",
+    "libopenh264",
+    "mpeg4"
+)
+
+# Encoder settings per profile: an optional ``preset`` and extra ``params``.
+# Overridden per profile and encoder by ``video.encoder.profiles``.
+DEFAULT_PROFILES = {
+    "fast": {
+        "libx264": {"preset": "veryfast", "params": ["-crf", "23"]},
+        "libx265": {"preset": "ultrafast", "params": ["-crf", "28"]},
+        "h264_nvenc": {"preset": "p1", "params": ["-rc", "vbr", "-cq", "25"]},
+        "h264_qsv": {"preset": "veryfast", "params": ["-global_quality", "25"]},
+        "h264_videotoolbox": {"params": ["-b:v", "6000k", "-realtime", "1"]},
+        "libopenh264": {"params": ["-b:v", "6000k"]},
+        "mpeg4": {"params": ["-q:v", "5"]}
+    },
+    "balanced": {
+        "libx264": {"preset": "faster", "params": ["-crf", "21", "-maxrate", "10000k", "-bufsize", "20000k"]},
+        "libx265": {"preset": "fast", "params": ["-crf", "24"]},
+        "h264_nvenc": {"preset": "p4", "params": ["-rc", "vbr", "-cq", "21", "-maxrate", "10000k"]},
+        "h264_qsv": {"preset": "medium", "params": ["-global_quality", "21"]},
+        "h264_videotoolbox": {"params": ["-b:v", "8000k", "-maxrate", "10000k", "-bufsize", "20000k"]},
+        "libopenh264": {"params": ["-b:v", "8000k"]},
+        "mpeg4": {"params": ["-q:v", "3"]}
+    },
+    "quality": {
+        "libx264": {"preset": "slow", "params": ["-crf", "18"]},
+        "libx265": {"preset": "medium", "params": ["-crf", "20"]},
+        "h264_nvenc": {"preset": "p7", "params": ["-rc", "vbr", "-cq", "18"]},
+        "h264_qsv": {"preset": "slow", "params": ["-global_quality", "18"]},
+        "h264_videotoolbox": {"params": ["-b:v", "12000k"]},
+        "libopenh264": {"params": ["-b:v", "12000k"]},
+        "mpeg4": {"params": ["-q:v", "2"]}
+    }
+}
+
+# Container tags players expect for each codec family
+_CODEC_TAGS = {"264": "avc1", "265": "hvc1", "hevc": "hvc1"}
+
+
+@functools.lru_cache(maxsize=None)
+def available_encoders(ffmpeg: str) -> FrozenSet[str]:
+    """List the video encoders an ffmpeg build offers, once per process.
+
+    Args:
+        ffmpeg: Path to the ffmpeg binary
+
+    Returns:
+        Encoder names, empty if ffmpeg could not be run
+    """
+    try:
+        output = subprocess.run(
+            [ffmpeg, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+
+    encoders = set()
+    listing = False
+    for line in output.splitlines():
+        parts = line.split()
+        if not listing:
+            # The encoder table starts after a " ------" separator
+            listing = bool(parts) and set(parts[0]) == {"-"}
+            continue
+        if len(parts) >= 2 and parts[0].startswith("V"):
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+@functools.lru_cache(maxsize=None)
+def encoder_works(ffmpeg: str, codec: str) -> bool:
+    """Check that an encoder can actually encode, once per process.
+
+    Hardware encoders are often compiled in without the device or driver
+    they need, so being listed is not enough.
+    """
+    try:
+        subprocess.run(
+            [
+                ffmpeg, "-hide_banner", "-v", "error",
+                "-f", "lavfi", "-i", "color=black:size=256x256:rate=1:duration=1",
+                "-frames:v", "1", "-pix_fmt", "yuv420p", "-c:v", codec, "-f", "null", "-"
+            ],
+            capture_output=True,
+            check=True,
+            timeout=30
+        )
+        return True
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return False
+
+
+class EncoderRegistry:
+    """Picks the best working video encoder and its profile settings."""
+
+    def __init__(self, config: Dict = None, logger: logging.Logger = None):
+        self.config = config or {}
+        self.logger = logger or log
+
+        video_config = self.config.get("video", {})
+        encoder_config = video_config.get("encoder", {})
+        # An explicit codec is tried before the candidates
+        self.codec = video_config.get("codec")
+        self.candidates = list(encoder_config.get("candidates") or DEFAULT_CANDIDATES)
+        self.profile = encoder_config.get("profile", "balanced")
+        self.profiles = {name: dict(settings) for name, settings in DEFAULT_PROFILES.items()}
+        for name, settings in encoder_config.get("profiles", {}).items():
+            self.profiles.setdefault(name, {}).update(settings)
+        self.ffmpeg = get_setting("FFMPEG_BINARY")
+        self._selected: Optional[str] = None
+
+    def select_codec(self) -> str:
+        """Get the first candidate encoder that works here.
+
+        Raises:
+            VideoCompositionError: If no candidate encoder works
+        """
+        if self._selected is not None:
+            return self._selected
+
+        available = available_encoders(self.ffmpeg)
+        candidates = ([self.codec] if self.codec else []) + self.candidates
+        for codec in dict.fromkeys(candidates):
+            if codec in available and self._usable(codec):
+                if self.codec and codec != self.codec:
+                    self.logger.warning(f"Encoder {self.codec} is not available, falling back to {codec}")
+                self.logger.info(f"Using video encoder {codec}")
+                self._selected = codec
+                return codec
+
+        raise VideoCompositionError(
+            f"None of the video encoders {', '.join(dict.fromkeys(candidates))} work with {self.ffmpeg}"
+        )
+
+    def _usable(self, codec: str) -> bool:
+        """Software encoders work wherever they are listed; others are tried."""
+        if codec.startswith("lib") or codec == "mpeg4":
+            return True
+        return encoder_works(self.ffmpeg, codec)
+
+    def write_options(self, profile: Optional[str] = None, fps: int = 30) -> Dict:
+        """Get encoder settings in ``write_videofile`` form.
+
+        Args:
+            profile: Speed/quality profile (defaults to
+                ``video.encoder.profile``)
+            fps: Frame rate
+
+        Returns:
+            ``codec``, ``fps``, ``preset`` and ``ffmpeg_params``
+        """
+        profile = profile or self.profile
+        if profile not in self.profiles:
+            raise VideoCompositionError(f"Unknown encoder profile: {profile}")
+
+        codec = self.select_codec()
+        settings = self.profiles[profile].get(codec, {})
+        params: List[str] = list(settings.get("params", []))
+        params += ["-pix_fmt", "yuv420p"]
+        tag = next((tag for family, tag in _CODEC_TAGS.items() if family in codec), None)
+        if tag:
+            params += ["-tag:v", tag]  # Ensure compatibility
+        params += ["-movflags", "+faststart"]  # Enable streaming optimization
+
+        return {
+            "codec": codec,
+            "fps": fps,
+            # MoviePy always passes a preset; encoders without one ignore it
+            "preset": settings.get("preset", "medium"),
+            "ffmpeg_params": params
+        }
@@ -0,0 +1,202 @@
+"""Native ffmpeg filtergraph renderer"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from moviepy.config import get_setting
+from config.exceptions import VideoCompositionError
+from services.audio.composition_service import AudioCompositionService
+from services.video.frame_transform import cover_filter
+from services.video.segment_renderer import frame_aligned_durations
+from services.video.text_overlay_service import TextOverlayService
+from utils.logger import log
+from utils.tracing import span
+
+
+class FFmpegRenderer:
+    """Renders a whole video with a single ffmpeg ``filter_complex``.
+
+    Scaling, looping and trimming the backgrounds, overlaying the text,
+    joining the segments and mixing the audio all run inside ffmpeg, so no
+    frame passes through Python. Only the text overlays are drawn in Python,
+    once per segment, as transparent PNGs.
+    """
+
+    def __init__(
+        self,
+        text_overlay: TextOverlayService,
+        audio_composition: AudioCompositionService,
+        config: Dict = None,
+        logger: logging.Logger = None
+    ):
+        self.text_overlay = text_overlay
+        self.audio_composition = audio_composition
+        self.config = config or {}
+        self.logger = logger or log
+
+        video_config = self.config.get("video", {})
+        self.width = video_config.get("resolution", {}).get("width", 1080)
+        self.height = video_config.get("resolution", {}).get("height", 1920)
+        self.temp_dir = video_config.get("render", {}).get("temp_dir", "cache/render")
+        self.ffmpeg = get_setting("FFMPEG_BINARY")
+
+    def render(
+        self,
+        riddle_segments: List[Dict],
+        segment_timings: List[Dict],
+        background_paths: List[str],
+        output_path: str,
+        write_options: Dict,
+        size: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """Render the video in one ffmpeg run.
+
+        Args:
+            riddle_segments: Segments in playback order
+            segment_timings: Duration of every segment
+            background_paths: Background video of every segment
+            output_path: Final video file
+            write_options: Encoder settings in ``write_videofile`` form
+            size: Output size as (width, height), ``video.resolution`` if unset
+
+        Returns:
+            Path to the final video
+        """
+        os.makedirs(self.temp_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="ffmpeg_", dir=self.temp_dir)
+        try:
+            command = self.build_command(
+                riddle_segments,
+                segment_timings,
+                background_paths,
+                output_path,
+                write_options,
+                work_dir,
+                size=size
+            )
+            with span("video.encode", cat="encode", renderer="ffmpeg", segments=len(riddle_segments)):
+                subprocess.run(command, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"ffmpeg render failed: {e.stderr.strip()}")
+            raise VideoCompositionError(f"ffmpeg render failed: {e.stderr.strip()}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return output_path
+
+    def build_command(
+        self,
+        riddle_segments: List[Dict],
+        segment_timings: List[Dict],
+        background_paths: List[str],
+        output_path: str,
+        write_options: Dict,
+        work_dir: str,
+        size: Optional[Tuple[int, int]] = None
+    ) -> List[str]:
+        """Compile the segments and timings into an ffmpeg command line.
+
+        Text overlays are written to ``work_dir`` as PNGs, which must
+        exist until the command has run.
+
+        Args:
+            riddle_segments: Segments in playback order
+            segment_timings: Duration of every segment
+            background_paths: Background video of every segment
+            output_path: Final video file
+            write_options: Encoder settings in ``write_videofile`` form
+            work_dir: Directory for the text overlay images
+            size: Output size as (width, height), ``video.resolution`` if unset
+
+        Returns:
+            The ffmpeg command
+        """
+        width, height = size or (self.width, self.height)
+        fps = write_options["fps"]
+        durations = frame_aligned_durations([timing["duration"] for timing in segment_timings], fps)
+
+        inputs: List[List[str]] = []
+        filters = []
+        segment_labels = []
+
+        def add_input(*args: str) -> int:
+            inputs.append(list(args))
+            return len(inputs) - 1
+
+        for index, (segment, duration, video_path) in enumerate(zip(riddle_segments, durations, background_paths)):
+            # Backgrounds loop forever and are cut to length by trim; they
+            # are scaled to cover the frame and the overflow is cropped
+            video_input = add_input("-stream_loop", "-1", "-i", video_path)
+            frames = round(duration * fps)
+            filters.append(
+                f"[{video_input}:v]{cover_filter(width, height)},setsar=1,fps={fps},"
+                f"trim=end_frame={frames},setpts=PTS-STARTPTS[bg{index}]"
+            )
+
+            label = f"bg{index}"
+            text = segment.get("text")
+            patch = None
+            if text:
+                with span("overlay.raster", cat="overlay"):
+                    patch = self.text_overlay.render_text_patch(text, width, height)
+            if patch is not None:
+                # Only the text's bounding box is blended
+                image, (left, top) = patch
+                image_path = os.path.join(work_dir, f"text_{index:03d}.png")
+                image.save(image_path)
+                text_input = add_input("-i", image_path)
+                filters.append(f"[{label}][{text_input}:v]overlay={left}:{top}:format=auto[v{index}]")
+                label = f"v{index}"
+            segment_labels.append(f"[{label}]")
+
+        filters.append(f"{''.join(segment_labels)}concat=n={len(segment_labels)}:v=1:a=0[vout]")
+
+        # Audio tracks are delayed to their start and summed without
+        # normalization, like MoviePy's CompositeAudioClip
+        tracks = self.audio_composition.audio_tracks(
+            riddle_segments,
+            {timing["id"]: timing["duration"] for timing in segment_timings}
+        )
+        audio_labels = []
+        for index, track in enumerate(tracks):
+            if track.get("duration") is not None:
+                audio_input = add_input("-stream_loop", "-1", "-i", track["path"])
+                trim = f"atrim=duration={track['duration']:.6f},"
+            else:
+                audio_input = add_input("-i", track["path"])
+                trim = ""
+            delay = round(track["start"] * 1000)
+            filters.append(
+                f"[{audio_input}:a]{trim}volume={track['volume']},"
+                f"adelay=delays={delay}:all=1[a{index}]"
+            )
+            audio_labels.append(f"[a{index}]")
+
+        if audio_labels:
+            filters.append(
+                f"{''.join(audio_labels)}amix=inputs={len(audio_labels)}:normalize=0:duration=longest,"
+                f"apad,atrim=duration={sum(durations):.6f}[aout]"
+            )
+
+        command = [self.ffmpeg, "-y", "-v", "error"]
+        for args in inputs:
+            command += args
+        command += ["-filter_complex", ";".join(filters), "-map", "[vout]"]
+        if audio_labels:
+            command += ["-map", "[aout]", "-c:a", "aac", "-ar", "44100", "-ac", "2"]
+        command += self._encoder_args(write_options)
+        command.append(output_path)
+        return command
+
+    def _encoder_args(self, write_options: Dict) -> List[str]:
+        """Translate ``write_videofile`` settings into ffmpeg arguments."""
+        args = ["-c:v", write_options["codec"]]
+        if write_options.get("preset"):
+            args += ["-preset", write_options["preset"]]
+        if write_options.get("threads"):
+            args += ["-threads", str(write_options["threads"])]
+        args += ["-r", str(write_options["fps"])]
+        return args + list(write_options.get("ffmpeg_params", []))
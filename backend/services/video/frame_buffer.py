@@ -0,0 +1,94 @@
+"""In-memory decoded frames of short background clips"""
+
+import logging
+from typing import Dict, Hashable, Optional, Tuple
+import numpy as np
+from moviepy.editor import VideoClip
+from utils.cache import MemoryCache
+from utils.logger import log
+
+
+class FrameBuffer:
+    """Keeps the decoded frames of short clips in memory, within a budget.
+
+    Short backgrounds are looped to fill longer segments and are often
+    reused by several segments of a video. Decoding them once into a
+    contiguous uint8 array, at the output size, and serving the frames
+    cyclically replaces the reader's repeated seeks and decodes. Buffers
+    are read-only and evicted least recently used first once their total
+    size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, config: Dict = None, logger: logging.Logger = None):
+        self.config = config or {}
+        self.logger = logger or log
+
+        buffer_config = self.config.get("video", {}).get("frame_buffer", {})
+        self.enabled = buffer_config.get("enabled", True)
+        self.max_bytes = buffer_config.get("max_bytes", 1024 * 1024 * 1024)
+        self.max_clip_bytes = buffer_config.get("max_clip_bytes", 512 * 1024 * 1024)
+        self.max_duration = buffer_config.get("max_duration", 6)
+
+        # Entries are (frames, fps)
+        self._entries = MemoryCache(self.max_bytes, lambda entry: entry[0].nbytes)
+
+    @property
+    def size(self) -> int:
+        """Bytes of frames held."""
+        return self._entries.size
+
+    def accepts(self, duration: float, fps: float, width: int, height: int) -> bool:
+        """Check whether a clip is short and small enough to buffer."""
+        if not self.enabled or duration > self.max_duration:
+            return False
+        frame_bytes = self.frame_count(duration, fps) * width * height * 3
+        return frame_bytes <= min(self.max_clip_bytes, self.max_bytes)
+
+    @staticmethod
+    def frame_count(duration: float, fps: float) -> int:
+        """Number of frames MoviePy produces for a clip, as in ``iter_frames``."""
+        return len(np.arange(0, duration, 1.0 / fps))
+
+    def get(self, key: Hashable) -> Optional[Tuple[np.ndarray, float]]:
+        """Get buffered frames and their frame rate, marking them recently used."""
+        return self._entries.get(key)
+
+    def put(self, key: Hashable, frames: np.ndarray, fps: float) -> np.ndarray:
+        """Store frames, evicting the least recently used ones to stay in budget.
+
+        Frames larger than the whole budget are returned without being kept.
+
+        Returns:
+            The frames, made read-only
+        """
+        frames.setflags(write=False)
+        self._entries.put(key, (frames, fps))
+        return frames
+
+    @staticmethod
+    def decode(clip: VideoClip, fps: float) -> np.ndarray:
+        """Decode every frame of a clip into one contiguous array."""
+        count = FrameBuffer.frame_count(clip.duration, fps)
+        frames = np.empty((count, clip.h, clip.w, 3), dtype=np.uint8)
+        for index, frame in enumerate(clip.iter_frames(fps=fps, dtype="uint8")):
+            if index == count:
+                break
+            # Copies out of buffers the frame source may reuse
+            frames[index] = frame[:, :, :3]
+        return frames
+
+    @staticmethod
+    def looped_clip(frames: np.ndarray, fps: float, duration: float) -> VideoClip:
+        """Play buffered frames in a loop for ``duration`` seconds."""
+        count = len(frames)
+
+        def make_frame(t: float) -> np.ndarray:
+            return frames[int(t * fps + 1e-6) % count]
+
+        clip = VideoClip(make_frame, duration=duration)
+        clip.fps = fps
+        return clip
+
+    def cleanup(self) -> None:
+        """Drop every buffer."""
+        self._entries.clear()
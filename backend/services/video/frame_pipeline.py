@@ -0,0 +1,252 @@
+"""Threaded decode, transform and encode of segment frames"""
+
+import contextvars
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+import numpy as np
+from moviepy.editor import VideoClip
+from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+from services.video.frame_ring import FrameRing
+from services.video.frame_transform import FrameStep
+from utils.logger import log
+from utils.tracing import current_tracer, span
+
+# Marks the end of the frames handed to the encoder
+_DONE = object()
+
+
+class FramePipeline:
+    """Encodes segments with decoding, per-frame work and encoding overlapped.
+
+    MoviePy's ``write_videofile`` makes one frame at a time on one thread:
+    decode the background, scale it, draw the text, then hand it to ffmpeg.
+    Here decoder threads read the segments' source frames, a pool of
+    workers runs each segment's per-frame steps, and the calling thread
+    writes the results to the encoder. The stages are connected by bounded
+    queues that keep the frames in order. Decoding, cv2, NumPy and pipe
+    writes release the GIL, so the stages run on separate cores.
+
+    Workers composite each frame straight into a slot of a ``FrameRing``,
+    and the encoder writes the slot to ffmpeg's stdin through a
+    ``memoryview``, so a frame is not copied or allocated again between
+    compositing and encoding.
+
+    Frames are taken at the same times as MoviePy takes them from the
+    concatenated segments, so the output matches ``write_videofile``.
+    """
+
+    def __init__(self, config: Dict = None, logger: logging.Logger = None):
+        self.config = config or {}
+        self.logger = logger or log
+
+        pipeline_config = self.config.get("video", {}).get("render", {}).get("pipeline", {})
+        self.enabled = pipeline_config.get("enabled", True)
+        self.decoders = int(pipeline_config.get("decoders") or 2)
+        self.workers = int(pipeline_config.get("workers") or os.cpu_count() or 1)
+        self.queue_size = int(pipeline_config.get("queue_size") or 8)
+
+    @staticmethod
+    def frame_times(durations: Sequence[float], fps: float) -> List[List[float]]:
+        """Get the frame times of every segment of a concatenation.
+
+        Args:
+            durations: Segment durations in playback order
+            fps: Output frame rate
+
+        Returns:
+            Times within each segment, as MoviePy renders the concatenation
+        """
+        starts = np.cumsum([0.0] + list(durations))
+        times: List[List[float]] = [[] for _ in durations]
+        for t in np.arange(0, starts[-1], 1.0 / fps):
+            index = min(int(np.searchsorted(starts, t, side="right")) - 1, len(durations) - 1)
+            times[index].append(t - starts[index])
+        return times
+
+    def write(
+        self,
+        segments: List[Tuple[VideoClip, List[FrameStep]]],
+        output_path: str,
+        size: Tuple[int, int],
+        write_options: Dict,
+        audiofile: Optional[str] = None,
+        logfile: Optional[TextIO] = None,
+        times: Optional[List[List[float]]] = None
+    ) -> int:
+        """Encode segments one after another into a video file.
+
+        Args:
+            segments: Source clip and per-frame steps of every segment, as
+                from ``SegmentService.segment_frames`` without reused buffers
+            output_path: Video file to write
+            size: Output frame size as (width, height)
+            write_options: ``write_videofile`` encoder settings
+            audiofile: Optional encoded audio to mux in as it is
+            logfile: Optional file for the encoder's log
+            times: Frame times within each segment, to encode only part of
+                a timeline (defaults to ``frame_times`` of all segments)
+
+        Returns:
+            Number of frames written
+        """
+        fps = write_options["fps"]
+        if times is None:
+            times = self.frame_times([clip.duration for clip, _ in segments], fps)
+        tracer = current_tracer()
+        if tracer is not None:
+            segments = [
+                (clip, [step._replace(apply=tracer.wrap(step.apply, step.name, step.cat)) for step in steps])
+                for clip, steps in segments
+            ]
+
+        stop = threading.Event()
+        # Frames queued for the encoder, plus the one it is writing and the
+        # one the dispatcher is waiting to queue
+        ring = FrameRing(self.queue_size + 2, (size[1], size[0], 3))
+        decoded = [queue.Queue(maxsize=self.queue_size) for _ in segments]
+        transformed: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        decode_pool = ThreadPoolExecutor(max_workers=self.decoders, thread_name_prefix="decode")
+        transform_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="transform")
+        dispatcher = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._dispatch, segments, times, decoded, transformed, transform_pool, ring, stop),
+            name="dispatch",
+            daemon=True
+        )
+
+        writer = FFMPEG_VideoWriter(
+            output_path,
+            size,
+            fps,
+            codec=write_options.get("codec", "libx264"),
+            audiofile=audiofile,
+            preset=write_options.get("preset", "medium"),
+            bitrate=write_options.get("bitrate"),
+            logfile=logfile,
+            threads=write_options.get("threads"),
+            ffmpeg_params=write_options.get("ffmpeg_params")
+        )
+        write_frame = self._write_frame
+        if tracer is not None:
+            write_frame = tracer.wrap(write_frame, "encode", "encode")
+
+        written = 0
+        try:
+            # Segments decode in playback order, at most ``decoders`` at once
+            for (clip, _), segment_times, frames in zip(segments, times, decoded):
+                decode_pool.submit(contextvars.copy_context().run, self._decode, clip, segment_times, frames, stop)
+            dispatcher.start()
+
+            with span("pipeline.encode", cat="encode", frames=sum(len(t) for t in times)):
+                while True:
+                    item = transformed.get()
+                    if item is _DONE:
+                        break
+                    slot, future = item
+                    write_frame(writer, future.result())
+                    if slot is not None:
+                        ring.release(slot)
+                    written += 1
+        finally:
+            stop.set()
+            if dispatcher.is_alive():
+                dispatcher.join()
+            transform_pool.shutdown(wait=True, cancel_futures=True)
+            decode_pool.shutdown(wait=True, cancel_futures=True)
+            writer.close()
+        return written
+
+    def _decode(self, clip: VideoClip, times: List[float], frames: queue.Queue, stop: threading.Event) -> None:
+        """Read a segment's source frames in order into its queue."""
+        try:
+            for t in times:
+                if not self._put(frames, clip.get_frame(t), stop):
+                    return
+        except Exception as e:
+            self._put(frames, e, stop)
+
+    def _dispatch(
+        self,
+        segments: List[Tuple[VideoClip, List[FrameStep]]],
+        times: List[List[float]],
+        decoded: List[queue.Queue],
+        transformed: queue.Queue,
+        transform_pool: ThreadPoolExecutor,
+        ring: FrameRing,
+        stop: threading.Event
+    ) -> None:
+        """Hand decoded frames to the workers, queueing the results in order."""
+        try:
+            for (_, steps), segment_times, frames in zip(segments, times, decoded):
+                for _ in segment_times:
+                    frame = self._get(frames, stop)
+                    if frame is None:
+                        return
+                    if isinstance(frame, Exception):
+                        raise frame
+                    if not steps and self._writable(frame):
+                        # Nothing to composite, so the source frame is piped as it is
+                        done: Future = Future()
+                        done.set_result(frame)
+                        item = (None, done)
+                    else:
+                        slot = ring.acquire(stop)
+                        if slot is None:
+                            return
+                        item = (slot, transform_pool.submit(self._transform, frame, steps, ring.slots[slot]))
+                    if not self._put(transformed, item, stop):
+                        return
+        except Exception as e:
+            failed: Future = Future()
+            failed.set_exception(e)
+            self._put(transformed, (None, failed), stop)
+        self._put(transformed, _DONE, stop)
+
+    @staticmethod
+    def _transform(frame: np.ndarray, steps: List[FrameStep], out: np.ndarray) -> np.ndarray:
+        """Run a segment's steps on one frame, leaving the result in ``out``."""
+        for step in steps:
+            frame = step.apply(frame, out=out)
+        if frame is not out:
+            np.copyto(out, frame, casting="unsafe")
+        return out
+
+    @staticmethod
+    def _writable(frame: np.ndarray) -> bool:
+        """Check that a frame can be piped to the encoder without a copy."""
+        return frame.dtype == np.uint8 and frame.ndim == 3 and frame.shape[2] == 3 and frame.flags.c_contiguous
+
+    @staticmethod
+    def _write_frame(writer: FFMPEG_VideoWriter, frame: np.ndarray) -> None:
+        """Write a frame to the encoder's stdin without copying it to bytes."""
+        try:
+            writer.proc.stdin.write(memoryview(frame))
+        except OSError as e:
+            _, error = writer.proc.communicate()
+            details = error.decode(errors="replace").strip() if error else "see the encoder log"
+            raise OSError(f"ffmpeg failed to encode {writer.filename}: {details}") from e
+
+    @staticmethod
+    def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+        """Put an item, giving up once the pipeline stops."""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source: queue.Queue, stop: threading.Event):
+        """Get an item, or None once the pipeline stops."""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
@@ -0,0 +1,44 @@
+"""Preallocated frame slots reused by the frame pipeline"""
+
+import queue
+import threading
+from typing import List, Optional, Tuple
+import numpy as np
+
+
+class FrameRing:
+    """A fixed set of frame-sized slots that are handed out and returned.
+
+    Compositing writes each frame straight into a free slot, and the
+    encoder pipes the slot to ffmpeg and returns it, so no frame is
+    allocated or copied again between compositing and encoding.
+    """
+
+    def __init__(self, count: int, shape: Tuple[int, ...]):
+        """Initialize the ring
+
+        Args:
+            count: Number of slots, the most frames in flight at once
+            shape: Frame shape as (height, width, channels)
+        """
+        self.slots: List[np.ndarray] = [np.empty(shape, dtype=np.uint8) for _ in range(count)]
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for index in range(count):
+            self._free.put(index)
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> Optional[int]:
+        """Wait for a free slot.
+
+        Returns:
+            Index of the slot, or None if ``stop`` was set while waiting
+        """
+        while stop is None or not stop.is_set():
+            try:
+                return self._free.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def release(self, index: int) -> None:
+        """Return a slot once its frame has been used."""
+        self._free.put(index)
@@ -0,0 +1,107 @@
+"""Aspect-preserving cover scaling and cropping of video frames"""
+
+import math
+from typing import Callable, NamedTuple, Optional, Tuple
+import cv2
+import numpy as np
+
+# Interpolation of cover scaling when shrinking and when enlarging frames;
+# INTER_AREA averages source pixels, which avoids aliasing when shrinking
+COVER_INTERPOLATION = {"shrink": cv2.INTER_AREA, "enlarge": cv2.INTER_LINEAR}
+
+
+class FrameStep(NamedTuple):
+    """A per-frame function of a segment, with the span it is traced as.
+
+    ``apply(frame, out=None)`` returns the processed frame. Given ``out``,
+    a frame-sized uint8 array that may be ``frame`` itself, it writes the
+    result there instead of allocating one.
+    """
+
+    name: str
+    cat: str
+    apply: Callable[..., np.ndarray]
+
+
+def cover_size(source_size: Tuple[int, int], target_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Get the smallest size with the source's aspect ratio that covers the target.
+
+    Args:
+        source_size: Frame size as (width, height)
+        target_size: Size to fill as (width, height)
+
+    Returns:
+        Scaled size as (width, height), at least the target in both dimensions
+    """
+    source_width, source_height = source_size
+    target_width, target_height = target_size
+    scale = max(target_width / source_width, target_height / source_height)
+    return (
+        max(target_width, math.ceil(source_width * scale - 1e-6)),
+        max(target_height, math.ceil(source_height * scale - 1e-6))
+    )
+
+
+def cover_filter(width: int, height: int) -> str:
+    """Get the ffmpeg filters that do the same cover scale and center crop."""
+    return f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height}"
+
+
+class CoverCropTransform:
+    """Scales frames to fill a target size, cropping the overflow evenly.
+
+    The centered crop window and interpolation are worked out once per
+    clip, and frames are resized with ``cv2.resize`` into one output buffer
+    that is reused for every frame. A frame is therefore only valid until
+    the next call, unless ``reuse_buffer`` is off, as it must be when
+    several threads share the transform. Frames that already have the
+    covering size are only sliced, without a copy.
+    """
+
+    def __init__(
+        self,
+        source_size: Tuple[int, int],
+        target_size: Tuple[int, int],
+        reuse_buffer: bool = True
+    ):
+        """Initialize the transform
+
+        Args:
+            source_size: Size of the incoming frames as (width, height)
+            target_size: Output frame size as (width, height)
+            reuse_buffer: Resize every frame into the same buffer
+        """
+        source_width, source_height = source_size
+        self.target_width, self.target_height = target_size
+
+        # Crop the source to the target aspect ratio, then scale the crop
+        scale = max(self.target_width / source_width, self.target_height / source_height)
+        crop_width = min(source_width, round(self.target_width / scale))
+        crop_height = min(source_height, round(self.target_height / scale))
+        left = (source_width - crop_width) // 2
+        top = (source_height - crop_height) // 2
+        self.window = (slice(top, top + crop_height), slice(left, left + crop_width))
+        self.needs_resize = (crop_width, crop_height) != (self.target_width, self.target_height)
+        self.interpolation = COVER_INTERPOLATION["shrink" if scale < 1 else "enlarge"]
+        self.reuse_buffer = reuse_buffer
+        self._buffer: Optional[np.ndarray] = None
+
+    def __call__(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        cropped = frame[self.window]
+        if not self.needs_resize:
+            if out is None:
+                return cropped
+            np.copyto(out, cropped)
+            return out
+
+        if out is None and self.reuse_buffer:
+            shape = (self.target_height, self.target_width) + frame.shape[2:]
+            if self._buffer is None or self._buffer.shape != shape or self._buffer.dtype != frame.dtype:
+                self._buffer = np.empty(shape, dtype=frame.dtype)
+            out = self._buffer
+        return cv2.resize(
+            cropped,
+            (self.target_width, self.target_height),
+            dst=out,
+            interpolation=self.interpolation
+        )
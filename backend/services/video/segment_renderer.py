@@ -0,0 +1,531 @@
+"""Parallel per-segment rendering joined by ffmpeg stream copy"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from moviepy.config import get_setting
+from config.exceptions import VideoCompositionError
+from services.video.frame_pipeline import FramePipeline
+from services.video.frame_transform import COVER_INTERPOLATION
+from services.video.segment_service import DECODE_RESIZE_ALGORITHM, SegmentService
+from utils.cache import CacheManager
+from utils.logger import log
+from utils.tracing import span
+
+# Segment service and frame pipeline owned by each pool process
+_process_segment_service: Optional[SegmentService] = None
+_process_frame_pipeline: Optional[FramePipeline] = None
+
+
+def _init_render_process(config: Dict) -> None:
+    """Build the per-process services when a pool process starts."""
+    global _process_segment_service, _process_frame_pipeline
+    from core.service_factory import ServiceFactory
+
+    # Let the parent decide how to shut down on Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    factory = ServiceFactory(config)
+    _process_segment_service = factory.get_segment_service()
+    _process_frame_pipeline = factory.get_frame_pipeline()
+
+
+def _render_segment_in_process(
+    segment: Dict,
+    duration: float,
+    output_path: str,
+    size: Tuple[int, int],
+    write_options: Dict
+) -> str:
+    """Render one segment with the process's segment service."""
+    return render_segment_file(
+        _process_segment_service,
+        segment,
+        duration,
+        output_path,
+        size,
+        write_options
+    )
+
+
+def _render_chunk_in_process(
+    segments: List[Dict],
+    durations: List[float],
+    frames: Tuple[int, int],
+    output_path: str,
+    size: Tuple[int, int],
+    write_options: Dict
+) -> str:
+    """Render one time chunk with the process's services."""
+    return render_chunk_file(
+        _process_segment_service,
+        _process_frame_pipeline,
+        segments,
+        durations,
+        frames,
+        output_path,
+        size,
+        write_options
+    )
+
+
+def render_segment_file(
+    segment_service: SegmentService,
+    segment: Dict,
+    duration: float,
+    output_path: str,
+    size: Tuple[int, int],
+    write_options: Dict
+) -> str:
+    """Render a single segment, without audio, to its own video file.
+
+    Args:
+        segment_service: Service that builds the segment clip
+        segment: Segment with ``video_path`` and ``text``
+        duration: Segment duration in seconds, a whole number of frames
+        output_path: Intermediate video file to write
+        size: Output size as (width, height)
+        write_options: ``write_videofile`` encoder settings, identical for
+            every segment so the files can be joined without re-encoding
+
+    Returns:
+        Path to the written file
+    """
+    clip = segment_service.process_segment(segment, {"duration": duration}, size=size)
+    try:
+        # Half a frame short, so MoviePy's frame times (np.arange) come out
+        # at exactly duration * fps frames instead of one more or less
+        clip = clip.set_duration(duration - 0.5 / write_options["fps"])
+        clip.write_videofile(
+            output_path,
+            audio=False,
+            logger=None,
+            **write_options
+        )
+    finally:
+        clip.close()
+    return output_path
+
+
+def render_chunk_file(
+    segment_service: SegmentService,
+    frame_pipeline: FramePipeline,
+    segments: List[Dict],
+    durations: List[float],
+    frames: Tuple[int, int],
+    output_path: str,
+    size: Tuple[int, int],
+    write_options: Dict
+) -> str:
+    """Render a range of frames of the whole timeline, without audio.
+
+    Frames are taken at the same times as a render of the whole timeline
+    takes them, so the chunks join into the same video.
+
+    Args:
+        segment_service: Service that splits segments into frames and steps
+        frame_pipeline: Pipeline that encodes the frames
+        segments: Every segment of the video, with ``video_path`` and ``text``
+        durations: Every segment's duration in seconds
+        frames: First frame of the chunk and the frame after its last one
+        output_path: Intermediate video file to write
+        size: Output size as (width, height)
+        write_options: ``write_videofile`` encoder settings, identical for
+            every chunk so the files can be joined without re-encoding
+
+    Returns:
+        Path to the written file
+    """
+    first, end = frames
+    sources = []
+    chunk_times = []
+    start = 0
+    try:
+        for segment, duration, times in zip(
+            segments, durations, FramePipeline.frame_times(durations, write_options["fps"])
+        ):
+            selected = times[max(first - start, 0):max(end - start, 0)]
+            start += len(times)
+            if not selected:
+                continue
+            sources.append(segment_service.segment_frames(
+                segment,
+                {"duration": duration},
+                size=size,
+                reuse_buffers=False
+            ))
+            chunk_times.append(selected)
+        frame_pipeline.write(sources, output_path, size, write_options, times=chunk_times)
+    finally:
+        for clip, _ in sources:
+            clip.close()
+    return output_path
+
+
+def chunk_ranges(frame_count: int, chunks: int, gop: int) -> List[Tuple[int, int]]:
+    """Split a timeline into nearly equal frame ranges that start on GOP boundaries.
+
+    Args:
+        frame_count: Frames in the whole video
+        chunks: Number of ranges wanted; fewer are made for short videos
+        gop: Frames from one keyframe to the next
+
+    Returns:
+        (first, end) frame of every range, covering the video in order
+    """
+    gops = -(-frame_count // gop)
+    chunks = max(1, min(chunks, gops))
+    bounds = [round(gops * index / chunks) * gop for index in range(chunks)] + [frame_count]
+    return list(zip(bounds, bounds[1:]))
+
+
+def keyframe_options(write_options: Dict, gop: int) -> Dict:
+    """Add a fixed keyframe interval to encoder settings.
+
+    Keyframes are forced on every ``gop``-th frame, so chunks that start on
+    a GOP boundary put their keyframes where one encode of the whole video
+    would.
+    """
+    params = list(write_options.get("ffmpeg_params") or [])
+    params += ["-g", str(gop), "-force_key_frames", f"expr:eq(mod(n,{gop}),0)"]
+    return dict(write_options, ffmpeg_params=params)
+
+
+@functools.lru_cache(maxsize=256)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    """Hash a file's contents; size and mtime invalidate the memoized hash."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """Get the content hash of a file, computed once per file version."""
+    stat = os.stat(path)
+    return _file_digest(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def segment_cache_key(
+    segment: Dict,
+    duration: float,
+    size: Tuple[int, int],
+    write_options: Dict,
+    config: Dict
+) -> str:
+    """Build the content address of a rendered segment.
+
+    Covers everything that changes the encoded frames: the background
+    clip's contents, the text and its font settings, effects, the exact
+    duration, the output size, the encoder settings, and how backgrounds
+    are normalized, decoded, buffered and scaled to cover the frame.
+    """
+    video_config = config.get("video", {})
+    params = {
+        "background": file_digest(segment["video_path"]),
+        "text": segment.get("text", ""),
+        "effects": segment.get("effects"),
+        "duration": round(duration, 6),
+        "size": list(size),
+        "write_options": write_options,
+        "text_config": config.get("text", {}),
+        # Font sizes are relative to the configured resolution
+        "resolution": video_config.get("resolution", {}),
+        "effects_config": video_config.get("effects", {}),
+        "normalize": video_config.get("normalize", {}),
+        "frame_buffer": video_config.get("frame_buffer", {}),
+        "transform": {
+            "fit": "cover",
+            "decode_resize": DECODE_RESIZE_ALGORITHM,
+            "interpolation": COVER_INTERPOLATION
+        }
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def frame_aligned_durations(durations: List[float], fps: float) -> List[float]:
+    """Round segment durations to whole frames without drifting.
+
+    Segment boundaries are rounded on the cumulative timeline, so the
+    joined video never ends up more than half a frame off the audio.
+    """
+    aligned = []
+    elapsed = 0.0
+    previous_frame = 0
+    for duration in durations:
+        elapsed += duration
+        frame = max(previous_frame + 1, round(elapsed * fps))
+        aligned.append((frame - previous_frame) / fps)
+        previous_frame = frame
+    return aligned
+
+
+class SegmentRenderer:
+    """Renders segments to intermediate files on a process pool and joins them.
+
+    Each segment is encoded separately with the same encoder settings, so
+    the files are joined with ffmpeg's concat demuxer and stream copy, and
+    the audio is muxed in during the same pass. Frame generation, which is
+    single threaded in MoviePy, then runs on as many cores as there are
+    segments. Encoded segments are cached by content, so segments that
+    recur across videos, like hooks and calls to action, are spliced in
+    without rendering them again. ``render_chunks`` splits the video by
+    time instead of by segment.
+    """
+
+    def __init__(
+        self,
+        segment_service: SegmentService,
+        config: Dict = None,
+        logger: logging.Logger = None,
+        frame_pipeline: Optional[FramePipeline] = None
+    ):
+        self.segment_service = segment_service
+        self.config = config or {}
+        self.logger = logger or log
+        self.frame_pipeline = frame_pipeline or FramePipeline(self.config, self.logger)
+
+        render_config = self.config.get("video", {}).get("render", {})
+        self.workers = int(render_config.get("workers") or os.cpu_count() or 1)
+        self.temp_dir = render_config.get("temp_dir", "cache/render")
+        chunks_config = render_config.get("chunks", {})
+        self.chunks = int(chunks_config.get("count") or self.workers)
+        self.keyframe_interval = chunks_config.get("keyframe_interval", 2.0)
+        cache_config = render_config.get("segment_cache", {})
+        self.cache_enabled = cache_config.get("enabled", True)
+        self.cache_dir = cache_config.get("dir", "cache/segments")
+        self.cache_max_size = cache_config.get("max_size", 2 * 1024 * 1024 * 1024)
+        self.ffmpeg = get_setting("FFMPEG_BINARY")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: Optional[CacheManager] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Process pool, started on first use and kept for later renders."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_render_process,
+                initargs=(self.config,)
+            )
+        return self._pool
+
+    @property
+    def cache(self) -> CacheManager:
+        """Rendered segment cache, opened on first use."""
+        if self._cache is None:
+            self._cache = CacheManager(self.cache_dir, max_size=self.cache_max_size)
+        return self._cache
+
+    def cached_segment(self, key: str) -> Optional[str]:
+        """Get a rendered segment from the cache, marking it recently used."""
+        path = self.cache.get(key)
+        if path:
+            # Cleanup evicts the oldest files first, so this makes it LRU
+            os.utime(path)
+        return path
+
+    def render(
+        self,
+        segments: List[Dict],
+        durations: List[float],
+        output_path: str,
+        size: Tuple[int, int],
+        write_options: Dict,
+        audio_path: Optional[str] = None
+    ) -> str:
+        """Render every segment, then join them and mux in the audio.
+
+        Args:
+            segments: Segments with ``video_path`` and ``text``
+            durations: Segment durations in seconds
+            output_path: Final video file
+            size: Output size as (width, height)
+            write_options: ``write_videofile`` encoder settings
+            audio_path: Optional audio track for the whole video
+
+        Returns:
+            Path to the final video
+        """
+        durations = frame_aligned_durations(durations, write_options["fps"])
+        os.makedirs(self.temp_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="segments_", dir=self.temp_dir)
+        try:
+            paths = []
+            pending = []
+            for index, (segment, duration) in enumerate(zip(segments, durations)):
+                key = None
+                if self.cache_enabled:
+                    key = segment_cache_key(segment, duration, size, write_options, self.config)
+                    cached_path = self.cached_segment(key)
+                    if cached_path:
+                        paths.append(cached_path)
+                        continue
+                path = os.path.join(work_dir, f"segment_{index:03d}.mp4")
+                paths.append(path)
+                pending.append((segment, duration, path, key))
+
+            if len(pending) < len(segments):
+                self.logger.info(f"Reusing {len(segments) - len(pending)}/{len(segments)} cached segments")
+
+            with span("video.render_segments", cat="video", segments=len(pending), workers=self.workers):
+                if self.workers > 1 and len(pending) > 1:
+                    futures = [
+                        self.pool.submit(
+                            _render_segment_in_process,
+                            segment,
+                            duration,
+                            path,
+                            size,
+                            write_options
+                        )
+                        for segment, duration, path, _ in pending
+                    ]
+                    for future in futures:
+                        future.result()
+                else:
+                    for segment, duration, path, _ in pending:
+                        render_segment_file(
+                            self.segment_service,
+                            segment,
+                            duration,
+                            path,
+                            size,
+                            write_options
+                        )
+
+            for _, _, path, key in pending:
+                if key:
+                    self.cache.put(key, path)
+
+            return self.concat(paths, output_path, audio_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def render_chunks(
+        self,
+        segments: List[Dict],
+        durations: List[float],
+        output_path: str,
+        size: Tuple[int, int],
+        write_options: Dict,
+        audio_path: Optional[str] = None
+    ) -> str:
+        """Render equal time slices of the video in parallel, then join them.
+
+        ``render`` can go no faster than its longest segment. Here the
+        timeline is cut into ``chunks.count`` slices of nearly the same
+        length, so the wall time follows the number of workers rather
+        than the longest segment. Slices start on keyframes at a fixed
+        interval, so they join with stream copy into the keyframe layout
+        of a single encode.
+
+        Args:
+            segments: Segments with ``video_path`` and ``text``
+            durations: Segment durations in seconds
+            output_path: Final video file
+            size: Output size as (width, height)
+            write_options: ``write_videofile`` encoder settings
+            audio_path: Optional audio track for the whole video
+
+        Returns:
+            Path to the final video
+        """
+        fps = write_options["fps"]
+        frame_count = sum(len(times) for times in FramePipeline.frame_times(durations, fps))
+        gop = max(1, round(self.keyframe_interval * fps))
+        ranges = chunk_ranges(frame_count, self.chunks, gop)
+        chunk_options = keyframe_options(write_options, gop)
+
+        os.makedirs(self.temp_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="chunks_", dir=self.temp_dir)
+        try:
+            paths = [os.path.join(work_dir, f"chunk_{index:03d}.mp4") for index in range(len(ranges))]
+            with span("video.render_chunks", cat="video", chunks=len(ranges), workers=self.workers):
+                if self.workers > 1 and len(ranges) > 1:
+                    futures = [
+                        self.pool.submit(
+                            _render_chunk_in_process,
+                            segments,
+                            durations,
+                            frames,
+                            path,
+                            size,
+                            chunk_options
+                        )
+                        for frames, path in zip(ranges, paths)
+                    ]
+                    for future in futures:
+                        future.result()
+                else:
+                    for frames, path in zip(ranges, paths):
+                        render_chunk_file(
+                            self.segment_service,
+                            self.frame_pipeline,
+                            segments,
+                            durations,
+                            frames,
+                            path,
+                            size,
+                            chunk_options
+                        )
+
+            return self.concat(paths, output_path, audio_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def concat(
+        self,
+        paths: List[str],
+        output_path: str,
+        audio_path: Optional[str] = None
+    ) -> str:
+        """Join video files with the concat demuxer, without re-encoding.
+
+        Args:
+            paths: Video files with identical encoder settings, in order
+            output_path: Joined video file
+            audio_path: Optional audio track, encoded to AAC while muxing
+
+        Returns:
+            Path to the joined video
+        """
+        list_path = f"{os.path.splitext(output_path)[0]}.concat.txt"
+        with open(list_path, "w") as f:
+            for path in paths:
+                # Escape quotes for the concat list format
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+        command = [self.ffmpeg, "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+        if audio_path:
+            command += ["-i", audio_path, "-map", "0:v:0", "-map", "1:a:0", "-c:a", "aac"]
+        command += ["-c:v", "copy", "-movflags", "+faststart", output_path]
+
+        try:
+            with span("video.concat", cat="encode", segments=len(paths)):
+                subprocess.run(command, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"ffmpeg concat failed: {e.stderr.strip()}")
+            raise VideoCompositionError(f"Failed to concatenate segments: {e.stderr.strip()}")
+        finally:
+            try:
+                os.remove(list_path)
+            except OSError:
+                pass
+
+        return output_path
+
+    def cleanup(self) -> None:
+        """Stop the process pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -1,45 +1,157 @@
+import functools
 import logging
-from typing import Dict
-from moviepy.editor import VideoFileClip
+import os
+from typing import Dict, List, Optional, Tuple
+from moviepy.editor import VideoClip, VideoFileClip
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
 from config.exceptions import SegmentServiceError
 from services.video.base import SegmentServiceBase
 from services.video.effects_service import VideoEffectsService
+from services.video.frame_buffer import FrameBuffer
+from services.video.frame_transform import FrameStep, cover_size
 from services.video.text_overlay_service import TextOverlayService
+from utils.tracing import span, trace_frames, traced
+
+# ffmpeg scaler of backgrounds decoded smaller and larger than their source;
+# area averaging when shrinking, like cv2.INTER_AREA
+DECODE_RESIZE_ALGORITHM = {"shrink": "area", "enlarge": "bicubic"}
+
+
+@functools.lru_cache(maxsize=256)
+def _video_size(path: str, mtime_ns: int) -> Tuple[int, int]:
+    """Probe a video's frame size; the mtime invalidates the memoized size."""
+    width, height = ffmpeg_parse_infos(path)["video_size"]
+    return width, height
 
 class SegmentService(SegmentServiceBase):
     def __init__(
         self,
         video_effects: VideoEffectsService,
         text_overlay: TextOverlayService,
+        frame_buffer: Optional[FrameBuffer] = None,
         config: Dict = None,
         logger: logging.Logger = None
     ):
         self.video_effects = video_effects
         self.text_overlay = text_overlay
+        self.frame_buffer = frame_buffer
         self.config = config or {}
         self.logger = logger or logging.getLogger(__name__)
 
-    def process_segment(self, segment: Dict, timing: Dict[str, float]) -> VideoFileClip:
-        """Process a single video segment with effects and overlays."""
+    @traced("segment.process", cat="video")
+    def process_segment(
+        self,
+        segment: Dict,
+        timing: Dict[str, float],
+        size: Optional[Tuple[int, int]] = None
+    ) -> VideoFileClip:
+        """Process a single video segment with effects and overlays.
+
+        Args:
+            segment: Segment with ``video_path`` and ``text``
+            timing: Segment ``duration`` in seconds
+            size: Output size as (width, height), ``video.resolution`` if unset
+
+        Returns:
+            The segment clip at the output size
+        """
+        clip, steps = self.segment_frames(segment, timing, size)
+        for step in steps:
+            clip = trace_frames(clip.fl_image(step.apply), step.name, step.cat)
+        return clip
+
+    def segment_frames(
+        self,
+        segment: Dict,
+        timing: Dict[str, float],
+        size: Optional[Tuple[int, int]] = None,
+        reuse_buffers: bool = True
+    ) -> Tuple[VideoClip, List[FrameStep]]:
+        """Split a segment into its decoded frames and the work done on each.
+
+        The source clip plays the background, looped and cut to the
+        segment duration. The steps, applied in order to every source
+        frame, scale and crop it to the output size and draw the text.
+        ``process_segment`` chains them into one clip; the frame pipeline
+        runs them on separate threads.
+
+        Args:
+            segment: Segment with ``video_path`` and ``text``
+            timing: Segment ``duration`` in seconds
+            size: Output size as (width, height), ``video.resolution`` if unset
+            reuse_buffers: Let steps reuse their output buffers, which is
+                only safe if each frame is used before the next one is made
+
+        Returns:
+            The source clip and the per-frame steps
+        """
         try:
             # Get the base video clip
             video_path = segment.get("video_path")
             if not video_path:
                 raise SegmentServiceError("No video path provided for segment")
 
-            # Load the video clip
-            clip = VideoFileClip(video_path)
+            if size is None:
+                resolution = self.config.get("video", {}).get("resolution", {})
+                size = (resolution.get("width", 1080), resolution.get("height", 1920))
 
-            # Standardize the video duration
-            clip = self.video_effects.standardize_video(clip, timing["duration"])
+            steps = []
+            mtime_ns = os.stat(video_path).st_mtime_ns
+            buffer_key = (os.path.abspath(video_path), mtime_ns, tuple(size))
+            buffered = self.frame_buffer.get(buffer_key) if self.frame_buffer else None
+            if buffered is not None:
+                frames, fps = buffered
+                clip = FrameBuffer.looped_clip(frames, fps, timing["duration"])
+            else:
+                clip = self._open_clip(video_path, mtime_ns, size)
+                if self.frame_buffer and self.frame_buffer.accepts(clip.duration, clip.fps, *size):
+                    # Decoded once; loops and later segments reuse the frames
+                    with span("segment.buffer", cat="decode"):
+                        fps = clip.fps
+                        frames = self.frame_buffer.put(
+                            buffer_key,
+                            FrameBuffer.decode(
+                                self.video_effects.standardize_video(clip, clip.duration, size=size),
+                                fps
+                            ),
+                            fps
+                        )
+                        clip.close()
+                    clip = FrameBuffer.looped_clip(frames, fps, timing["duration"])
+                else:
+                    # Fill the output size and standardize the video duration
+                    transform = self.video_effects.cover_transform(clip, size, reuse_buffer=reuse_buffers)
+                    if transform is not None:
+                        steps.append(FrameStep("resize", "transform", transform))
+                    clip = self.video_effects.fit_duration(clip, timing["duration"])
 
             # Add text overlay if specified
             text = segment.get("text")
             if text:
-                clip = self.text_overlay.create_text_overlay(clip, text)
+                with span("overlay.raster", cat="overlay"):
+                    blend = self.text_overlay.overlay_transform(text, *size)
+                if blend is not None:
+                    steps.append(FrameStep("overlay", "overlay", blend))
 
-            return clip
+            return clip, steps
 
         except Exception as e:
             self.logger.error(f"Failed to process segment: {str(e)}")
             raise SegmentServiceError(f"Failed to process segment: {str(e)}")
+
+    def _open_clip(self, video_path: str, mtime_ns: int, size: Tuple[int, int]) -> VideoFileClip:
+        """Open a background clip for an output size.
+
+        The ffmpeg decoder scales the frames, rather than Python per frame,
+        just enough to cover the output size without stretching;
+        standardize_video crops the overflow.
+        """
+        with span("segment.open", cat="decode"):
+            source_size = _video_size(video_path, mtime_ns)
+            decode_width, decode_height = cover_size(source_size, size)
+            clip = VideoFileClip(
+                video_path,
+                target_resolution=(decode_height, decode_width),
+                resize_algorithm=DECODE_RESIZE_ALGORITHM["shrink" if decode_width < source_size[0] else "enlarge"]
+            )
+        return trace_frames(clip, "decode", "decode")
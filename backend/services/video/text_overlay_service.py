@@ -1,10 +1,26 @@
-from typing import Dict, List
+import functools
+import hashlib
+import json
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from moviepy.editor import VideoFileClip, ImageClip, CompositeVideoClip
+from moviepy.editor import ImageClip, VideoFileClip
 from config.exceptions import TextOverlayError
 from services.video.base import TextOverlayServiceBase
+from utils.cache import CacheManager, MemoryCache
 from utils.logger import log
+from utils.tracing import trace_frames, traced
+
+# A rendered overlay: the text's bounding box and its (left, top) position
+TextPatch = Tuple[Image.Image, Tuple[int, int]]
+
+# Tells an overlay missing from memory apart from a blank one
+_MISSING = object()
+
+@functools.lru_cache(maxsize=32)
+def _load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a font once per path and size."""
+    return ImageFont.truetype(path, size)
 
 class TextOverlayService(TextOverlayServiceBase):
     def __init__(self, config: Dict = None, logger=None):
@@ -15,62 +31,262 @@ class TextOverlayService(TextOverlayServiceBase):
         self.text_color = self.config.get("text", {}).get("color", "white")
         self.stroke_width = self.config.get("text", {}).get("stroke_width", 2)
         self.stroke_color = self.config.get("text", {}).get("stroke_color", "black")
+        # Font sizes are given for this frame width and scaled for others
+        self.reference_width = self.config.get("video", {}).get("resolution", {}).get("width", 1080)
+        
+        # Rendered overlays, kept in memory and on disk
+        cache_config = self.config.get("text", {}).get("cache", {})
+        self.cache_enabled = cache_config.get("enabled", True)
+        self.cache_memory_bytes = cache_config.get("memory_bytes", 64 * 1024 * 1024)
+        self.cache_dir = cache_config.get("dir", "cache/text")
+        self.cache_max_size = cache_config.get("max_size", 256 * 1024 * 1024)
+        # Blank texts are remembered as None
+        self._patches = MemoryCache(self.cache_memory_bytes, self._patch_size)
+        self._cache: Optional[CacheManager] = None
 
+    @traced("overlay.raster", cat="overlay")
     def create_text_overlay(self, clip: VideoFileClip, text: str) -> VideoFileClip:
+        """Draw text over every frame of a clip."""
         try:
             # Get video dimensions
             width, height = clip.size
             
-            # Calculate text layout
-            lines = self.calculate_text_layout(text, width * 0.8)  # Use 80% of width
-            
-            # Create PIL Image for text
-            img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # Load font
-            font = ImageFont.truetype(self.font_path, self.font_size)
-            
-            # Calculate total text height
-            line_height = self.font_size * 1.5
-            total_height = len(lines) * line_height
-            
-            # Start position (centered vertically and horizontally)
-            y = (height - total_height) / 2
-            
-            # Draw each line
-            for line in lines:
-                # Get line width
-                line_width = draw.textlength(line, font=font)
-                x = (width - line_width) / 2
-                
-                # Draw text stroke (outline)
-                for offset_x in range(-self.stroke_width, self.stroke_width + 1):
-                    for offset_y in range(-self.stroke_width, self.stroke_width + 1):
-                        draw.text(
-                            (x + offset_x, y + offset_y),
-                            line,
-                            font=font,
-                            fill=self.stroke_color
-                        )
-                
-                # Draw main text
-                draw.text((x, y), line, font=font, fill=self.text_color)
-                y += line_height
-            
-            # Convert PIL image to numpy array
-            text_array = np.array(img)
-            
-            # Create MoviePy clip from text overlay
-            text_clip = ImageClip(text_array, duration=clip.duration)
+            blend = self.overlay_transform(text, width, height)
+            if blend is None:
+                return clip
+            transform = blend
+            if isinstance(clip, ImageClip):
+                # Static clips return their one writable image for every frame
+                transform = lambda frame: blend(frame.copy())
             
             # Composite text over video
-            return CompositeVideoClip([clip, text_clip])
+            return trace_frames(clip.fl_image(transform), "overlay", "overlay")
             
         except Exception as e:
             self.logger.error(f"Failed to create text overlay: {str(e)}")
             raise TextOverlayError(f"Failed to create text overlay: {str(e)}")
 
+    def overlay_transform(self, text: str, width: int, height: int) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """Get a function that draws text over a frame.
+
+        Only the text's bounding box is blended, with premultiplied alpha
+        and integer arithmetic, so the per-frame cost follows the text
+        area rather than the frame size. The function draws on ``out`` if
+        given, which may be the frame itself. Otherwise it draws in place
+        on a writable uint8 frame that owns its memory, and on a copy of
+        read-only or shared frames. It is safe to call from several threads.
+
+        Args:
+            text: Text to draw
+            width: Frame width
+            height: Frame height
+
+        Returns:
+            The blend function, or None if there is nothing to draw
+        """
+        # Render text and keep only the part that is drawn on
+        patch = self.render_text_patch(text, width, height)
+        if patch is None:
+            return None
+        image, (left, top) = patch
+        pixels = np.asarray(image, dtype=np.uint16)
+        alpha = pixels[:, :, 3:]
+        # Color scaled by alpha, and the weight left for the frame;
+        # both sum to at most 255 * 255, which fits in uint16
+        premultiplied = pixels[:, :, :3] * alpha
+        inverse_alpha = 255 - alpha
+        window = (slice(top, top + image.height), slice(left, left + image.width))
+        
+        def blend(frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+            # Decoded and buffered frames are read-only, since decoders may
+            # hand out the same array again, and views share their memory;
+            # a writable frame of its own was made for this call
+            if out is None:
+                if not (frame.flags.writeable and frame.flags.owndata and frame.dtype == np.uint8):
+                    frame = np.array(frame, dtype=np.uint8)
+            elif out is not frame:
+                np.copyto(out, frame, casting="unsafe")
+                frame = out
+            region = frame[window]
+            mixed = region * inverse_alpha
+            mixed += premultiplied
+            mixed += 127  # Round to nearest
+            mixed //= 255
+            region[...] = mixed
+            return frame
+        
+        return blend
+
+    def render_text_image(self, text: str, width: int, height: int) -> Image.Image:
+        """Render outlined, centered text onto a transparent frame-sized image.
+
+        Font size and outline scale with the frame width, so a reduced-size
+        preview wraps and places the text like the full-size video.
+
+        Args:
+            text: Text to draw, wrapped to 80% of the width
+            width: Frame width
+            height: Frame height
+
+        Returns:
+            RGBA image of the overlay
+        """
+        font_size = self.scaled_font_size(width)
+        stroke_width = self.scaled_stroke_width(width)
+
+        # Calculate text layout at the reference size, so the line breaks
+        # do not change with font hinting at other sizes
+        lines = self.calculate_text_layout(text, self.reference_width * 0.8)  # Use 80% of width
+        
+        # Create PIL Image for text
+        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        
+        # Load font
+        font = _load_font(self.font_path, font_size)
+        
+        # Calculate total text height
+        line_height = font_size * 1.5
+        total_height = len(lines) * line_height
+        
+        # Start position (centered vertically and horizontally)
+        y = (height - total_height) / 2
+        
+        # Draw each line
+        for line in lines:
+            # Get line width
+            line_width = draw.textlength(line, font=font)
+            x = (width - line_width) / 2
+            
+            # Draw text with its stroke (outline) in one pass
+            draw.text(
+                (x, y),
+                line,
+                font=font,
+                fill=self.text_color,
+                stroke_width=stroke_width,
+                stroke_fill=self.stroke_color
+            )
+            y += line_height
+        
+        return img
+
+    def render_text_patch(self, text: str, width: int, height: int) -> Optional[TextPatch]:
+        """Render the overlay cropped to the pixels the text covers.
+
+        Overlays are cached in memory and on disk by ``raster_key``, since
+        the same pattern texts come back in every video.
+
+        Args:
+            text: Text to draw
+            width: Frame width
+            height: Frame height
+
+        Returns:
+            RGBA image of the text's bounding box and its (left, top)
+            position in the frame, or None if nothing is drawn
+        """
+        if not self.cache_enabled:
+            return self._rasterize(text, width, height)
+
+        key = self.raster_key(text, width, height)
+        remembered = self._patches.get(key, _MISSING)
+        if remembered is not _MISSING:
+            return remembered
+
+        patch = self._cached_patch(key)
+        if patch is None:
+            patch = self._rasterize(text, width, height)
+            if patch is not None:
+                self._store_patch(key, patch)
+        self._patches.put(key, patch)
+        return patch
+
+    def warmup(self, texts: Iterable[str], sizes: Iterable[Tuple[int, int]]) -> int:
+        """Render overlays ahead of time so renders find them cached.
+
+        Args:
+            texts: Texts to render
+            sizes: Frame sizes as (width, height)
+
+        Returns:
+            Number of overlays that were not cached yet
+        """
+        rendered = 0
+        for width, height in sizes:
+            for text in texts:
+                key = self.raster_key(text, width, height)
+                if key in self._patches or self._cached_patch(key) is not None:
+                    continue
+                self.render_text_patch(text, width, height)
+                rendered += 1
+        return rendered
+
+    def raster_key(self, text: str, width: int, height: int) -> str:
+        """Get the cache key of an overlay, covering everything that changes its pixels."""
+        style = {
+            "text": text,
+            "font": self.font_path,
+            "font_size": self.scaled_font_size(width),
+            "layout_width": self.reference_width,
+            "layout_font_size": self.font_size,
+            "color": self.text_color,
+            "stroke_width": self.scaled_stroke_width(width),
+            "stroke_color": self.stroke_color,
+            "frame": [width, height]
+        }
+        return hashlib.sha256(json.dumps(style, sort_keys=True).encode()).hexdigest()
+
+    @property
+    def cache(self) -> CacheManager:
+        """Rendered overlay cache on disk, opened on first use."""
+        if self._cache is None:
+            self._cache = CacheManager(self.cache_dir, max_size=self.cache_max_size)
+        return self._cache
+
+    @traced("overlay.rasterize", cat="overlay")
+    def _rasterize(self, text: str, width: int, height: int) -> Optional[TextPatch]:
+        """Render an overlay and crop it to its bounding box."""
+        image = self.render_text_image(text, width, height)
+        bbox = image.getchannel("A").getbbox()
+        if bbox is None:
+            return None
+        return image.crop(bbox), bbox[:2]
+
+    def _cached_patch(self, key: str) -> Optional[TextPatch]:
+        """Load an overlay from the disk cache."""
+        data = self.cache.get(key)
+        if not data:
+            return None
+        image = Image.frombytes("RGBA", tuple(data["size"]), data["pixels"])
+        return image, tuple(data["offset"])
+
+    def _store_patch(self, key: str, patch: TextPatch) -> None:
+        """Save an overlay to the disk cache."""
+        image, offset = patch
+        self.cache.put(
+            key,
+            {"size": image.size, "offset": offset, "pixels": image.tobytes()},
+            compression_level=1
+        )
+
+    @staticmethod
+    def _patch_size(patch: Optional[TextPatch]) -> int:
+        """Bytes of pixels in an overlay."""
+        return len(patch[0].getbands()) * patch[0].width * patch[0].height if patch else 0
+
+    def scaled_font_size(self, width: int) -> int:
+        """Get the font size for a frame width, relative to ``video.resolution``."""
+        return max(1, round(self.font_size * width / self.reference_width))
+
+    def scaled_stroke_width(self, width: int) -> int:
+        """Get the outline width for a frame width, relative to ``video.resolution``."""
+        return self.stroke_width and max(1, round(self.stroke_width * width / self.reference_width))
+
+    def cleanup(self) -> None:
+        """Drop the overlays held in memory."""
+        self._patches.clear()
+
     def calculate_text_layout(self, text: str, max_width: int) -> List[str]:
         try:
             words = text.split()
@@ -78,7 +294,7 @@ class TextOverlayService(TextOverlayServiceBase):
             current_line = []
             
             # Load font for text measurements
-            font = ImageFont.truetype(self.font_path, self.font_size)
+            font = _load_font(self.font_path, self.font_size)
             
             # Create temporary PIL Draw object for text measurements
             img = Image.new('RGBA', (1, 1), (0, 0, 0, 0))
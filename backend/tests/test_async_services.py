@@ -0,0 +1,155 @@
+"""
+Tests for the asyncio service variants against local stub HTTP servers.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.service_factory import ServiceFactory
+
+FAKE_MP3 = b"ID3" + b"\x00" * 64
+FAKE_MP4 = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 64
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers like the ElevenLabs and Pexels APIs."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        if self.path.startswith("/pexels/search"):
+            data = {
+                "videos": [{
+                    "duration": 3,
+                    "video_files": [{"width": 1080, "height": 1920, "link": f"{base}/files/clip.mp4"}]
+                }]
+            }
+            self._send(json.dumps(data).encode(), "application/json")
+        elif self.path.startswith("/files/"):
+            self._send(FAKE_MP4, "video/mp4")
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        self.server.requests.append(self.path)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.startswith("/tts/text-to-speech/"):
+            self._send(FAKE_MP3, "audio/mpeg")
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def factory(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setenv("RIDDLER_ELEVENLABS_API_KEY", "test-key")
+    monkeypatch.setenv("RIDDLER_PEXELS_API_KEY", "test-key")
+    base = f"http://127.0.0.1:{stub_server.server_port}"
+    config = {
+        "tts": {"base_url": f"{base}/tts", "cache_dir": str(tmp_path / "voice")},
+        "video": {
+            "cache_dir": str(tmp_path / "video"),
+            "pexels": {
+                "base_url": f"{base}/pexels",
+                "category_terms": {"geography": ["mountain"]}
+            }
+        }
+    }
+    return ServiceFactory(config)
+
+
+def test_async_services_share_one_client(factory):
+    """Test that the async services reuse the factory's HTTP client."""
+    async def run():
+        try:
+            tts = factory.get_async_tts_service()
+            pexels = factory.get_async_pexels_service()
+            assert tts.client is pexels.client is factory.get_async_http_client()
+        finally:
+            await factory.aclose()
+
+    asyncio.run(run())
+
+
+def test_async_tts_generates_and_caches_speech(factory, stub_server):
+    """Test concurrent speech generation and reuse of cached audio."""
+    async def run():
+        try:
+            tts = factory.get_async_tts_service()
+            paths = await asyncio.gather(*(tts.generate_speech(f"line {i}") for i in range(3)))
+            cached = await tts.generate_speech("line 0")
+            return paths, cached
+        finally:
+            await factory.aclose()
+
+    paths, cached = asyncio.run(run())
+
+    assert len(set(paths)) == 3
+    assert all(open(path, "rb").read() == FAKE_MP3 for path in paths)
+    assert cached == paths[0]
+    assert len(stub_server.requests) == 3
+
+
+def test_async_pexels_downloads_and_caches_video(factory, stub_server):
+    """Test that a clip is searched, streamed to disk and then served from cache."""
+    async def run():
+        try:
+            pexels = factory.get_async_pexels_service()
+            first = await pexels.get_video("geography")
+            second = await pexels.get_video("geography")
+            return first, second
+        finally:
+            await factory.aclose()
+
+    first, second = asyncio.run(run())
+
+    assert open(first, "rb").read() == FAKE_MP4
+    assert open(second, "rb").read() == FAKE_MP4
+    assert [path.split("?")[0] for path in stub_server.requests] == ["/pexels/search", "/files/clip.mp4"]
+
+
+def test_concurrent_misses_write_whole_files(factory, tmp_path):
+    """Test that requests missing the cache together each replace the file with a complete one."""
+    async def run():
+        try:
+            tts = factory.get_async_tts_service()
+            pexels = factory.get_async_pexels_service()
+            voices = await asyncio.gather(tts.generate_speech("same"), tts.generate_speech("same"))
+            videos = await asyncio.gather(pexels.get_video("geography"), pexels.get_video("geography"))
+            return voices, videos
+        finally:
+            await factory.aclose()
+
+    voices, videos = asyncio.run(run())
+
+    assert voices[0] == voices[1] and open(voices[0], "rb").read() == FAKE_MP3
+    assert videos[0] == videos[1] and open(videos[0], "rb").read() == FAKE_MP4
+    assert not [path for path in tmp_path.rglob("*.part")]
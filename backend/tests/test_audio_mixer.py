@@ -0,0 +1,117 @@
+"""
+Tests for the vectorized audio mixer.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.audio.composition_service import AudioCompositionService
+from services.audio.mixer import AudioMixer, limit
+from services.audio.pcm_cache import PCMCache
+
+CONFIG = {"audio": {"sample_rate": 8000, "channels": 2, "limiter_ceiling": 0.9}}
+
+
+class CountingMixer(AudioMixer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decoded = []
+
+    def _decode(self, path):
+        self.decoded.append(os.path.basename(path))
+        return super()._decode(path)
+
+
+def write_tone(mixer, path, value, seconds):
+    """Write a constant two-channel tone to a WAV file."""
+    samples = np.full((int(seconds * mixer.sample_rate), 2), value, dtype=np.float32)
+    return mixer.write(samples, str(path))
+
+
+def test_limit_keeps_peaks_under_the_ceiling():
+    """Test that loud passages are brought under the ceiling and quiet ones are left alone."""
+    rate = 8000
+    t = np.arange(rate * 2) / rate
+    samples = np.stack([0.3 * np.sin(2 * np.pi * 440 * t)] * 2, axis=1).astype(np.float32)
+    samples[rate:rate + 400] *= 5
+    quiet = samples[:rate // 2].copy()
+
+    limited = limit(samples, 0.9, rate)
+
+    assert np.abs(limited).max() <= 0.9
+    assert np.array_equal(limited[:rate // 2], quiet)
+
+
+def test_mix_places_tracks_with_gain_and_loops(tmp_path):
+    """Test that tracks land at their start time with their volume, looped to fill a duration."""
+    mixer = AudioMixer(CONFIG)
+    short = write_tone(mixer, tmp_path / "short.wav", 0.5, 0.25)
+
+    mixed = mixer.mix([
+        {"path": short, "start": 0.5, "volume": 0.4},
+        {"path": short, "start": 1.0, "volume": 1.0, "duration": 1.0}
+    ], 1.5)
+
+    rate = mixer.sample_rate
+    assert mixed.shape == (int(1.5 * rate), 2)
+    assert np.abs(mixed[:rate // 2]).max() == 0
+    assert mixed[rate // 2 + 10, 0] == pytest.approx(0.2, abs=1e-3)
+    assert np.abs(mixed[int(0.75 * rate) + 10:rate]).max() == 0
+    # Looped past the file's own length, and cut at the end of the mix
+    assert np.allclose(mixed[rate:], 0.5, atol=1e-3)
+
+
+@pytest.mark.slow
+def test_render_audio_file_encodes_the_mix(tmp_path):
+    """Test that the mix of a video's segments is encoded to AAC, padded to the video length."""
+    from moviepy.editor import AudioFileClip
+
+    service = AudioCompositionService(CONFIG)
+    voice = write_tone(service.mixer, tmp_path / "voice.wav", 0.25, 1.0)
+    segments = [{"id": "hook", "voice_path": voice}, {"id": "cta"}]
+
+    output = service.render_audio_file(segments, {"hook": 1.5, "cta": 1.0}, str(tmp_path / "mix.m4a"))
+
+    clip = AudioFileClip(output)
+    try:
+        assert clip.duration == pytest.approx(2.5, abs=0.1)
+    finally:
+        clip.close()
+    assert service.render_audio_file([{"id": "cta"}], {"cta": 1.0}, str(tmp_path / "none.m4a")) is None
+
+
+def test_decoded_files_are_cached_until_they_change(tmp_path):
+    """Test that a file is decoded once per version and preloading skips missing files."""
+    mixer = CountingMixer(CONFIG, pcm_cache=PCMCache(CONFIG))
+    effect = write_tone(mixer, tmp_path / "effect.wav", 0.5, 0.5)
+
+    assert mixer.preload([effect, str(tmp_path / "missing.wav")]) == 1
+    mixer.mix([{"path": effect, "start": 0, "volume": 1.0}] * 3, 1.0)
+    assert mixer.duration(effect) == pytest.approx(0.5)
+    assert mixer.decoded == ["effect.wav"]
+
+    stat = os.stat(effect)
+    os.utime(effect, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+    mixer.decode(effect)
+    assert mixer.decoded == ["effect.wav", "effect.wav"]
+
+
+def test_pcm_cache_evicts_least_recently_used():
+    """Test that the cache stays within its budget, dropping the oldest entries first."""
+    cache = PCMCache({"audio": {"pcm_cache": {"max_bytes": 2000}}})
+    first = cache.put("first", np.zeros((100, 2), dtype=np.float32))
+    cache.put("second", np.zeros((100, 2), dtype=np.float32))
+    cache.get("first")
+    cache.put("third", np.zeros((100, 2), dtype=np.float32))
+
+    assert not first.flags.writeable
+    assert cache.get("second") is None
+    assert cache.get("first") is first
+    assert cache.size == 1600
+    cache.put("huge", np.zeros((1000, 2), dtype=np.float32))
+    assert cache.get("huge") is None
@@ -0,0 +1,85 @@
+"""
+Tests for batch job loading and execution.
+"""
+import json
+import os
+import sys
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.exceptions import ValidationError
+from core.batch import BatchRunner, load_jobs
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', 'examples')
+
+
+class FakeApplication:
+    """Application stand-in that records jobs instead of rendering."""
+
+    def __init__(self, failing_categories=()):
+        self.failing_categories = failing_categories
+        self.calls = []
+        self.preloaded = 0
+
+    def preload_sound_effects(self):
+        self.preloaded += 1
+        return 2
+
+    def run_job(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs["category"] in self.failing_categories:
+            raise RuntimeError("render failed")
+        return kwargs["output_path"] or os.path.join(kwargs["output_dir"], "video.mp4")
+
+
+def test_load_example_jobs():
+    """Test that the example jobs file is normalized."""
+    jobs = load_jobs(os.path.join(EXAMPLES_DIR, 'jobs.json'))
+
+    assert [job["id"] for job in jobs] == ["geography_easy", "logic_medium", "wordplay_prewritten"]
+    assert jobs[0]["riddles"] is None
+    assert jobs[2]["num_riddles"] == 2
+    assert jobs[2]["riddles"][0]["riddle"].startswith("I have keys")
+
+
+def test_load_jobs_requires_category(tmp_path):
+    """Test that jobs without a category are rejected."""
+    jobs_path = tmp_path / "jobs.json"
+    jobs_path.write_text(json.dumps([{"difficulty": "easy"}]))
+
+    with pytest.raises(ValidationError):
+        load_jobs(str(jobs_path))
+
+
+def test_jobs_without_ids_get_ids_unique_across_files(tmp_path):
+    """Test that default ids differ between jobs files and repeated ids are rejected."""
+    paths = [tmp_path / "first.json", tmp_path / "second.json"]
+    for path in paths:
+        path.write_text(json.dumps([{"category": "geography"}, {"category": "geography"}]))
+
+    first, second = (load_jobs(str(path)) for path in paths)
+
+    assert len({job["id"] for job in first + second}) == 4
+    assert first[0]["id"].startswith("job_0_")
+    assert [job["id"] for job in load_jobs(str(paths[0]))] == [job["id"] for job in first]
+
+    paths[0].write_text(json.dumps([{"id": "a", "category": "math"}, {"id": "a", "category": "logic"}]))
+    with pytest.raises(ValidationError):
+        load_jobs(str(paths[0]))
+
+
+def test_batch_runner_records_results(tmp_path):
+    """Test that failures are recorded without stopping the batch."""
+    app = FakeApplication(failing_categories=("logic",))
+    jobs = load_jobs(os.path.join(EXAMPLES_DIR, 'jobs.json'))
+
+    results = BatchRunner(app, output_dir=str(tmp_path)).run(jobs)
+
+    assert [result["status"] for result in results] == ["done", "failed", "done"]
+    summary = json.loads((tmp_path / "results.json").read_text())
+    assert summary["succeeded"] == 2
+    assert summary["failed"] == 1
+    assert len(app.calls) == 3
+    assert app.preloaded == 1
@@ -0,0 +1,52 @@
+"""
+Tests for the offline render benchmark.
+"""
+import os
+import sys
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.render_benchmark import compare_results, run_benchmark
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def make_results(*medians):
+    return {
+        "results": {
+            str(riddles): {"riddles": riddles, "median": median}
+            for riddles, median in zip((1, 2, 5), medians)
+        }
+    }
+
+
+def test_compare_results_classifies_changes():
+    """Test that changes beyond the threshold are flagged in both directions."""
+    rows = compare_results(make_results(10.0, 20.0, 50.0), make_results(12.0, 15.0, 52.0), threshold=0.1)
+
+    assert [row["status"] for row in rows] == ["slower", "faster", "unchanged"]
+    assert rows[0]["change"] == pytest.approx(0.2)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("render_mode", ["single", "segments", "ffmpeg"])
+def test_benchmark_renders_with_stub_services(tmp_path, monkeypatch, render_mode):
+    """Test a tiny offline render end to end without network access."""
+    # Effect sounds and the config use paths relative to the backend directory
+    monkeypatch.chdir(BACKEND_DIR)
+
+    results = run_benchmark(
+        riddle_counts=[1],
+        work_dir=str(tmp_path),
+        resolution=(108, 192),
+        fps=5,
+        render_mode=render_mode
+    )
+
+    result = results["results"]["1"]
+    assert result["segments"] == 5
+    assert result["median"] > 0
+    assert os.path.getsize(tmp_path / "output" / "bench_1_riddles.mp4") > 0
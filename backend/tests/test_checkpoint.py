@@ -0,0 +1,161 @@
+"""
+Tests for per-stage job checkpoints and resuming.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.exceptions import RiddlerException
+from core.application import Application
+from core.checkpoint import JobManifest
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'config.json')
+
+
+class CountingOpenAIService:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_riddle(self, category, **kwargs):
+        self.calls += 1
+        return {"riddle": f"riddle {self.calls}", "answer": f"answer {self.calls}"}
+
+
+class CountingTTSService:
+    def __init__(self, voice_dir):
+        self.voice_dir = voice_dir
+        self.texts = []
+
+    def generate_speech(self, text, **kwargs):
+        self.texts.append(text)
+        path = os.path.join(self.voice_dir, f"voice_{len(self.texts)}.mp3")
+        with open(path, "wb") as f:
+            f.write(b"ID3")
+        return path
+
+
+class FlakyComposition:
+    """Fails the first render, like an encoder crash at the end of a job."""
+
+    def __init__(self, background_path):
+        self.background_path = background_path
+        self.renders = 0
+        self.background_fetches = 0
+        self.cached_only = []
+        self.qualities = []
+
+    def calculate_timings(self, segments):
+        return [{"id": segment["id"], "start": i, "duration": 1.0} for i, segment in enumerate(segments)]
+
+    def fetch_backgrounds(self, segments, category, cached_only=False):
+        self.background_fetches += 1
+        self.cached_only.append(cached_only)
+        return [self.background_path for _ in segments]
+
+    def render_video(self, segments, timings, backgrounds, output_path, render_mode=None, quality=None):
+        self.renders += 1
+        self.qualities.append(quality)
+        if self.renders == 1:
+            raise RuntimeError("encoder crashed")
+        with open(output_path, "wb") as f:
+            f.write(b"video")
+        return True
+
+
+@pytest.fixture
+def app(tmp_path):
+    background_path = tmp_path / "background.mp4"
+    background_path.write_bytes(b"clip")
+    app = Application(config_path=CONFIG_PATH)
+    app.checkpoint_dir = str(tmp_path / "checkpoints")
+    app.service_factory.register_service("openai", CountingOpenAIService())
+    app.service_factory.register_service("tts", CountingTTSService(str(tmp_path)))
+    app.service_factory.register_service("video_composition", FlakyComposition(str(background_path)))
+    return app
+
+
+def test_complete_forgets_later_stages(tmp_path):
+    """Test that redoing a stage invalidates the stages after it."""
+    manifest = JobManifest.create(str(tmp_path), "job/1", "logic", "easy", 1, "out.mp4")
+    for stage in JobManifest.STAGES[:4]:
+        manifest.complete(stage)
+    manifest.complete("speech", segments=[])
+
+    loaded = JobManifest.load(str(tmp_path), "job/1")
+    assert loaded.completed_stages == ["riddles", "speech"]
+    assert loaded.get("status") == JobManifest.RUNNING
+    assert os.path.basename(loaded.path) == "job_1.json"
+    assert not os.path.exists(loaded.path + ".tmp")
+    assert JobManifest.load(str(tmp_path), "missing") is None
+
+
+def test_resume_skips_completed_stages(app, tmp_path):
+    """Test that a failed render is retried without new riddles, speech or backgrounds."""
+    openai = app.service_factory.get_openai_service()
+    tts = app.service_factory.get_tts_service()
+    composition = app.service_factory.get_video_composition_service()
+    output_path = str(tmp_path / "output" / "video.mp4")
+
+    with pytest.raises(RiddlerException):
+        app.run_job(category="logic", num_riddles=2, output_path=output_path, job_id="job")
+    with open(JobManifest.path_for(app.checkpoint_dir, "job")) as f:
+        saved = json.load(f)
+    assert saved["completed_stages"] == ["riddles", "speech", "timings", "backgrounds"]
+
+    tts_calls = len(tts.texts)
+    assert app.run_job(job_id="job", resume=True) == output_path
+
+    assert openai.calls == 2
+    assert len(tts.texts) == tts_calls
+    assert composition.background_fetches == 1
+    assert composition.renders == 2
+    assert JobManifest.load(app.checkpoint_dir, "job").get("status") == JobManifest.DONE
+
+
+def test_resume_redoes_stages_with_missing_files(app, tmp_path):
+    """Test that deleted voice files are regenerated from the saved pattern texts."""
+    tts = app.service_factory.get_tts_service()
+    output_path = str(tmp_path / "video.mp4")
+
+    with pytest.raises(RiddlerException):
+        app.run_job(category="logic", num_riddles=1, output_path=output_path, job_id="job")
+    texts = list(tts.texts)
+    for segment in JobManifest.load(app.checkpoint_dir, "job").get("segments"):
+        if segment.get("voice_path"):
+            os.remove(segment["voice_path"])
+
+    app.run_job(job_id="job", resume=True)
+
+    assert sorted(tts.texts[len(texts):]) == sorted(texts)
+
+
+def test_preview_then_final_reuses_assets(app, tmp_path):
+    """Test that a preview uses cached backgrounds and the final render reuses its assets."""
+    openai = app.service_factory.get_openai_service()
+    composition = app.service_factory.get_video_composition_service()
+    composition.renders = 1  # Skip the simulated crash
+    output_path = str(tmp_path / "video.mp4")
+
+    preview_path = app.run_job(category="logic", num_riddles=1, output_path=output_path, job_id="job", preview=True)
+
+    assert preview_path == str(tmp_path / "video.preview.mp4")
+    assert os.path.exists(preview_path) and not os.path.exists(output_path)
+    assert JobManifest.load(app.checkpoint_dir, "job").completed_stages == ["riddles", "speech", "timings", "backgrounds"]
+
+    assert app.run_job(job_id="job", resume=True) == output_path
+    assert os.path.exists(output_path)
+    assert openai.calls == 1
+    assert composition.background_fetches == 1
+    assert composition.cached_only == [True]
+    assert composition.qualities == ["preview", None]
+
+
+def test_resume_unknown_job_fails(app):
+    """Test that resuming needs a checkpoint or enough to start over."""
+    with pytest.raises(RiddlerException):
+        app.run_job(job_id="missing", resume=True)
@@ -0,0 +1,64 @@
+"""
+Tests for ingest-time normalization of background clips.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from moviepy.editor import VideoFileClip
+
+from services.video.clip_normalizer import ClipNormalizer
+
+CONFIG = {"video": {"resolution": {"width": 48, "height": 64}, "fps": 10}}
+
+
+@pytest.mark.slow
+def test_normalized_copy_is_used_once_ready(tmp_path):
+    """Test that a clip is transcoded once, with a sidecar, and then preferred."""
+    normalizer = ClipNormalizer(CONFIG)
+    source = str(tmp_path / "clip.mp4")
+    subprocess.run(
+        [normalizer.ffmpeg, "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc2=size=160x90:rate=25:duration=1",
+         "-c:v", "libx264", "-pix_fmt", "yuv420p", source],
+        check=True
+    )
+    assert normalizer.resolve(source) == source
+
+    try:
+        normalized = normalizer.submit(source).result()
+    finally:
+        normalizer.cleanup()
+
+    assert normalized == str(tmp_path / "clip.normalized.mp4")
+    assert normalizer.resolve(source) == normalized
+    assert normalizer.submit(source) is None
+    with open(tmp_path / "clip.normalized.json") as f:
+        metadata = json.load(f)
+    assert metadata["duration"] == pytest.approx(1.0, abs=0.1)
+    clip = VideoFileClip(normalized)
+    try:
+        assert clip.size == [48, 64]
+        assert clip.fps == 10
+    finally:
+        clip.close()
+
+    # Copies made for another output size are ignored
+    other = ClipNormalizer({"video": {"resolution": {"width": 96, "height": 128}, "fps": 10}})
+    assert other.resolve(source) == source
+
+
+def test_failed_normalization_keeps_source(tmp_path):
+    """Test that a clip ffmpeg cannot read is still used as it is."""
+    source = tmp_path / "broken.mp4"
+    source.write_bytes(b"not a video")
+    normalizer = ClipNormalizer(CONFIG)
+
+    assert normalizer.normalize(str(source)) == str(source)
+    assert normalizer.resolve(str(source)) == str(source)
+    assert os.listdir(tmp_path) == ["broken.mp4"]
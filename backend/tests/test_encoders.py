@@ -0,0 +1,100 @@
+"""
+Tests for encoder probing, fallback and profiles.
+"""
+import os
+import stat
+import sys
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.exceptions import VideoCompositionError
+from services.video import encoders
+from services.video.composition_service import VideoCompositionService
+from services.video.encoders import EncoderRegistry, available_encoders
+
+ENCODERS_OUTPUT = """Encoders:
+ V..... = Video
+ A..... = Audio
+ ------
+ V....D libx264              libx264 H.264 / AVC / MPEG-4 AVC / MPEG-4 part 10 (codec h264)
+ V....D h264_nvenc           NVIDIA NVENC H.264 encoder (codec h264)
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+
+
+@pytest.fixture
+def linux_encoders(monkeypatch):
+    """Pretend ffmpeg lists libx264 and an NVENC encoder without a GPU."""
+    monkeypatch.setattr(encoders, "available_encoders", lambda ffmpeg: frozenset({"libx264", "h264_nvenc"}))
+    monkeypatch.setattr(encoders, "encoder_works", lambda ffmpeg, codec: False)
+
+
+def test_available_encoders_parses_listing(tmp_path):
+    """Test that only video encoders from the table are returned."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"#!/bin/sh\ncat <<'EOF'\n{ENCODERS_OUTPUT}EOF\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+
+    assert available_encoders(str(script)) == frozenset({"libx264", "h264_nvenc"})
+    assert available_encoders(str(tmp_path / "missing")) == frozenset()
+
+
+def test_registry_falls_back_to_working_encoder(linux_encoders):
+    """Test that a missing or broken hardware encoder falls back to libx264."""
+    registry = EncoderRegistry({"video": {"codec": "h264_videotoolbox"}})
+
+    options = registry.write_options(profile="quality", fps=24)
+
+    assert options["codec"] == "libx264"
+    assert options["preset"] == "slow"
+    assert options["fps"] == 24
+    assert options["ffmpeg_params"][:2] == ["-crf", "18"]
+    assert "avc1" in options["ffmpeg_params"]
+
+
+def test_registry_applies_profile_overrides(linux_encoders):
+    """Test that profiles from the config replace the built-in settings."""
+    config = {"video": {"encoder": {
+        "profile": "draft",
+        "profiles": {"draft": {"libx264": {"preset": "ultrafast", "params": ["-crf", "30"]}}}
+    }}}
+
+    options = EncoderRegistry(config).write_options()
+
+    assert options["preset"] == "ultrafast"
+    assert options["ffmpeg_params"][:2] == ["-crf", "30"]
+    with pytest.raises(VideoCompositionError):
+        EncoderRegistry(config).write_options(profile="missing")
+
+
+def test_registry_fails_without_usable_encoder(linux_encoders):
+    """Test that a clear error is raised when no candidate works."""
+    registry = EncoderRegistry({"video": {"encoder": {"candidates": ["h264_nvenc", "libx265"]}}})
+
+    with pytest.raises(VideoCompositionError):
+        registry.select_codec()
+
+
+def test_quality_profiles_scale_output(linux_encoders):
+    """Test that quality profiles pick the output size, frame rate and encoder profile."""
+    config = {"video": {
+        "resolution": {"width": 1080, "height": 1920},
+        "fps": 30,
+        "quality": {"profiles": {"preview": {"scale": 0.3}}}
+    }}
+    composition = VideoCompositionService(None, None, None, None, None, None, config=config)
+
+    final = composition.render_settings()
+    preview = composition.render_settings("preview")
+
+    assert final["size"] == (1080, 1920)
+    assert final["write_options"]["fps"] == 30
+    assert final["write_options"]["preset"] == "faster"
+    assert preview["size"] == (324, 576)
+    assert preview["write_options"]["fps"] == 15
+    assert preview["write_options"]["preset"] == "veryfast"
+    with pytest.raises(VideoCompositionError):
+        composition.render_settings("missing")
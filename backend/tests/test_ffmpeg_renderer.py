@@ -0,0 +1,53 @@
+"""
+Tests for the native ffmpeg filtergraph renderer.
+"""
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image
+
+from services.audio.composition_service import AudioCompositionService
+from services.video.ffmpeg_renderer import FFmpegRenderer
+
+
+class FakeTextOverlay:
+    def render_text_patch(self, text, width, height):
+        return Image.new("RGBA", (80, 20), (255, 255, 255, 255)), (14, 86)
+
+
+class FixedAudioComposition(AudioCompositionService):
+    def audio_tracks(self, segments, timings):
+        return [
+            {"path": "voice.mp3", "start": 0.0, "volume": 1.0},
+            {"path": "music.mp3", "start": 1.0, "volume": 0.1, "duration": 2.0}
+        ]
+
+
+def test_build_command_compiles_one_filtergraph(tmp_path):
+    """Test that segments, overlays and audio become a single filter_complex."""
+    config = {"video": {"resolution": {"width": 108, "height": 192}}}
+    renderer = FFmpegRenderer(FakeTextOverlay(), FixedAudioComposition(config), config)
+    segments = [{"id": "hook", "text": "Hello"}, {"id": "thinking_0", "text": ""}]
+    timings = [{"id": "hook", "duration": 1.02}, {"id": "thinking_0", "duration": 2.0}]
+    write_options = {"codec": "libx264", "fps": 10, "preset": "ultrafast", "ffmpeg_params": ["-tag:v", "avc1"]}
+
+    command = renderer.build_command(
+        segments, timings, ["a.mp4", "b.mp4"], "out.mp4", write_options, str(tmp_path)
+    )
+
+    inputs = [command[i + 1] for i, arg in enumerate(command) if arg == "-i"]
+    assert inputs == ["a.mp4", str(tmp_path / "text_000.png"), "b.mp4", "voice.mp3", "music.mp3"]
+    assert os.path.exists(tmp_path / "text_000.png")
+
+    graph = command[command.index("-filter_complex") + 1]
+    assert "[0:v]scale=108:192:force_original_aspect_ratio=increase,crop=108:192,setsar=1,fps=10,trim=end_frame=10" in graph
+    assert "[bg0][1:v]overlay=14:86" in graph
+    assert "[v0][bg1]concat=n=2:v=1:a=0[vout]" in graph
+    assert "[4:a]atrim=duration=2.000000,volume=0.1,adelay=delays=1000:all=1[a1]" in graph
+    assert "amix=inputs=2:normalize=0" in graph
+    assert "atrim=duration=3.000000[aout]" in graph
+    assert command[-1] == "out.mp4"
+    assert command[command.index("-c:v") + 1] == "libx264"
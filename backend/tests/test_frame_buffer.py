@@ -0,0 +1,92 @@
+"""
+Tests for buffering the decoded frames of short looped clips.
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from moviepy.config import get_setting
+from moviepy.editor import VideoFileClip
+
+from services.video.effects_service import VideoEffectsService
+from services.video.frame_buffer import FrameBuffer
+from services.video.segment_service import SegmentService
+
+
+def frames(count, value=0):
+    return np.full((count, 4, 4, 3), value, dtype=np.uint8)
+
+
+def test_least_recently_used_frames_are_evicted():
+    """Test that the memory budget evicts the oldest unused clip first."""
+    buffer = FrameBuffer({"video": {"frame_buffer": {"max_bytes": 3 * frames(1).nbytes}}})
+    buffer.put("a", frames(1), 10)
+    buffer.put("b", frames(1), 10)
+    buffer.get("a")
+    buffer.put("c", frames(2), 10)
+
+    assert buffer.get("b") is None
+    assert buffer.get("a") is not None
+    assert buffer.size == 3 * frames(1).nbytes
+    assert not buffer.get("c")[0].flags.writeable
+
+
+def test_frames_over_the_budget_are_not_kept():
+    """Test that one clip larger than the budget is returned without evicting others."""
+    buffer = FrameBuffer({"video": {"frame_buffer": {"max_bytes": 2 * frames(1).nbytes}}})
+    buffer.put("a", frames(1), 10)
+
+    stored = buffer.put("big", frames(3), 10)
+
+    assert len(stored) == 3 and not stored.flags.writeable
+    assert buffer.get("big") is None
+    assert buffer.get("a") is not None
+    assert buffer.size == frames(1).nbytes
+
+
+def test_only_short_small_clips_are_accepted():
+    """Test that long clips and clips over the per-clip size are not buffered."""
+    buffer = FrameBuffer({"video": {"frame_buffer": {"max_clip_bytes": 10 * 48, "max_duration": 2}}})
+
+    assert buffer.accepts(1.0, 10, 4, 4)
+    assert not buffer.accepts(1.1, 10, 4, 4)
+    assert not buffer.accepts(3.0, 1, 4, 4)
+
+
+def test_looped_clip_serves_frames_cyclically():
+    """Test that buffered frames repeat for the whole segment duration."""
+    data = np.stack([frames(1, value)[0] for value in range(5)])
+    clip = FrameBuffer.looped_clip(data, 10, 1.2)
+
+    assert [int(frame[0, 0, 0]) for frame in clip.iter_frames(fps=10)] == [0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1]
+
+
+@pytest.mark.slow
+def test_segments_share_one_decode(tmp_path):
+    """Test that a short background is decoded once and looped from memory."""
+    path = str(tmp_path / "short.mp4")
+    subprocess.run(
+        [get_setting("FFMPEG_BINARY"), "-y", "-v", "error", "-f", "lavfi",
+         "-i", "testsrc2=size=64x64:rate=10:duration=1", "-c:v", "libx264", "-pix_fmt", "yuv420p", path],
+        check=True
+    )
+    buffer = FrameBuffer()
+    service = SegmentService(VideoEffectsService(), None, frame_buffer=buffer)
+
+    first = service.process_segment({"video_path": path}, {"duration": 2.5}, size=(32, 32))
+    second = service.process_segment({"video_path": path}, {"duration": 1.0}, size=(32, 32))
+
+    assert len(buffer._entries) == 1
+    assert tuple(first.size) == (32, 32) and first.duration == 2.5
+    assert np.array_equal(first.get_frame(1.2), first.get_frame(0.2))
+    reader = VideoFileClip(path, target_resolution=(32, 32), resize_algorithm="area")
+    try:
+        assert np.abs(second.get_frame(0.5).astype(int) - reader.get_frame(0.5)).max() <= 2
+    finally:
+        reader.close()
@@ -0,0 +1,106 @@
+"""
+Tests for the threaded decode, transform and encode frame pipeline.
+"""
+import os
+import subprocess
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from moviepy.config import get_setting
+from moviepy.editor import ColorClip, VideoClip, VideoFileClip, concatenate_videoclips
+
+from services.video.effects_service import VideoEffectsService
+from services.video.frame_pipeline import FramePipeline
+from services.video.frame_ring import FrameRing
+from services.video.frame_transform import FrameStep
+from services.video.segment_service import SegmentService
+from services.video.text_overlay_service import TextOverlayService
+
+# Lossless, so outputs can be compared frame by frame
+LOSSLESS = {"codec": "png", "fps": 10, "preset": "medium", "ffmpeg_params": []}
+
+
+def test_frame_times_match_concatenation():
+    """Test that frames are taken from the segments MoviePy would take them from."""
+    durations = [1.02, 2.0, 0.5]
+    clips = [
+        VideoClip(lambda t, index=index: np.full((1, 1, 3), index, dtype=np.uint8), duration=duration)
+        for index, duration in enumerate(durations)
+    ]
+    expected = [int(frame[0, 0, 0]) for frame in concatenate_videoclips(clips).iter_frames(fps=30)]
+
+    times = FramePipeline.frame_times(durations, 30)
+
+    assert [index for index, segment_times in enumerate(times) for _ in segment_times] == expected
+    assert all(0 <= t < duration for segment_times, duration in zip(times, durations) for t in segment_times)
+
+
+@pytest.mark.slow
+def test_pipeline_matches_write_videofile(tmp_path):
+    """Test that the pipeline writes the same frames as MoviePy does."""
+    backgrounds = []
+    for index, duration in enumerate((1, 2)):
+        path = str(tmp_path / f"background_{index}.mp4")
+        subprocess.run(
+            [get_setting("FFMPEG_BINARY"), "-y", "-v", "error", "-f", "lavfi", "-i",
+             f"testsrc2=size=160x90:rate=25:duration={duration}", "-pix_fmt", "yuv420p", path],
+            check=True
+        )
+        backgrounds.append(path)
+    text_config = {"font_path": "DejaVuSans.ttf", "font_size": 12, "cache": {"enabled": False}}
+    service = SegmentService(VideoEffectsService(), TextOverlayService({"text": text_config}))
+    segments = [{"video_path": backgrounds[0], "text": "Hello"}, {"video_path": backgrounds[1], "text": ""}]
+    timings = [{"duration": 1.5}, {"duration": 1.0}]
+    size = (64, 112)
+
+    reference = str(tmp_path / "reference.avi")
+    clips = [service.process_segment(segment, timing, size=size) for segment, timing in zip(segments, timings)]
+    concatenate_videoclips(clips).write_videofile(reference, audio=False, logger=None, **LOSSLESS)
+
+    output = str(tmp_path / "pipeline.avi")
+    pipeline = FramePipeline({"video": {"render": {"pipeline": {"workers": 3, "queue_size": 2}}}})
+    sources = [
+        service.segment_frames(segment, timing, size=size, reuse_buffers=False)
+        for segment, timing in zip(segments, timings)
+    ]
+    written = pipeline.write(sources, output, size, LOSSLESS)
+
+    expected = list(VideoFileClip(reference).iter_frames())
+    actual = list(VideoFileClip(output).iter_frames())
+    assert written == len(expected) == 25
+    assert len(actual) == len(expected)
+    assert all(np.array_equal(a, b) for a, b in zip(actual, expected))
+
+
+def test_step_errors_stop_the_pipeline(tmp_path):
+    """Test that a failing frame step is raised instead of hanging the encoder."""
+    def fail(frame, out=None):
+        raise ValueError("bad frame")
+
+    source = ColorClip((16, 16), color=(0, 0, 0), duration=5)
+    pipeline = FramePipeline({"video": {"render": {"pipeline": {"queue_size": 1}}}})
+
+    with pytest.raises(ValueError, match="bad frame"):
+        pipeline.write([(source, [FrameStep("fail", "test", fail)])], str(tmp_path / "out.avi"), (16, 16), LOSSLESS)
+
+
+def test_frame_ring_hands_out_free_slots():
+    """Test that slots are preallocated and come back once released."""
+    ring = FrameRing(2, (4, 6, 3))
+    first, second = ring.acquire(), ring.acquire()
+    slot = ring.slots[first]
+
+    stopped = threading.Event()
+    stopped.set()
+    assert ring.acquire(stop=stopped) is None
+    ring.release(first)
+    assert ring.acquire() == first
+    assert ring.slots[first] is slot
+    assert ring.slots[second].shape == (4, 6, 3)
+
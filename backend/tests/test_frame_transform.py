@@ -0,0 +1,47 @@
+"""
+Tests for cover scaling and cropping of frames.
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.video.frame_transform import CoverCropTransform, cover_size
+
+
+def test_cover_size_keeps_aspect_ratio():
+    """Test that the scaled size fills the target in both dimensions."""
+    assert cover_size((1920, 1080), (1080, 1920)) == (3414, 1920)
+    assert cover_size((720, 1280), (1080, 1920)) == (1080, 1920)
+    assert cover_size((1440, 1920), (540, 960)) == (720, 960)
+
+
+def test_landscape_frame_is_center_cropped_not_stretched():
+    """Test that the middle of a wide frame fills a portrait target."""
+    frame = np.zeros((90, 160, 3), dtype=np.uint8)
+    frame[:, 70:90] = 255  # Centered white stripe, 20 of 160 columns wide
+    transform = CoverCropTransform((160, 90), (45, 80))
+
+    output = transform(frame)
+
+    assert output.shape == (80, 45, 3)
+    # The 50 column crop window shows the whole stripe, scaled by 0.9
+    stripe = np.where(output[40, :, 0] > 128)[0]
+    assert 16 <= len(stripe) <= 20
+    assert abs((stripe[0] + stripe[-1]) / 2 - 22) <= 1
+
+
+def test_buffers_are_reused_and_exact_sizes_only_sliced():
+    """Test that resized frames share one buffer and covering frames are views."""
+    resize = CoverCropTransform((64, 64), (16, 32))
+    first = resize(np.zeros((64, 64, 3), dtype=np.uint8))
+    second = resize(np.ones((64, 64, 3), dtype=np.uint8))
+    assert first is second
+
+    crop = CoverCropTransform((40, 32), (16, 32))
+    frame = np.zeros((32, 40, 3), dtype=np.uint8)
+    assert not crop.needs_resize
+    assert np.shares_memory(crop(frame), frame)
@@ -0,0 +1,79 @@
+"""
+Tests for the SQLite-backed job queue.
+"""
+import os
+import sys
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.exceptions import RiddlerException
+from core.job_queue import JobQueue
+
+
+def make_job(job_id):
+    return {"id": job_id, "category": "geography", "difficulty": "easy", "num_riddles": 2}
+
+
+def test_jobs_are_claimed_in_order(tmp_path):
+    """Test that jobs are claimed oldest first and marked done."""
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    first = queue.enqueue(make_job("first"))
+    queue.enqueue(make_job("second"))
+
+    record = queue.claim("test")
+    assert record["id"] == first
+    assert record["job"]["id"] == "first"
+    assert record["attempts"] == 1
+
+    queue.mark_done(first, "output/first.mp4")
+    assert queue.get(first)["state"] == JobQueue.DONE
+    assert [event["state"] for event in queue.events(first)] == ["queued", "running", "done"]
+    assert queue.counts() == {"queued": 1, "running": 0, "done": 1, "failed": 0}
+
+
+def test_failed_jobs_are_retried_until_attempts_run_out(tmp_path):
+    """Test that failures requeue a job until max_attempts is reached."""
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    queue_id = queue.enqueue(make_job("flaky"), max_attempts=2)
+
+    queue.claim("test")
+    assert queue.mark_failed(queue_id, "boom") == JobQueue.QUEUED
+
+    queue.claim("test")
+    assert queue.mark_failed(queue_id, "boom") == JobQueue.FAILED
+    assert queue.claim("test") is None
+
+
+def test_recover_requeues_interrupted_jobs_only(tmp_path):
+    """Test that crash recovery leaves finished jobs alone."""
+    db_path = str(tmp_path / "jobs.db")
+    queue = JobQueue(db_path)
+    done_id = queue.enqueue(make_job("done"))
+    running_id = queue.enqueue(make_job("running"))
+    queue.claim("test")
+    queue.mark_done(done_id)
+    queue.claim("test")
+    queue.close()
+
+    # Simulate a restart after the worker died
+    queue = JobQueue(db_path)
+    assert queue.recover() == 1
+    assert queue.get(running_id)["state"] == JobQueue.QUEUED
+    assert queue.get(done_id)["state"] == JobQueue.DONE
+    assert queue.claim("test")["id"] == running_id
+
+
+def test_active_job_ids_are_not_queued_twice(tmp_path):
+    """Test that an id already queued or running is rejected, and a finished one can run again."""
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    first = queue.enqueue(make_job("same"))
+
+    with pytest.raises(RiddlerException):
+        queue.enqueue(make_job("same"))
+
+    queue.claim("test")
+    queue.mark_done(first)
+    assert queue.enqueue(make_job("same")) != first
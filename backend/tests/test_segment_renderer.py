@@ -0,0 +1,186 @@
+"""
+Tests for per-segment rendering and stream-copy concatenation.
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from moviepy.config import get_setting
+from moviepy.editor import ColorClip, VideoFileClip
+
+from services.video.effects_service import VideoEffectsService
+from services.video.frame_pipeline import FramePipeline
+from services.video.segment_renderer import (
+    SegmentRenderer,
+    chunk_ranges,
+    frame_aligned_durations,
+    segment_cache_key
+)
+from services.video.segment_service import SegmentService
+from services.video.text_overlay_service import TextOverlayService
+
+
+class CountingSegmentService:
+    """Draws a solid color instead of decoding the background."""
+
+    def __init__(self):
+        self.processed = []
+
+    def process_segment(self, segment, timing, size=None):
+        self.processed.append(segment["text"])
+        return ColorClip(size, color=(40, 80, 120), duration=timing["duration"])
+
+
+def test_frame_aligned_durations_do_not_drift():
+    """Test that rounded segment boundaries stay on the original timeline."""
+    durations = [1.03, 2.51, 0.02, 3.333]
+    aligned = frame_aligned_durations(durations, fps=30)
+
+    for duration in aligned:
+        assert round(duration * 30, 6).is_integer()
+    assert all(duration > 0 for duration in aligned)
+    assert sum(aligned) == pytest.approx(sum(durations), abs=0.5 / 30)
+
+
+@pytest.mark.slow
+def test_concat_joins_segments_and_muxes_audio(tmp_path):
+    """Test that segment files are joined without re-encoding and get the audio track."""
+    renderer = SegmentRenderer(segment_service=None, config={"video": {"render": {"workers": 1}}})
+    paths = []
+    for index, pattern in enumerate(("testsrc2", "smptehdbars")):
+        path = str(tmp_path / f"segment_{index}.mp4")
+        subprocess.run(
+            [renderer.ffmpeg, "-y", "-v", "error", "-f", "lavfi", "-i", f"{pattern}=size=64x64:rate=10:duration=1",
+             "-c:v", "libx264", "-pix_fmt", "yuv420p", path],
+            check=True
+        )
+        paths.append(path)
+    audio_path = str(tmp_path / "audio.m4a")
+    subprocess.run(
+        [renderer.ffmpeg, "-y", "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=2",
+         "-c:a", "aac", audio_path],
+        check=True
+    )
+
+    output_path = renderer.concat(paths, str(tmp_path / "joined.mp4"), audio_path=audio_path)
+
+    clip = VideoFileClip(output_path)
+    try:
+        assert clip.duration == pytest.approx(2.0, abs=0.1)
+        assert clip.audio is not None
+    finally:
+        clip.close()
+    assert not os.path.exists(str(tmp_path / "joined.concat.txt"))
+
+
+def test_segment_cache_key_covers_content(tmp_path):
+    """Test that the key follows the clip's contents and the render settings, not its path."""
+    background = tmp_path / "a.mp4"
+    background.write_bytes(b"clip")
+    copy = tmp_path / "b.mp4"
+    copy.write_bytes(b"clip")
+    options = {"codec": "libx264", "fps": 10}
+    config = {"text": {"font_size": 48}}
+
+    def key(path=background, text="Hello", size=(108, 192), config=config):
+        return segment_cache_key({"video_path": str(path), "text": text}, 1.0, size, options, config)
+
+    assert key() == key(path=copy)
+    assert key() != key(text="Bye")
+    assert key() != key(size=(54, 96))
+    assert key() != key(config={"text": {"font_size": 60}})
+    for section, settings in (
+        ("frame_buffer", {"enabled": False}),
+        ("normalize", {"crf": 23}),
+        ("effects", {"zoom": {"max_scale": 1.5}})
+    ):
+        assert key() != key(config=dict(config, video={section: settings}))
+    background.write_bytes(b"other clip")
+    assert key() != key(path=copy)
+
+
+@pytest.mark.slow
+def test_render_reuses_cached_segments(tmp_path):
+    """Test that segments rendered once are spliced into later videos from the cache."""
+    background = tmp_path / "background.mp4"
+    background.write_bytes(b"clip")
+    service = CountingSegmentService()
+    renderer = SegmentRenderer(service, config={"video": {"render": {
+        "workers": 1,
+        "temp_dir": str(tmp_path / "render"),
+        "segment_cache": {"dir": str(tmp_path / "segments")}
+    }}})
+    write_options = {"codec": "libx264", "fps": 10, "preset": "ultrafast", "ffmpeg_params": ["-pix_fmt", "yuv420p"]}
+    hook = {"video_path": str(background), "text": "hook"}
+
+    renderer.render([hook, {"video_path": str(background), "text": "a"}], [1.0, 1.0],
+                    str(tmp_path / "first.mp4"), (64, 64), write_options)
+    renderer.render([hook, {"video_path": str(background), "text": "b"}], [1.0, 1.0],
+                    str(tmp_path / "second.mp4"), (64, 64), write_options)
+
+    assert service.processed == ["hook", "a", "b"]
+    clip = VideoFileClip(str(tmp_path / "second.mp4"))
+    try:
+        assert clip.duration == pytest.approx(2.0, abs=0.15)
+    finally:
+        clip.close()
+
+
+def test_chunk_ranges_start_on_keyframes():
+    """Test that chunks cover every frame once and start on GOP boundaries."""
+    ranges = chunk_ranges(527, 4, 60)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == 527
+    assert all(end == next_first for (_, end), (next_first, _) in zip(ranges, ranges[1:]))
+    assert all(first % 60 == 0 for first, _ in ranges)
+    assert len(ranges) == 4
+    assert chunk_ranges(50, 4, 60) == [(0, 50)]
+
+
+@pytest.mark.slow
+def test_render_chunks_matches_one_encode(tmp_path):
+    """Test that joined time chunks hold the same frames as encoding the whole video."""
+    backgrounds = []
+    for index, duration in enumerate((2, 1)):
+        path = str(tmp_path / f"background_{index}.mp4")
+        subprocess.run(
+            [get_setting("FFMPEG_BINARY"), "-y", "-v", "error", "-f", "lavfi", "-i",
+             f"testsrc2=size=160x90:rate=25:duration={duration}", "-pix_fmt", "yuv420p", path],
+            check=True
+        )
+        backgrounds.append(path)
+    text_config = {"font_path": "DejaVuSans.ttf", "font_size": 12, "cache": {"enabled": False}}
+    service = SegmentService(VideoEffectsService(), TextOverlayService({"text": text_config}))
+    segments = [{"video_path": backgrounds[0], "text": "Hello"}, {"video_path": backgrounds[1], "text": "Bye"}]
+    durations = [1.55, 1.0]
+    size = (64, 112)
+    # Lossless, so both videos decode to the same frames
+    write_options = {"codec": "libx264", "fps": 10, "preset": "ultrafast",
+                     "ffmpeg_params": ["-qp", "0", "-pix_fmt", "yuv420p"]}
+
+    reference = str(tmp_path / "reference.mp4")
+    sources = [
+        service.segment_frames(segment, {"duration": duration}, size=size, reuse_buffers=False)
+        for segment, duration in zip(segments, durations)
+    ]
+    FramePipeline().write(sources, reference, size, write_options)
+
+    renderer = SegmentRenderer(service, config={"video": {"render": {
+        "workers": 1,
+        "temp_dir": str(tmp_path / "render"),
+        "chunks": {"count": 3, "keyframe_interval": 0.5}
+    }}})
+    output = renderer.render_chunks(segments, durations, str(tmp_path / "chunks.mp4"), size, write_options)
+
+    expected = list(VideoFileClip(reference).iter_frames())
+    actual = list(VideoFileClip(output).iter_frames())
+    assert len(expected) == 26
+    assert len(actual) == len(expected)
+    assert all(np.array_equal(a, b) for a, b in zip(actual, expected))
+    assert os.listdir(str(tmp_path / "render")) == []
@@ -0,0 +1,80 @@
+"""
+Tests for generating the speech of all segments concurrently.
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.exceptions import RiddlerException
+from core.application import Application
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'config.json')
+
+
+class StubTTSService:
+    """Answers the first texts last, so requests finish out of order."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.texts = []
+        self.lock = threading.Lock()
+
+    def generate_speech(self, text, **kwargs):
+        with self.lock:
+            self.texts.append(text)
+            delay = 0.05 / len(self.texts)
+        time.sleep(delay)
+        if text in self.failing:
+            raise RuntimeError("quota exceeded")
+        return f"voice/{text}.mp3"
+
+
+def make_segments():
+    return [
+        {"id": "hook", "type": "hook", "text": "hello"},
+        {"id": "question_1", "type": "question", "text": "first"},
+        {"id": "thinking_1", "type": "thinking", "text": "think"},
+        {"id": "answer_1", "type": "answer", "text": "second"},
+        {"id": "question_2", "type": "question", "text": "first"},
+        {"id": "cta", "type": "cta", "text": "bye"},
+    ]
+
+
+@pytest.fixture
+def app():
+    return Application(config_path=CONFIG_PATH)
+
+
+def test_voice_paths_follow_segment_order(app):
+    """Test that paths come back in segment order with each text synthesized once."""
+    tts = StubTTSService()
+    app.service_factory.register_service("tts", tts)
+
+    paths = app.generate_segment_speech(make_segments(), max_workers=4)
+
+    assert paths == [
+        "voice/hello.mp3", "voice/first.mp3", None, "voice/second.mp3", "voice/first.mp3", "voice/bye.mp3"
+    ]
+    assert sorted(tts.texts) == ["bye", "first", "hello", "second"]
+
+
+def test_failures_are_reported_per_segment(app):
+    """Test that every segment of a failed text is named after all requests finish."""
+    tts = StubTTSService(failing={"first"})
+    app.service_factory.register_service("tts", tts)
+
+    with pytest.raises(RiddlerException) as error:
+        app.generate_segment_speech(make_segments(), max_workers=2)
+
+    message = str(error.value)
+    assert "for 2 segments" in message
+    assert "question_1: " in message and "question_2: " in message
+    assert "quota exceeded" in message
+    assert "hook" not in message and "answer_1" not in message
+    assert len(tts.texts) == 4
@@ -0,0 +1,72 @@
+"""
+Startup-time regression tests.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that must only be imported by the commands that use them
+HEAVY_MODULES = ("moviepy", "numpy", "PIL", "cv2", "openai", "httpx", "requests", "loguru", "dotenv")
+
+# Allowed time for `main.py --help` on top of bare interpreter startup
+HELP_BUDGET_SECONDS = 0.3
+
+
+def run_python(args, cwd):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def fastest_run(args, cwd, runs=3):
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        run_python(args, cwd)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+def test_imports_have_no_heavy_dependencies_or_side_effects(tmp_path):
+    """Test that importing the CLI and core modules loads nothing heavy and writes nothing."""
+    code = (
+        f"import json, sys; sys.path.insert(0, {BACKEND_DIR!r}); "
+        "import main, core.application, core.batch, core.pipeline, core.worker, "
+        "services.video, services.audio, services.openai, services.tts, services.external, "
+        "utils.cache, utils.helpers; "
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    result = run_python(["-c", code], cwd=str(tmp_path))
+
+    assert json.loads(result.stdout) == []
+    # No log directory, cache directory or other files at import time
+    assert os.listdir(tmp_path) == []
+
+
+def test_help_starts_fast(tmp_path):
+    """Test that `main.py --help` costs little more than starting Python."""
+    bare = fastest_run(["-c", "pass"], cwd=str(tmp_path))
+    help_time = fastest_run([os.path.join(BACKEND_DIR, "main.py"), "--help"], cwd=str(tmp_path))
+
+    assert help_time - bare < HELP_BUDGET_SECONDS
+
+
+def test_preview_is_rejected_for_batches(tmp_path):
+    """Test that `--preview` with `--jobs` is a usage error instead of being ignored."""
+    result = subprocess.run(
+        [sys.executable, os.path.join(BACKEND_DIR, "main.py"), "--jobs", "jobs.json", "--preview"],
+        cwd=str(tmp_path),
+        capture_output=True,
+        text=True
+    )
+
+    assert result.returncode == 2
+    assert "--preview" in result.stderr
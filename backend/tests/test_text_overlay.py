@@ -0,0 +1,134 @@
+"""
+Tests for text overlay rendering and compositing.
+"""
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from moviepy.editor import ColorClip, ImageClip
+
+from services.video.frame_buffer import FrameBuffer
+from services.video.text_overlay_service import TextOverlayService
+
+CONFIG = {
+    "video": {"resolution": {"width": 216, "height": 384}},
+    "text": {
+        "font_path": "DejaVuSans.ttf",
+        "font_size": 24,
+        "stroke_width": 2,
+        "cache": {"enabled": False}
+    }
+}
+
+
+def cached_config(cache_dir, **text):
+    """Overlay settings with the raster cache in ``cache_dir``."""
+    text_config = dict(CONFIG["text"], cache={"dir": str(cache_dir)}, **text)
+    return dict(CONFIG, text=text_config)
+
+
+class CountingTextOverlay(TextOverlayService):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rasterized = 0
+
+    def _rasterize(self, text, width, height):
+        self.rasterized += 1
+        return super()._rasterize(text, width, height)
+
+
+def test_overlay_blends_only_the_text_box():
+    """Test that the overlay matches straight alpha blending inside its box only."""
+    service = TextOverlayService(CONFIG)
+    clip = ColorClip((216, 384), color=(30, 120, 200), duration=1)
+    image, (left, top) = service.render_text_patch("Hello overlay", 216, 384)
+
+    frame = service.create_text_overlay(clip, "Hello overlay").get_frame(0)
+
+    box = (slice(top, top + image.height), slice(left, left + image.width))
+    pixels = np.asarray(image, dtype=np.float64)
+    alpha = pixels[:, :, 3:] / 255
+    expected = pixels[:, :, :3] * alpha + np.array([30, 120, 200]) * (1 - alpha)
+    assert np.abs(frame[box].astype(np.float64) - expected).max() <= 0.5 + 1e-9
+
+    outside = frame.copy()
+    outside[box] = (30, 120, 200)
+    assert (outside == (30, 120, 200)).all()
+
+
+def test_overlay_leaves_source_frames_untouched():
+    """Test that read-only buffered frames are blended onto a copy."""
+    service = TextOverlayService(CONFIG)
+    frames = np.full((2, 384, 216, 3), 50, dtype=np.uint8)
+    frames.setflags(write=False)
+    clip = FrameBuffer.looped_clip(frames, 10, 1)
+
+    frame = service.create_text_overlay(clip, "Hi").get_frame(0)
+
+    assert (frames == 50).all()
+    assert (frame != 50).any()
+
+
+def test_overlay_draws_in_place_on_frames_of_their_own():
+    """Test that writable frames are blended without a full-frame copy, and static clips are not."""
+    service = TextOverlayService(CONFIG)
+    blend = service.overlay_transform("Hi", 216, 384)
+    frame = np.full((384, 216, 3), 50, dtype=np.uint8)
+
+    assert blend(frame) is frame
+    assert (frame != 50).any()
+
+    image = np.full((384, 216, 3), 50, dtype=np.uint8)
+    clip = service.create_text_overlay(ImageClip(image, duration=1), "Hi")
+    assert (clip.get_frame(0) == clip.get_frame(0.5)).all()
+    assert (image == 50).all()
+
+
+def test_blank_text_returns_clip_unchanged():
+    """Test that text with nothing to draw adds no overlay."""
+    service = TextOverlayService(CONFIG)
+    clip = ColorClip((216, 384), color=(0, 0, 0), duration=1)
+
+    assert service.render_text_patch("   ", 216, 384) is None
+    assert service.create_text_overlay(clip, "   ") is clip
+
+
+def test_overlays_are_cached_in_memory_and_on_disk(tmp_path):
+    """Test that repeated texts are rasterized once per process and once on disk."""
+    service = CountingTextOverlay(cached_config(tmp_path))
+    first, offset = service.render_text_patch("Next Riddle...", 216, 384)
+    assert service.render_text_patch("Next Riddle...", 216, 384)[0] is first
+    assert service.rasterized == 1
+
+    restarted = CountingTextOverlay(cached_config(tmp_path))
+    image, cached_offset = restarted.render_text_patch("Next Riddle...", 216, 384)
+    assert restarted.rasterized == 0
+    assert cached_offset == offset
+    assert image.tobytes() == first.tobytes()
+
+
+def test_raster_key_covers_text_style_and_size(tmp_path):
+    """Test that anything changing an overlay's pixels changes its key."""
+    service = TextOverlayService(cached_config(tmp_path))
+    key = service.raster_key("Hi", 216, 384)
+
+    assert service.raster_key("Hi", 216, 384) == key
+    assert service.raster_key("Hey", 216, 384) != key
+    assert service.raster_key("Hi", 108, 192) != key
+    assert TextOverlayService(cached_config(tmp_path, stroke_color="red")).raster_key("Hi", 216, 384) != key
+    assert TextOverlayService(cached_config(tmp_path, font_size=30)).raster_key("Hi", 216, 384) != key
+
+
+def test_warmup_renders_each_overlay_once(tmp_path):
+    """Test that warm-up fills the cache and skips overlays already in it."""
+    texts = ["Time to think...", "Next Riddle..."]
+    sizes = [(216, 384), (108, 192)]
+    assert TextOverlayService(cached_config(tmp_path)).warmup(texts, sizes) == 4
+
+    service = CountingTextOverlay(cached_config(tmp_path))
+    assert service.warmup(texts, sizes) == 0
+    service.render_text_patch("Next Riddle...", 108, 192)
+    assert service.rasterized == 0
@@ -0,0 +1,105 @@
+"""
+Tests for span tracing and Chrome trace export.
+"""
+import contextvars
+import json
+import os
+import sys
+import threading
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.tracing import Tracer, current_tracer, span, trace_frames, traced
+
+
+@traced("work", cat="test")
+def work(value):
+    with span("inner", cat="cache", value=value):
+        return value * 2
+
+
+def spans(tracer):
+    return [event for event in tracer.to_dict()["traceEvents"] if event["ph"] == "X"]
+
+
+def test_spans_are_noops_without_tracer():
+    """Test that instrumented code runs normally when nothing is traced."""
+    assert current_tracer() is None
+    assert work(2) == 4
+
+
+def test_spans_nest_and_record_errors():
+    """Test that nested spans are recorded with args and errors."""
+    tracer = Tracer("job")
+    with tracer.activate():
+        assert work(3) == 6
+        try:
+            with span("broken", cat="http"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+    events = {event["name"]: event for event in spans(tracer)}
+    assert set(events) == {"work", "inner", "broken"}
+    assert events["inner"]["args"] == {"value": 3}
+    assert events["inner"]["ts"] >= events["work"]["ts"]
+    assert events["inner"]["dur"] <= events["work"]["dur"]
+    assert events["broken"]["args"]["error"] == "ValueError: boom"
+    assert current_tracer() is None
+
+
+def test_spans_from_other_threads_join_the_trace(tmp_path):
+    """Test that threads running a copied context write to the same trace file."""
+    tracer = Tracer("job")
+    with tracer.activate():
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(work, i), name=f"tts_{i}")
+            for i in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    trace_path = tracer.write(str(tmp_path / "traces" / "job.trace.json"))
+    with open(trace_path) as f:
+        trace = json.load(f)
+
+    thread_names = {
+        event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "thread_name"
+    }
+    assert thread_names == {"tts_0", "tts_1"}
+    assert sum(1 for event in trace["traceEvents"] if event["name"] == "work") == 2
+
+
+def test_trace_frames_wraps_frame_function():
+    """Test that every rendered frame becomes a span."""
+    class FakeClip:
+        def make_frame(self, t):
+            return t
+
+    untraced = trace_frames(FakeClip(), "decode", "decode")
+    assert "make_frame" not in vars(untraced)
+
+    tracer = Tracer("job")
+    with tracer.activate():
+        clip = trace_frames(FakeClip(), "decode", "decode")
+    assert [clip.make_frame(t) for t in range(3)] == [0, 1, 2]
+    assert [event["cat"] for event in spans(tracer)] == ["decode"] * 3
+
+
+def test_trace_job_writes_job_span(tmp_path):
+    """Test that a traced job is wrapped in a ``job`` span and written out."""
+    from core.application import Application
+
+    app = Application(trace_dir=str(tmp_path))
+    with app.trace_job("riddles_1") as tracer:
+        with span("inner", cat="test"):
+            pass
+
+    with open(tmp_path / "riddles_1.trace.json") as f:
+        events = [event for event in json.load(f)["traceEvents"] if event["ph"] == "X"]
+    assert tracer is not None
+    assert {event["name"] for event in events} == {"job", "inner"}
+    assert next(event for event in events if event["name"] == "job")["args"] == {"job": "riddles_1"}
@@ -0,0 +1,139 @@
+"""
+Tests for the worker loop that renders queued jobs.
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import core.worker
+from core.job_queue import JobQueue
+from core.worker import Worker
+
+
+def make_job(job_id):
+    return {"id": job_id, "category": "geography", "difficulty": "easy", "num_riddles": 2}
+
+
+class ThreadWorker(Worker):
+    """Worker on a thread pool, so stubbed jobs share the test's state."""
+
+    def __init__(self, *args, threads=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = threads or self.processes
+        self.pools = 0
+
+    def _create_pool(self):
+        self.pools += 1
+        return ThreadPoolExecutor(max_workers=self.threads)
+
+
+class FakeRunner:
+    """Stands in for ``_run_job_in_worker``, acting per job id."""
+
+    def __init__(self, queue, failures=None):
+        self.queue = queue
+        self.failures = dict(failures or {})
+        self.calls = []
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, job, output_dir, no_cache, resume=False):
+        with self.lock:
+            self.calls.append((job["id"], resume))
+            self.max_running = max(self.max_running, self.queue.counts()["running"])
+            failure = self.failures.pop(job["id"], None)
+        time.sleep(0.01)
+        if isinstance(failure, BaseException):
+            raise failure
+        if failure:
+            return {"id": job["id"], "status": "failed", "error": failure}
+        return {"id": job["id"], "status": "done", "output_path": f"{output_dir}/{job['id']}.mp4"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    yield queue
+    queue.close()
+
+
+def test_worker_claims_only_free_slots_and_retries_with_resume(queue, tmp_path, monkeypatch):
+    """Test backpressure, resumed retries and failures raised instead of returned."""
+    for job_id in ("a", "b", "c", "flaky", "unpicklable"):
+        queue.enqueue(make_job(job_id))
+    runner = FakeRunner(queue, failures={"flaky": "render failed", "unpicklable": TypeError("cannot pickle")})
+    monkeypatch.setattr(core.worker, "_run_job_in_worker", runner)
+
+    counts = ThreadWorker(queue, output_dir=str(tmp_path), processes=2, poll_interval=0.01).run(exit_when_empty=True)
+
+    assert counts == {"queued": 0, "running": 0, "done": 5, "failed": 0}
+    assert runner.max_running <= 2
+    assert sorted(call for call in runner.calls if call[0] in ("flaky", "unpicklable")) == [
+        ("flaky", False), ("flaky", True), ("unpicklable", False), ("unpicklable", True)
+    ]
+
+
+def test_worker_restarts_the_pool_after_a_crash(queue, tmp_path, monkeypatch):
+    """Test that a dead pool process fails its jobs back to the queue and a new pool is started."""
+    crashed = queue.enqueue(make_job("crash"))
+    queue.enqueue(make_job("other"))
+    runner = FakeRunner(queue, failures={"crash": BrokenProcessPool("process died")})
+    monkeypatch.setattr(core.worker, "_run_job_in_worker", runner)
+    worker = ThreadWorker(queue, output_dir=str(tmp_path), processes=1, poll_interval=0.01)
+
+    counts = worker.run(exit_when_empty=True)
+
+    assert worker.pools == 2
+    assert counts["done"] == 2
+    assert "worker process died" in [event["message"] for event in queue.events(crashed)][2]
+
+
+def test_interrupted_worker_releases_jobs_that_never_started(queue, tmp_path, monkeypatch):
+    """Test that Ctrl+C hands back unstarted jobs and finishes the running one."""
+    started = queue.enqueue(make_job("started"))
+    waiting = queue.enqueue(make_job("waiting"))
+    monkeypatch.setattr(core.worker, "_run_job_in_worker", FakeRunner(queue))
+    real_wait = core.worker.wait
+    interrupted = []
+
+    def interrupting_wait(*args, **kwargs):
+        if not interrupted:
+            interrupted.append(True)
+            raise KeyboardInterrupt
+        return real_wait(*args, **kwargs)
+
+    monkeypatch.setattr(core.worker, "wait", interrupting_wait)
+    # Two claimed jobs, but only one thread to run them
+    worker = ThreadWorker(queue, output_dir=str(tmp_path), processes=2, threads=1, poll_interval=0.01)
+
+    worker.run()
+
+    assert queue.get(started)["state"] == JobQueue.DONE
+    assert queue.get(waiting)["state"] == JobQueue.QUEUED
+    assert queue.get(waiting)["attempts"] == 0
+
+
+def test_startup_recovers_only_stale_or_own_jobs(queue, tmp_path, monkeypatch):
+    """Test that a starting worker leaves jobs of other live workers running."""
+    live = queue.enqueue(make_job("live"))
+    crashed = queue.enqueue(make_job("crashed"))
+    queue.claim("other-host:1")
+    queue.claim("crashed-host:2")
+    # The crashed worker stopped sending heartbeats long ago
+    queue._conn.execute("UPDATE jobs SET heartbeat_at = 0 WHERE id = ?", (crashed,))
+    runner = FakeRunner(queue)
+    monkeypatch.setattr(core.worker, "_run_job_in_worker", runner)
+
+    ThreadWorker(queue, output_dir=str(tmp_path), processes=1, poll_interval=0.01).run(exit_when_empty=True)
+
+    assert queue.get(live)["state"] == JobQueue.RUNNING
+    assert queue.get(crashed)["state"] == JobQueue.DONE
+    assert runner.calls == [("crashed", True)]
@@ -2,9 +2,11 @@
 
 import hashlib
 import pickle
+import threading
 import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Hashable, Optional
 from concurrent.futures import ThreadPoolExecutor
 from utils.logger import log
 from config.config import Configuration as Config
@@ -37,15 +39,26 @@ class CacheManager:
         # Create directory
         self.base_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize executor for async operations
-        self.executor = ThreadPoolExecutor(
-            max_workers=max_workers,
-            thread_name_prefix="cache"
-        )
+        # Executor for background cleanup, created when first needed
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         
         # Initialize stats
         self.stats = CacheStats()
         
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Executor for background operations, created on first use."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="cache"
+                    )
+        return self._executor
+
     @property
     def cache_dir(self) -> str:
         """Get the cache directory path."""
@@ -218,5 +231,70 @@ class CacheStats:
         total = self.hits + self.misses
         return self.hits / total if total > 0 else 0
 
-# Initialize global cache instance
-cache = CacheManager() 
\ No newline at end of file
+
+class MemoryCache:
+    """Least recently used in-memory cache bounded by the bytes of its values.
+
+    Values are sized with ``sizeof`` when stored. Once the total exceeds
+    ``max_bytes`` the least recently used values are evicted, and a value
+    larger than the whole budget is not kept at all. Safe to share
+    between threads.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int]):
+        """Initialize memory cache.
+
+        Args:
+            max_bytes: Budget for the total size of the values
+            sizeof: Returns the size of a value in bytes
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Bytes of values held."""
+        return self._size
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, marking it recently used."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """Store a value, evicting the least recently used ones to stay in budget.
+
+        Returns:
+            False if the value is larger than the whole budget and was not kept
+        """
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._size -= self.sizeof(self._entries.pop(key))
+            while self._entries and self._size + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= self.sizeof(evicted)
+            self._entries[key] = value
+            self._size += size
+        return True
+
+    def clear(self) -> None:
+        """Drop every value."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -8,12 +8,22 @@ from typing import Any, Dict, List, Optional, Union
 import time
 from datetime import datetime
 import re
-from dotenv import load_dotenv
 from .logger import log
 
+# Whether the .env file has been loaded into the environment
+_env_loaded = False
+
 def reload_env() -> None:
     """Reload environment variables from .env file."""
+    global _env_loaded
+    from dotenv import load_dotenv
     load_dotenv(override=True)
+    _env_loaded = True
+
+def load_env() -> None:
+    """Load environment variables from .env file, once per process."""
+    if not _env_loaded:
+        reload_env()
 
 def get_api_key(service: str) -> str:
     """Get API key for a service from environment variables.
@@ -27,8 +37,8 @@ def get_api_key(service: str) -> str:
     Raises:
         ValueError: If API key is not found
     """
-    # Reload environment variables
-    reload_env()
+    # Load environment variables on first use
+    load_env()
     
     env_var = f"RIDDLER_{service.upper()}_API_KEY"
     api_key = os.getenv(env_var)
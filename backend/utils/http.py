@@ -0,0 +1,29 @@
+"""HTTP client utilities"""
+
+from typing import Dict
+import httpx
+
+
+def create_async_client(config: Dict) -> httpx.AsyncClient:
+    """Create the shared async HTTP client used by the async services.
+    
+    One client means one connection pool, so every provider request made
+    by the async services reuses the same keep-alive connections. The
+    client is bound to the event loop it is first used on.
+    
+    Args:
+        config: Configuration dictionary (reads the ``http`` section)
+        
+    Returns:
+        Configured async HTTP client
+    """
+    http_config = config.get("http", {})
+    limits = httpx.Limits(
+        max_connections=http_config.get("max_connections", 100),
+        max_keepalive_connections=http_config.get("max_keepalive_connections", 20)
+    )
+    timeout = httpx.Timeout(
+        http_config.get("timeout", 60.0),
+        connect=http_config.get("connect_timeout", 10.0)
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True)
@@ -1,7 +1,7 @@
 """Logging utilities"""
 
-from loguru import logger
 import sys
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
 import json
@@ -19,10 +19,13 @@ class LoggerConfig:
         self.retention = retention
         self.rotation = rotation
         self.format = format
-        self.log_path.mkdir(parents=True, exist_ok=True)
 
     def setup_logger(self) -> None:
         """Configure loguru logger with console and file handlers."""
+        from loguru import logger
+        
+        self.log_path.mkdir(parents=True, exist_ok=True)
+        
         # Remove default handler
         logger.remove()
 
@@ -56,8 +59,28 @@ class LoggerConfig:
         )
 
 class StructuredLogger:
-    def __init__(self):
-        self.logger = logger
+    """Loguru wrapper that configures its sinks on first use.
+    
+    Importing this module therefore neither imports loguru nor creates log
+    files, which keeps commands that never log fast.
+    """
+    
+    def __init__(self, config: Optional[LoggerConfig] = None):
+        self._config = config
+        self._logger = None
+        self._lock = threading.Lock()
+
+    @property
+    def logger(self):
+        """The configured loguru logger."""
+        if self._logger is None:
+            with self._lock:
+                if self._logger is None:
+                    from loguru import logger
+                    if self._config is not None:
+                        self._config.setup_logger()
+                    self._logger = logger
+        return self._logger
 
     def _format_extra(self, extra: Optional[Dict[str, Any]] = None) -> str:
         """Format extra fields as JSON string."""
@@ -77,10 +100,9 @@ class StructuredLogger:
     def error(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
         self.logger.error(f"{message}{self._format_extra(extra)}")
 
-# Initialize logger with default configuration
+# Logger with the default configuration, set up when first used
 logger_config = LoggerConfig()
-logger_config.setup_logger()
-structured_logger = StructuredLogger()
+structured_logger = StructuredLogger(logger_config)
 
 # Export the configured logger instance
 log = structured_logger 
\ No newline at end of file
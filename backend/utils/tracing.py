@@ -0,0 +1,217 @@
+"""Span tracing with Chrome trace / Perfetto export"""
+
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Tracer of the job running in the current thread or task
+_current_tracer: ContextVar[Optional["Tracer"]] = ContextVar("riddler_tracer", default=None)
+
+# Returned by span() when nothing is being traced
+_NO_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    """Collects timed spans for one job and writes them as a Chrome trace.
+
+    The output loads in ``chrome://tracing`` and https://ui.perfetto.dev.
+    Spans from every thread that runs part of the job end up in the same
+    file, one track per thread.
+    """
+
+    def __init__(self, name: str = "riddler"):
+        """Initialize tracer.
+
+        Args:
+            name: Name shown for the process track, usually the job name
+        """
+        self.name = name
+        self.pid = os.getpid()
+        self._start = time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _now(self) -> float:
+        """Microseconds since the tracer was created."""
+        return (time.perf_counter() - self._start) * 1e6
+
+    def add_span(
+        self,
+        name: str,
+        cat: str,
+        start: float,
+        end: float,
+        args: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Record a finished span.
+
+        Args:
+            name: Span name
+            cat: Category, used to filter and color spans
+            start: Start time in microseconds (see ``_now``)
+            end: End time in microseconds
+            args: Optional values shown with the span
+        """
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(start, 3),
+            "dur": round(end - start, 3),
+            "pid": self.pid,
+            "tid": thread.ident
+        }
+        if args:
+            event["args"] = args
+
+        with self._lock:
+            self._events.append(event)
+            if thread.ident not in self._threads:
+                self._threads[thread.ident] = thread.name
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str = "app", **args: Any) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block as a span.
+
+        Yields the span's args so the block can attach results to it.
+        Exceptions are recorded on the span and re-raised.
+        """
+        start = self._now()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            self.add_span(name, cat, start, self._now(), args)
+
+    def wrap(self, func: Callable, name: str, cat: str) -> Callable:
+        """Wrap a hot function, e.g. a MoviePy frame function, in spans."""
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = self._now()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add_span(name, cat, start, self._now())
+        return wrapper
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this the tracer of the current thread or task."""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the trace in Chrome trace event format."""
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+
+        metadata = [{
+            "name": "process_name",
+            "ph": "M",
+            "pid": self.pid,
+            "args": {"name": self.name}
+        }]
+        for tid, thread_name in threads.items():
+            metadata.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": thread_name}
+            })
+
+        return {
+            "traceEvents": metadata + sorted(events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms"
+        }
+
+    def write(self, path: str) -> str:
+        """Write the trace to a JSON file.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path to the written trace
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Get the tracer of the current thread or task, if any."""
+    return _current_tracer.get()
+
+
+def span(name: str, cat: str = "app", **args: Any):
+    """Time the enclosed block on the current tracer.
+
+    Does nothing when no tracer is active, so services can be instrumented
+    unconditionally.
+
+    Args:
+        name: Span name
+        cat: Category, e.g. ``http``, ``cache`` or ``encode``
+        **args: Values shown with the span
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, cat, **args)
+
+
+def traced(name: str, cat: str = "app") -> Callable:
+    """Decorator that records every call of a function or coroutine as a span."""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name, cat):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_frames(clip: Any, name: str, cat: str) -> Any:
+    """Record every frame a MoviePy clip renders as a span.
+
+    Frames are rendered lazily inside ``write_videofile``, so this is how
+    per-frame work such as decoding and compositing shows up in the trace.
+    Only clips built while a tracer is active are wrapped.
+
+    Args:
+        clip: MoviePy clip whose ``make_frame`` is wrapped in place
+        name: Span name
+        cat: Category, e.g. ``decode`` or ``overlay``
+
+    Returns:
+        The same clip
+    """
+    tracer = _current_tracer.get()
+    if tracer is not None:
+        clip.make_frame = tracer.wrap(clip.make_frame, name, cat)
+    return clip